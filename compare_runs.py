@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+from src.run_comparison import RunComparison
+
+def main():
+    """Compare experiment runs and exit non-zero on a regression"""
+    parser = argparse.ArgumentParser(description="Detect performance and verdict regressions between experiment runs")
+    parser.add_argument("baseline", help="Baseline results file (e.g. results/raw/experiment_results_<ts>.json)")
+    parser.add_argument("candidates", nargs="+", help="Result files to compare against the baseline")
+    parser.add_argument("--metric", default="execution_time", choices=RunComparison.METRICS, metavar="METRIC",
+                        help="Timing field to compare, one of %(choices)s "
+                             "(e.g. tool_wall_time to ignore container overhead)")
+    parser.add_argument("--alpha", type=float, default=0.05,
+                        help="Significance level of the Mann-Whitney U test")
+    parser.add_argument("--min-slowdown", type=float, default=0.10,
+                        help="Smallest relative change of the median reported (0.10 = 10%%)")
+    parser.add_argument("--min-samples", type=int, default=3,
+                        help="Trials per run needed for a statistical test (see --repeat)")
+    parser.add_argument("--output", default="results/processed/regression_report.json",
+                        help="Where to write the machine-readable report")
+    args = parser.parse_args()
+    
+    comparison = RunComparison(
+        args.baseline,
+        args.candidates,
+        metric=args.metric,
+        alpha=args.alpha,
+        min_slowdown=args.min_slowdown,
+        min_samples=args.min_samples
+    )
+    report = comparison.compare()
+    comparison.save_report(report, args.output)
+    
+    for candidate in report["candidates"]:
+        print(f"📊 {candidate['file']} vs {report['baseline']}")
+        for name, trials in ((report["baseline"], report["baseline_trials"]), (candidate["file"], candidate["trials"])):
+            if not trials:
+                print(f"   ⚠️  {name} has no trials with {report['metric']}: timings cannot be compared")
+        for pair in candidate["regressions"]:
+            reason = "verdict changed" if pair["verdict_changed"] else "slower"
+            detail = (f"{pair['baseline_status']} -> {pair['candidate_status']}" if pair["verdict_changed"]
+                      else f"x{pair['ratio']:.2f}, p={pair['p_value']:.3g}")
+            print(f"   ❌ {pair['tool']} on {pair['benchmark']}: {reason} ({detail})")
+        for pair in candidate["warnings"]:
+            if pair["timing"] == "no_samples" and not (report["baseline_trials"] and candidate["trials"]):
+                continue
+            print(f"   ⚠️  {pair['tool']} on {pair['benchmark']}: {pair['timing']}")
+        for pair in candidate["improvements"]:
+            print(f"   ✅ {pair['tool']} on {pair['benchmark']}: faster (x{pair['ratio']:.2f})")
+    print(f"📁 Report saved to {args.output}")
+    
+    if report["regression"]:
+        print("❌ Regression detected")
+        return 1
+    print("✅ No regression")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: single-pass output parsers vs. the original multi-pass regex counting.
+
+Also compares the streaming CBMC JSON-UI decoder with a plain `json.loads`.
+
+Usage: python perf/bench_output_parsers.py [--size-mb 20] [--repeat 3]
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.tool_runners.output_parsers import (
+    CBMCOutputParser, FramaCValueOutputParser, FramaCWPOutputParser, EACSLOutputParser
+)
+from src.tool_runners.cbmc_json import CBMCJsonUIDecoder
+
+# ---------------------------------------------------------------------------
+# Original parsing code, kept here as the baseline
+# ---------------------------------------------------------------------------
+
+def legacy_cbmc(stdout, stderr=""):
+    bugs = 0
+    bugs += len(re.findall(r"VERIFICATION FAILED", stdout))
+    bugs += len(re.findall(r"array.*out of bounds", stdout, re.IGNORECASE))
+    bugs += len(re.findall(r"pointer.*outside", stdout, re.IGNORECASE))
+    bugs += len(re.findall(r"division by zero", stdout, re.IGNORECASE))
+    bugs += len(re.findall(r"arithmetic overflow", stdout, re.IGNORECASE))
+    output = stdout + stderr
+    return {
+        "bugs_detected": bugs,
+        "properties_verified": len(re.findall(r"VERIFICATION SUCCESSFUL", stdout)),
+        "verification_failed": "VERIFICATION FAILED" in output,
+        "verification_successful": "VERIFICATION SUCCESSFUL" in output,
+        "errors_found": len(re.findall(r"error|violation", output, re.IGNORECASE)),
+        "warnings": len(re.findall(r"warning", output, re.IGNORECASE))
+    }
+
+def legacy_value(output):
+    alarms = []
+    for line in output.split('\n'):
+        if 'assertion' in line.lower() or 'alarm' in line.lower():
+            alarms.append(line.strip())
+    metrics = {}
+    for line in output.split('\n'):
+        if ':' in line and any(term in line.lower() for term in ['time', 'memory', 'proof']):
+            parts = line.split(':', 1)
+            if len(parts) == 2:
+                metrics[parts[0].strip()] = parts[1].strip()
+    return {
+        "alarms_generated": len(re.findall(r"assertion|alarm", output, re.IGNORECASE)),
+        "proofs_established": len(re.findall(r"valid", output, re.IGNORECASE)),
+        "alarms": alarms,
+        "metrics": metrics
+    }
+
+def legacy_wp(output):
+    return {
+        "goals_proven": len(re.findall(r"Proved", output, re.IGNORECASE)),
+        "goals_failed": len(re.findall(r"Failed", output, re.IGNORECASE))
+    }
+
+def legacy_eacsl(output):
+    details = {}
+    for line in output.splitlines():
+        if 'instrumented' in line.lower():
+            details['instrumentation_line'] = line.strip()
+        if 'assertion' in line.lower():
+            details['assertions_found'] = line.strip()
+    return {
+        "runtime_checks_inserted": len(re.findall(r"assertion|check|instrumented", output, re.IGNORECASE)),
+        "instrumentation_details": details
+    }
+
+# ---------------------------------------------------------------------------
+# Synthetic logs
+# ---------------------------------------------------------------------------
+
+def synthetic_cbmc_log(size_bytes, rng):
+    """CBMC --json-ui style output dominated by counterexample traces"""
+    properties = []
+    written = 0
+    prop = 0
+    while written < size_bytes:
+        prop += 1
+        status = rng.choice(["SUCCESS", "FAILURE"])
+        steps = ",\n".join(
+            '          {"hidden": false, "stepType": "assignment", "thread": 0, '
+            f'"lhs": "i", "value": {{"data": "{step}", "name": "integer", "width": 32}}, '
+            f'"sourceLocation": {{"file": "buffer_overflow.c", "function": "main", "line": "{step % 40}"}}}}'
+            for step in range(rng.randint(20, 60))
+        )
+        chunk = (
+            '      {\n'
+            f'        "description": "array \'buffer\' upper bound in buffer[(signed long int)index] {prop}",\n'
+            f'        "property": "buffer_overflow_unsafe.array_bounds.{prop}",\n'
+            f'        "status": "{status}",\n'
+            f'        "trace": [\n{steps}\n        ]\n'
+            '      }'
+        )
+        properties.append(chunk)
+        written += len(chunk)
+    return (
+        '[\n  {\n    "program": "CBMC 5.72.0 (cbmc-5.72.0)"\n  },\n  {\n    "result": [\n'
+        + ",\n".join(properties)
+        + '\n    ]\n  },\n  {\n    "messageText": "VERIFICATION FAILED",\n'
+        '    "messageType": "STATUS-MESSAGE"\n  },\n  {\n    "cProverStatus": "failure"\n  }\n]\n'
+    )
+
+def synthetic_framac_log(size_bytes, rng):
+    """Frama-C EVA/WP/E-ACSL style textual output"""
+    templates = [
+        "[kernel] Parsing benchmarks/memory_safety/buffer_overflow.c (with preprocessing)\n",
+        "[eva] Analyzing a complete application starting at main\n",
+        "[eva] computing for function buffer_overflow_unsafe <- main.\n",
+        "[eva:alarm] buffer_overflow.c:{n}: Warning: accessing out of bounds index. assert index < 10;\n",
+        "[eva] done for function main\n",
+        "[wp] [Alt-Ergo 2.4.3] Goal typed_buffer_assert_rte_index_bound_{n} : Valid (Qed)\n",
+        "[wp] Proved goals: {n} / {n}\n",
+        "[wp] Failed goal typed_div_{n}\n",
+        "[e-acsl] instrumented function buffer_overflow_unsafe\n",
+        "[kernel] Analysis time: 0.{n}s, memory: {n}MB\n",
+    ]
+    chunks = []
+    written = 0
+    n = 0
+    while written < size_bytes:
+        n += 1
+        line = rng.choice(templates).format(n=n)
+        chunks.append(line)
+        written += len(line)
+    return "".join(chunks)
+
+# ---------------------------------------------------------------------------
+
+def decode_streaming(log, line_count=64):
+    """Feed the log to the JSON-UI decoder in chunks of a few lines, as the async runner does"""
+    decoder = CBMCJsonUIDecoder()
+    lines = log.splitlines(True)
+    for start in range(0, len(lines), line_count):
+        decoder.feed("".join(lines[start:start + line_count]))
+    return decoder.finish()
+
+def peak_memory(func, *args):
+    tracemalloc.start()
+    try:
+        result = func(*args)
+        return tracemalloc.get_traced_memory()[1], result
+    finally:
+        tracemalloc.stop()
+
+def best_of(repeat, func, *args):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    size = int(args.size_mb * 1024 * 1024)
+    cbmc_log = synthetic_cbmc_log(size, rng)
+    framac_log = synthetic_framac_log(size, rng)
+
+    cases = [
+        ("cbmc", cbmc_log, legacy_cbmc, CBMCOutputParser),
+        ("framac_value", framac_log, legacy_value, FramaCValueOutputParser),
+        ("framac_wp", framac_log, legacy_wp, FramaCWPOutputParser),
+        ("eacsl", framac_log, legacy_eacsl, EACSLOutputParser),
+    ]
+
+    print(f"{'parser':<14}{'size (MB)':>10}{'legacy (s)':>12}{'single-pass (s)':>17}{'speedup':>9}")
+    for name, log, legacy, parser_class in cases:
+        legacy_time, expected = best_of(args.repeat, legacy, log)
+        new_time, actual = best_of(args.repeat, parser_class().parse, log)
+        if actual != expected:
+            raise SystemExit(f"❌ {name}: single-pass parser disagrees with the legacy parser")
+        print(f"{name:<14}{len(log) / 2**20:>10.1f}{legacy_time:>12.3f}{new_time:>17.3f}{legacy_time / new_time:>8.1f}x")
+
+    print()
+    print(f"{'cbmc json-ui':<16}{'time (s)':>10}{'peak (MB)':>11}{'stored (MB)':>13}")
+    for name, decode in (("json.loads", json.loads), ("streaming", decode_streaming)):
+        elapsed, result = best_of(args.repeat, decode, cbmc_log)
+        peak, _ = peak_memory(decode, cbmc_log)
+        stored = len(json.dumps(result))
+        print(f"{name:<16}{elapsed:>10.3f}{peak / 2**20:>11.1f}{stored / 2**20:>13.2f}")
+
+if __name__ == "__main__":
+    main()
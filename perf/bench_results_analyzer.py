@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: groupby-based ResultsAnalyzer vs. the original per-tool/per-benchmark filtering.
+
+Builds synthetic result tables (4 tools, one benchmark per 20 rows, 5 trials)
+and times the reports of generate_comprehensive_analysis. The legacy code
+re-filters the whole DataFrame for every tool and benchmark, so it is only
+run up to --legacy-max-rows.
+
+Usage: python perf/bench_results_analyzer.py [--rows 10000,100000,1000000] [--legacy-max-rows 100000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.results_analyzer import ResultsAnalyzer
+
+TOOLS = ["cbmc", "framac-eva", "framac-wp", "e-acsl"]
+
+# ---------------------------------------------------------------------------
+# Original analysis code, kept here as the baseline
+# ---------------------------------------------------------------------------
+
+class LegacyResultsAnalyzer:
+    def __init__(self, df):
+        self.df = df
+
+    def generate_summary(self):
+        """Generate summary statistics"""
+        total_experiments = len(self.df)
+        successful_runs = len(self.df[self.df.get('success', False) == True])
+        failed_runs = len(self.df[self.df.get('success', False) == False])
+        
+        summary = {
+            "total_experiments": total_experiments,
+            "successful_runs": successful_runs,
+            "failed_runs": failed_runs,
+            "tools_tested": self.df['tool'].unique().tolist() if 'tool' in self.df else [],
+            "benchmarks_tested": self.df['benchmark'].unique().tolist() if 'benchmark' in self.df else [],
+            "average_execution_time": self.df['execution_time'].mean() if 'execution_time' in self.df else 0,
+            "total_execution_time": self.df['execution_time'].sum() if 'execution_time' in self.df else 0,
+        }
+        
+        # Tool-specific summaries
+        tool_summary = {}
+        if 'tool' in self.df:
+            for tool in self.df['tool'].unique():
+                tool_data = self.df[self.df['tool'] == tool]
+                tool_summary[tool] = {
+                    "runs": len(tool_data),
+                    "success_rate": len(tool_data[tool_data.get('success', False) == True]) / max(len(tool_data), 1),
+                    "avg_time": tool_data['execution_time'].mean() if 'execution_time' in tool_data else 0,
+                    "total_bugs_detected": tool_data['bugs_detected'].sum() if 'bugs_detected' in tool_data else 0
+                }
+        summary['tool_performance'] = tool_summary
+        return summary
+    
+    def performance_analysis(self):
+        """Analyze performance metrics"""
+        performance = {}
+        if 'tool' not in self.df or 'execution_time' not in self.df:
+            return performance
+        
+        for tool in self.df['tool'].unique():
+            tool_data = self.df[self.df['tool'] == tool]
+            execution_times = tool_data['execution_time']
+            performance[tool] = {
+                "mean_execution_time": execution_times.mean(),
+                "median_execution_time": execution_times.median(),
+                "std_execution_time": execution_times.std(),
+                "min_execution_time": execution_times.min(),
+                "max_execution_time": execution_times.max(),
+                "timeout_count": len(tool_data[execution_times >= 299])
+            }
+            performance[tool].update(self.resource_breakdown(tool_data))
+        return performance
+    
+    def resource_breakdown(self, tool_data):
+        """Tool-only time, CPU time, peak memory and container overhead of a tool's runs"""
+        breakdown = {}
+        for column in ["tool_wall_time", "cpu_user_time", "cpu_system_time", "container_overhead_time",
+                       "container_prepare_time"]:
+            if column in tool_data:
+                breakdown[f"mean_{column}"] = tool_data[column].mean()
+        if 'peak_memory_mb' in tool_data:
+            breakdown["mean_peak_memory_mb"] = tool_data['peak_memory_mb'].mean()
+            breakdown["max_peak_memory_mb"] = tool_data['peak_memory_mb'].max()
+        if 'container_overhead_time' in tool_data:
+            # Share of the measured wall time spent outside the verifier itself
+            measured = tool_data[tool_data['container_overhead_time'].notna()]
+            total_time = measured['execution_time'].sum()
+            breakdown["container_overhead_share"] = (
+                measured['container_overhead_time'].sum() / total_time if total_time else 0
+            )
+        return breakdown
+    
+    def timing_statistics(self, metric='execution_time', confidence=0.95, resamples=2000, seed=0):
+        """Per (tool, benchmark) statistics over repeated trials (see --repeat).
+
+        Reports the bootstrap confidence interval of the mean, the coefficient
+        of variation and the trials outside the 1.5 IQR Tukey fences.
+        """
+        statistics = {}
+        if 'tool' not in self.df or 'benchmark' not in self.df or metric not in self.df:
+            return statistics
+        
+        rng = np.random.default_rng(seed)
+        for (tool, benchmark), pair_data in self.df.groupby(['tool', 'benchmark']):
+            pair_data = pair_data[pair_data[metric].notna()]
+            samples = pair_data[metric].to_numpy(dtype=float)
+            if len(samples) == 0:
+                continue
+            trials = pair_data['trial'].tolist() if 'trial' in pair_data else list(range(len(samples)))
+            
+            mean = samples.mean()
+            std = samples.std(ddof=1) if len(samples) > 1 else 0.0
+            ci_low, ci_high = self.bootstrap_ci(samples, rng, confidence, resamples)
+            q1, q3 = np.percentile(samples, [25, 75])
+            fence = 1.5 * (q3 - q1)
+            outliers = (samples < q1 - fence) | (samples > q3 + fence)
+            
+            statistics.setdefault(tool, {})[benchmark] = {
+                "samples": len(samples),
+                "mean": mean,
+                "median": float(np.median(samples)),
+                "std": std,
+                "cv": std / mean if mean else 0.0,
+                "ci_low": ci_low,
+                "ci_high": ci_high,
+                "confidence": confidence,
+                "outlier_trials": [trial for trial, flag in zip(trials, outliers) if flag]
+            }
+        return statistics
+    
+    @staticmethod
+    def bootstrap_ci(samples, rng, confidence=0.95, resamples=2000):
+        """Percentile bootstrap confidence interval of the mean"""
+        if len(samples) < 2:
+            return float(samples[0]), float(samples[0])
+        means = rng.choice(samples, size=(resamples, len(samples)), replace=True).mean(axis=1)
+        alpha = (1 - confidence) / 2
+        low, high = np.quantile(means, [alpha, 1 - alpha])
+        return float(low), float(high)
+    
+    def effectiveness_analysis(self):
+        """Analyze effectiveness metrics"""
+        effectiveness = {}
+        if 'tool' not in self.df:
+            return effectiveness
+        
+        for tool in self.df['tool'].unique():
+            tool_data = self.df[self.df['tool'] == tool]
+            effectiveness[tool] = {
+                "success_rate": len(tool_data[tool_data.get('success', False) == True]) / max(len(tool_data), 1),
+                "bugs_detected_avg": tool_data['bugs_detected'].mean() if 'bugs_detected' in tool_data else 0,
+                "properties_verified_avg": tool_data['properties_verified'].mean() if 'properties_verified' in tool_data else 0,
+                "alarms_generated_avg": tool_data['alarms_generated'].mean() if 'alarms_generated' in tool_data else 0
+            }
+        return effectiveness
+    
+    def generate_recommendations(self):
+        """Generate tool recommendations based on analysis"""
+        recommendations = {}
+        performance_data = self.performance_analysis()
+        effectiveness_data = self.effectiveness_analysis()
+        
+        if performance_data:
+            recommendations["fastest_tool"] = min(performance_data.items(), key=lambda x: x[1]["mean_execution_time"])[0]
+        if effectiveness_data:
+            recommendations["most_effective_bug_finder"] = max(effectiveness_data.items(), key=lambda x: x[1]["bugs_detected_avg"])[0]
+            recommendations["best_for_proofs"] = max(effectiveness_data.items(), key=lambda x: x[1]["properties_verified_avg"])[0]
+        
+        # Property-specific recommendations
+        property_recommendations = {}
+        if 'benchmark' in self.df and 'success' in self.df:
+            for benchmark in self.df['benchmark'].unique():
+                bench_data = self.df[self.df['benchmark'] == benchmark]
+                if not bench_data.empty:
+                    best_tool = bench_data.loc[bench_data['success'].idxmax(), 'tool']
+                    property_recommendations[benchmark] = best_tool
+        recommendations["property_specific"] = property_recommendations
+        return recommendations
+
+# ---------------------------------------------------------------------------
+# Synthetic results
+# ---------------------------------------------------------------------------
+
+def synthetic_results(rows, rng):
+    """Metric columns shaped like ResultsTable.load output"""
+    tools = rng.integers(0, len(TOOLS), rows)
+    benchmarks = rng.integers(0, max(1, rows // 20), rows)
+    execution_time = rng.lognormal(0.5, 1.0, rows)
+    measured = rng.random(rows) < 0.9
+    return pd.DataFrame({
+        "tool": pd.Categorical.from_codes(tools, TOOLS),
+        "benchmark": pd.Categorical([f"bench_{b:07d}.c" for b in benchmarks]),
+        "trial": rng.integers(0, 5, rows).astype("int32"),
+        "success": rng.random(rows) < 0.7,
+        "execution_time": np.minimum(execution_time, 300.0),
+        "tool_wall_time": np.where(measured, execution_time * 0.9, np.nan),
+        "cpu_user_time": np.where(measured, execution_time * 0.8, np.nan),
+        "cpu_system_time": np.where(measured, execution_time * 0.05, np.nan),
+        "peak_memory_mb": np.where(measured, rng.lognormal(5, 1, rows), np.nan),
+        "container_overhead_time": np.where(measured, execution_time * 0.1, np.nan),
+        "container_prepare_time": rng.random(rows) * 0.01,
+        "bugs_detected": rng.poisson(0.5, rows).astype(float),
+        "properties_verified": rng.poisson(3, rows).astype(float),
+        "alarms_generated": rng.poisson(1, rows).astype(float),
+    })
+
+def reports(analyzer):
+    return {
+        "summary": analyzer.generate_summary(),
+        "performance": analyzer.performance_analysis(),
+        "effectiveness": analyzer.effectiveness_analysis(),
+        "recommendations": analyzer.generate_recommendations(),
+        "timing": analyzer.timing_statistics(),
+    }
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def same(expected, actual):
+    """Equal reports, ignoring the bootstrap intervals (different random draws)"""
+    if isinstance(expected, dict):
+        return expected.keys() == actual.keys() and all(same(expected[k], actual[k]) for k in expected)
+    if isinstance(expected, float) or isinstance(actual, float):
+        return bool(np.isclose(expected, actual, equal_nan=True))
+    return expected == actual
+
+def without_intervals(report):
+    for pairs in report["timing"].values():
+        for stats in pairs.values():
+            stats.pop("ci_low")
+            stats.pop("ci_high")
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", default="10000,100000,1000000")
+    parser.add_argument("--legacy-max-rows", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10}{'pairs':>10}{'legacy (s)':>12}{'groupby (s)':>13}{'speedup':>9}")
+    for rows in (int(r) for r in args.rows.split(",")):
+        df = synthetic_results(rows, np.random.default_rng(args.seed))
+        pairs = df.groupby(["tool", "benchmark"], observed=True).ngroups
+        new_time, actual = timed(reports, ResultsAnalyzer("synthetic", df=df))
+        if rows > args.legacy_max_rows:
+            print(f"{rows:>10}{pairs:>10}{'-':>12}{new_time:>13.3f}{'-':>9}")
+            continue
+        legacy_time, expected = timed(reports, LegacyResultsAnalyzer(df))
+        if not same(without_intervals(expected), without_intervals(actual)):
+            raise SystemExit(f"❌ {rows} rows: groupby analyzer disagrees with the legacy analyzer")
+        print(f"{rows:>10}{pairs:>10}{legacy_time:>12.3f}{new_time:>13.3f}{legacy_time / new_time:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,106 @@
 #!/usr/bin/env python3
+import argparse
+import asyncio
+import hashlib
 import json
+import os
+import socket
+import subprocess
+import sys
 import time
 import yaml
 from pathlib import Path
 from src.benchmark_generator import BenchmarkGenerator
+from src.benchmark_index import BenchmarkIndex
+from src.benchmark_manifest import BenchmarkManifest
+from src.experiment_scheduler import ExperimentScheduler
+from src.job_queue import JobQueue
+from src.portfolio import PortfolioRace, PORTFOLIO_POLICIES
+from src.result_cache import ResultCache
+from src.results_store import ResultsStore
+from src.results_table import ResultsTable
+from src.scaling_benchmarks import ScalingBenchmarkGenerator
 from src.tool_runners.cbmc_runner import CBMCRunner
 from src.tool_runners.framac_runner import FramaCValueRunner, FramaCWPRunner
 from src.tool_runners.eacsl_runner import EACSLRunner
+from src.tool_runners.backends import create_backend
+from src.tool_runners.raw_output import RawOutputWriter
 from src.results_analyzer import ResultsAnalyzer
 from src.visualization import ResultsVisualizer
 
 class ExperimentRunner:
-    def __init__(self, config_path="config/experiment_config.yaml"):
+    def __init__(self, config_path="config/experiment_config.yaml", max_workers=None, backend=None,
+                 use_cache=True, refresh_cache=False, resume=False, use_async=False, repeat=1, warmup=0,
+                 figure_format=None, figure_dpi=None, portfolio=None, distributed=False, spawn_workers=0,
+                 queue_path=None, scaling=False, categories=None, tags=None, changed_since=None):
+        self.config_path = config_path
         self.config = self.load_config(config_path)
+        self.max_workers = max_workers
         self.results = []
         self.benchmarks_path = Path("benchmarks")
         self.results_path = Path("results")
+        self.resume = resume
+        self.use_async = use_async
+        # Repeated-trial mode: every pair runs warmup + repeat times in a row
+        self.repeat = max(1, repeat)
+        self.warmup = max(0, warmup)
+        self.repeated = self.repeat > 1 or self.warmup > 0
+        # Overrides of settings.figures
+        self.figure_format = figure_format
+        self.figure_dpi = figure_dpi
         
-        # Initialize tool runners
+        # Append-only log of result records, compacted at the end of the run
+        self.store = ResultsStore(self.results_path / "raw" / "results_log.jsonl")
+        
+        # Execution backend shared by all tool runners
+        settings = self.config.get("experiment", {}).get("settings", {})
+        
+        # Portfolio mode: the tools of a benchmark race each other (see PortfolioRace)
+        if portfolio == "config":
+            portfolio = settings.get("portfolio_policy", "first-unsafe")
+        self.portfolio_policy = portfolio
+        if portfolio and not self.use_async:
+            print("ℹ️  Portfolio mode: running jobs on the asyncio event loop")
+            self.use_async = True
+        self.backend_name = backend or settings.get("execution_backend", "compose")
+        self.backend = create_backend(self.backend_name)
+        
+        # Coordinator mode: jobs go to a queue served by run_worker.py processes
+        self.distributed = distributed
+        self.spawn_workers = spawn_workers
+        self.queue_path = queue_path
+        
+        # Full tool output goes to results/raw/output/, records keep excerpts
+        raw_output = RawOutputWriter.from_config(self.config)
+        
+        # Initialize tool runners (flags, timeouts and resource limits come from the config)
         self.tool_runners = {
-            "cbmc": CBMCRunner(),
-            "framac_value": FramaCValueRunner(),
-            "framac_wp": FramaCWPRunner(),
-            "eacsl": EACSLRunner()
+            runner_class.tool_name: runner_class.from_config(self.config, self.backend, raw_output)
+            for runner_class in (CBMCRunner, FramaCValueRunner, FramaCWPRunner, EACSLRunner)
         }
         
-        # Benchmark to tool mapping
-        self.benchmark_mapping = {
-            "buffer_overflow.c": ["cbmc", "eacsl"],
-            "null_pointer.c": ["cbmc", "framac_value"],
-            "arithmetic_safety.c": ["cbmc", "framac_value", "eacsl"],
-            "resource_usage.c": ["framac_value"],
-            "functional_correctness.c": ["framac_wp", "eacsl"],
-            "concurrency_safety.c": ["cbmc", "eacsl"],
-            "cruise_control.c": ["framac_wp", "cbmc", "framac_value"]
-        }
+        # Result cache keyed on benchmark content, tool, flags and version
+        self.refresh_cache = refresh_cache
+        self.cache = ResultCache.from_config(self.config, refresh=refresh_cache) if use_cache else None
+        if self.repeated and self.cache:
+            # Every trial has to actually run
+            print("ℹ️  Repeated trials: result cache disabled")
+            self.cache = None
+        
+        # Synthetic suite of growing benchmarks (benchmarks.scaling), run after the fixed ones
+        self.scaling_generator = ScalingBenchmarkGenerator.from_config(self.config)
+        self.scaling = scaling or self.config.get("benchmarks", {}).get("scaling", {}).get("enabled", False)
+        
+        # Benchmarks and their tools, discovered from benchmarks.categories and file headers
+        self.benchmark_index = BenchmarkIndex.from_config(
+            self.config,
+            default_tools=list(self.tool_runners),
+            manifests=[self.benchmarks_path / "manifest.json", self.scaling_generator.manifest_path]
+        )
+        # Subset of the index to run (each filter applies only when given)
+        self.categories = categories
+        self.tags = tags
+        self.changed_since = changed_since
     
     def load_config(self, config_path):
         """Load experiment configuration"""
@@ -50,80 +116,419 @@ class ExperimentRunner:
         (self.results_path / "raw").mkdir(exist_ok=True)
         (self.results_path / "processed").mkdir(exist_ok=True)
         
-        # Generate benchmarks
-        generator = BenchmarkGenerator()
-        generator.generate_all_benchmarks()
-        
+        # Generate benchmarks (a resumed run keeps the files the first attempt used). Only
+        # the files whose content changed are written, so unchanged ones keep their mtime.
+        if self.resume and any(self.benchmarks_path.glob("*/*.c")):
+            print("♻️  Resuming: keeping existing benchmarks")
+        else:
+            generator = BenchmarkGenerator(self.benchmarks_path)
+            generator.generate_all_benchmarks()
+        if self.scaling and not (self.resume and self.scaling_generator.manifest_path.exists()):
+            self.scaling_generator.generate_suite()
         print("✅ Environment setup complete!")
     
     def run_all_experiments(self):
         """Run all experiments"""
         print("🔬 Starting experimental runs...")
         
-        all_benchmarks = []
-        for category in ["memory_safety", "arithmetic", "resource", "functional", "advanced"]:
-            category_path = self.benchmarks_path / category
-            if category_path.exists():
-                all_benchmarks.extend(list(category_path.glob("*.c")))
+        scaling_manifest = self.scaling_manifest()
+        scaling_benchmarks = [(entry["path"], "scaling", entry["tools"], [entry["family"]])
+                              for entry in (scaling_manifest or {"benchmarks": {}})["benchmarks"].values()]
+        index = self.benchmark_index.refresh(scaling_benchmarks)
+        selected = index.select(self.categories, self.tags, self.changed_since)
+        if self.categories or self.tags or self.changed_since:
+            print(f"📚 {len(selected)} of {len(index.entries)} benchmarks selected")
+        unknown = {tool_name for entry in selected for tool_name in entry["tools"]} - set(self.tool_runners)
+        if unknown:
+            print(f"⚠️  Unknown tools in the benchmark index, skipped: {', '.join(sorted(unknown))}")
         
-        total_experiments = sum(len(self.benchmark_mapping.get(b.name, [])) for b in all_benchmarks)
-        completed = 0
+        self.store.run_info = self.run_stamp()
+        previous_results = self.load_resume_state() if self.resume else []
+        self.store.open(fresh=not self.resume)
+        finished = {ResultsStore.record_key(r) for r in previous_results}
         
-        for benchmark in all_benchmarks:
-            tools = self.benchmark_mapping.get(benchmark.name, [])
-            
-            for tool_name in tools:
-                completed += 1
-                print(f"📊 Running {tool_name} on {benchmark.name} ({completed}/{total_experiments})")
-                
-                try:
-                    runner = self.tool_runners[tool_name]
-                    result = runner.run_verification(
-                        benchmark, 
-                        self.results_path / "raw"
-                    )
-                    
-                    self.results.append(result)
-                    
-                    # Save intermediate results
-                    self.save_results()
-                    
-                except Exception as e:
-                    print(f"❌ Error running {tool_name} on {benchmark.name}: {e}")
-                    error_result = {
-                        "tool": tool_name,
-                        "benchmark": benchmark.name,
-                        "success": False,
-                        "error": str(e),
-                        "execution_time": 0,
-                        "result": {"status": "ERROR"}
-                    }
-                    self.results.append(error_result)
+        jobs = []
+        for entry in selected:
+            benchmark = Path(entry["path"])
+            benchmark_tools = [tool_name for tool_name in entry["tools"] if tool_name in self.tool_runners]
+            if self.portfolio_policy:
+                # One job racing every tool of the benchmark that has no result yet
+                tools = [tool_name for tool_name in benchmark_tools if (tool_name, benchmark.name, 0) not in finished]
+                if tools:
+                    jobs.append({"index": len(jobs), "benchmark": benchmark, "tool": "portfolio", "tools": tools})
+                continue
+            for tool_name in benchmark_tools:
+                trials = [trial for trial in range(self.repeat)
+                          if (tool_name, benchmark.name, trial) not in finished]
+                if not trials:
+                    continue
+                job = {"index": len(jobs), "benchmark": benchmark, "tool": tool_name}
+                if self.repeated:
+                    job["trials"] = trials
+                    job["runs"] = self.warmup + len(trials)
+                jobs.append(job)
+        
+        total_experiments = len(jobs)
+        progress = {"started": 0}
+        
+        def on_start(job):
+            progress["started"] += 1
+            runs = f" x{job['runs']}" if self.repeated else ""
+            tools = " vs ".join(job["tools"]) if "tools" in job else job["tool"]
+            print(f"📊 Running {tools} on {job['benchmark'].name}{runs} ({progress['started']}/{total_experiments})")
+        
+        def on_complete(job, result):
+            # Each record is written to the log exactly once
+            for record in self.job_records(result):
+                self.store.append(record)
         
+        scheduler = ExperimentScheduler.from_config(
+            self.config,
+            max_workers=self.max_workers,
+            history=ExperimentScheduler.build_history(self.load_previous_results())
+        )
+        self.scheduler = scheduler
+        try:
+            if self.distributed:
+                new_results = self.run_distributed(jobs, on_complete)
+            elif self.use_async:
+                new_results = asyncio.run(scheduler.run_async(
+                    jobs, self.execute_job_async, on_start=on_start, on_complete=on_complete
+                ))
+            else:
+                new_results = scheduler.run(jobs, self.execute_job, on_start=on_start, on_complete=on_complete)
+        finally:
+            self.store.close()
+        new_results = [record for result in new_results for record in self.job_records(result)]
+        self.results = ResultsStore.merge(previous_results, new_results)
+        self.save_results()
+        if self.portfolio_policy:
+            self.report_portfolio(new_results)
+        
+        if self.cache:
+            stats = self.cache.summary()
+            print(f"🗃️  Cache: {stats['hits']} hits, {stats['misses']} misses "
+                  f"({stats['hit_rate']:.0%} hit rate), {stats['evictions']} evictions")
         print("✅ All experiments completed!")
         return self.results
     
+    def run_distributed(self, jobs, on_complete):
+        """Publish the jobs to the queue and collect the records the workers send back"""
+        queue = JobQueue.from_config(self.config, self.queue_path)
+        run_id = queue.publish([self.queue_payload(job) for job in jobs],
+                               [self.scheduler.estimate_duration(job) for job in jobs])
+        print(f"📮 Published {len(jobs)} jobs to {queue.path} (run {run_id})")
+        workers = self.start_local_workers(queue)
+        results = {}
+        try:
+            while len(results) < len(jobs):
+                for payload, state, result, worker, attempts in queue.collect(run_id):
+                    job = jobs[payload["index"]]
+                    if state == "failed":
+                        result = self._create_job_error(
+                            job["tool"], job["benchmark"], f"lost by its workers after {attempts} leases")
+                    results[job["index"]] = result
+                    on_complete(job, result)
+                    print(f"📊 {job['tool']} on {job['benchmark'].name} finished by {worker} "
+                          f"({len(results)}/{len(jobs)})")
+                if len(results) < len(jobs):
+                    if workers and all(worker.poll() is not None for worker in workers) and queue.open_jobs(run_id):
+                        raise RuntimeError(f"every local worker exited with {queue.open_jobs(run_id)} jobs left")
+                    time.sleep(0.5)
+        finally:
+            for worker in workers:
+                if worker.poll() is None:
+                    worker.terminate()
+            for worker in workers:
+                worker.wait()
+        self.report_workers(queue.worker_stats(run_id))
+        return [results[job["index"]] for job in jobs]
+    
+    def queue_payload(self, job):
+        """JSON form of a job, with the benchmark hash the workers check their copy against"""
+        payload = {key: value for key, value in job.items() if key != "benchmark"}
+        payload["benchmark"] = str(job["benchmark"])
+        payload["sha256"] = self.benchmark_hash(job["benchmark"])
+        if "trials" in job:
+            payload["warmup"] = self.warmup
+        return payload
+    
+    def start_local_workers(self, queue):
+        """Worker processes on this host that exit once the queue is drained"""
+        command = [sys.executable, "run_worker.py", "--config", str(self.config_path), "--queue", str(queue.path),
+                   "--backend", self.backend_name, "--exit-when-idle"]
+        if not self.cache:
+            command.append("--no-cache")
+        elif self.refresh_cache:
+            command.append("--refresh")
+        return [subprocess.Popen([*command, "--worker-id", f"{socket.gethostname()}-local{index}"])
+                for index in range(self.spawn_workers)]
+    
+    def execute_queued_job(self, payload, worker_id):
+        """Run a job leased from the queue (worker side)"""
+        job = dict(payload, benchmark=Path(payload["benchmark"]))
+        try:
+            if self.benchmark_hash(job["benchmark"]) != payload["sha256"]:
+                raise ValueError("benchmark differs from the coordinator's copy")
+            result = self.execute_job(job)
+        except Exception as e:
+            result = self._create_job_error(job["tool"], job["benchmark"], e)
+        for record in self.job_records(result):
+            record["worker"] = worker_id
+        return result
+    
+    def report_workers(self, stats):
+        """Print per-worker throughput and keep it next to the raw results"""
+        for worker in stats:
+            rate = f"{worker['jobs_per_minute']:.1f} jobs/min" if worker["jobs_per_minute"] is not None else "n/a"
+            utilization = f"{worker['utilization']:.0%} busy" if worker["utilization"] is not None else ""
+            print(f"🖥️  {worker['worker']}: {worker['jobs_completed']} jobs, {rate} {utilization}"
+                  + (f", {worker['leases_expired']} leases expired" if worker["leases_expired"] else ""))
+        with open(self.results_path / "raw" / "worker_stats.json", 'w') as f:
+            json.dump(stats, f, indent=2)
+    
+    def scaling_manifest(self):
+        """Ground truth of the generated scaling suite, when this run includes it"""
+        if not self.scaling:
+            return None
+        return ScalingBenchmarkGenerator.load_manifest(self.scaling_generator.manifest_path)
+    
+    def ground_truth(self):
+        """Expected defects of the generated benchmarks and of the scaling suite, by benchmark name"""
+        benchmarks = {}
+        for manifest in (BenchmarkManifest.load(self.benchmarks_path / "manifest.json"), self.scaling_manifest()):
+            if manifest:
+                benchmarks.update(manifest["benchmarks"])
+        return {"benchmarks": benchmarks} if benchmarks else None
+    
+    def benchmark_hash(self, benchmark):
+        """sha256 of a benchmark, taken from the benchmark index while the file is unchanged"""
+        return BenchmarkManifest.current_hash(benchmark, self.benchmark_index.entries.get(os.path.normpath(benchmark)))
+    
+    def report_portfolio(self, records):
+        """Print the winners of the portfolio races and the time they saved"""
+        races = {r["benchmark"]: r["portfolio"] for r in records if r.get("portfolio")}
+        wins = {}
+        for race in races.values():
+            if race["winner"]:
+                wins[race["winner"]] = wins.get(race["winner"], 0) + 1
+        saved = sum(race["time_saved"] for race in races.values())
+        winners = ", ".join(f"{tool} {count}" for tool, count in sorted(wins.items())) or "none"
+        # With `all` nothing is cancelled: report what stopping early would have saved
+        saved_label = "could be saved" if self.portfolio_policy == "all" else "saved"
+        print(f"🏁 Portfolio ({self.portfolio_policy}): {sum(wins.values())}/{len(races)} benchmarks decided "
+              f"(wins: {winners}), ~{saved:.1f}s {saved_label}")
+    
+    def run_stamp(self):
+        """Identity of this run: an id, and a hash of everything that decides which records it produces"""
+        config_settings = self.config.get("experiment", {}).get("settings", {})
+        settings = {
+            "tools": self.config.get("tools"),
+            "benchmarks": self.config.get("benchmarks"),
+            "limits": {key: config_settings.get(key) for key in ("timeout_seconds", "max_memory_mb", "cpus_per_job")},
+            "repeat": self.repeat,
+            "warmup": self.warmup,
+            "portfolio": self.portfolio_policy,
+            "scaling": bool(self.scaling)
+        }
+        config_hash = hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode()).hexdigest()
+        return {"run_id": time.strftime("%Y%m%d_%H%M%S_") + config_hash[:8], "config_hash": config_hash}
+    
+    def load_resume_state(self):
+        """Finished records of the previous run of this configuration, from its log or consolidated file"""
+        log_stamp = ResultsStore.read_stamp(self.store.log_file)
+        if not self.store.log_file.exists():
+            # The log was lost: restart it from the consolidated file, if that belongs to this configuration
+            latest_file = self.results_path / "raw" / "latest_results.json"
+            if ResultsStore.same_run(ResultsStore.read_stamp(latest_file), self.store.run_info):
+                self.store.seed(self.load_previous_results())
+            else:
+                print("♻️  Resuming: no results log of this configuration, starting from scratch")
+                self.store.seed([])
+        elif log_stamp is not None and not ResultsStore.same_run(log_stamp, self.store.run_info):
+            print(f"♻️  Resuming: the results log belongs to another configuration (run {log_stamp.get('run_id')}), "
+                  f"starting from scratch")
+            self.store.seed([])
+        else:
+            # Keep the stamp of the run being resumed
+            self.store.run_info = log_stamp or self.store.run_info
+        
+        finished = self.store.finished_records()
+        pending = len(self.store.latest_view()) - len(finished)
+        print(f"♻️  Resuming: {len(finished)} jobs already finished, {pending} to retry")
+        return finished
+    
+    @staticmethod
+    def job_records(result):
+        """Result records produced by a job (a repeated-trial job produces several)"""
+        return result if isinstance(result, list) else [result]
+    
+    def trial_output_dir(self, trial):
+        """Raw output directory of one trial, so that trials do not overwrite each other"""
+        return self.results_path / "raw" / "trials" / str(trial)
+    
+    def execute_trials(self, job):
+        """Run the warm-ups (discarded) and then every measured trial of a pair"""
+        runner = self.tool_runners[job["tool"]]
+        for _ in range(job.get("warmup", self.warmup)):
+            runner.run_verification(job["benchmark"], self.trial_output_dir("warmup"))
+        records = []
+        for trial in job["trials"]:
+            try:
+                result = runner.run_verification(job["benchmark"], self.trial_output_dir(trial))
+            except Exception as e:
+                result = self._create_job_error(job["tool"], job["benchmark"], e)
+            result["trial"] = trial
+            records.append(result)
+        return records
+    
+    async def execute_trials_async(self, job):
+        """Event-loop version of execute_trials"""
+        runner = self.tool_runners[job["tool"]]
+        for _ in range(job.get("warmup", self.warmup)):
+            await runner.run_verification_async(job["benchmark"], self.trial_output_dir("warmup"))
+        records = []
+        for trial in job["trials"]:
+            try:
+                result = await runner.run_verification_async(job["benchmark"], self.trial_output_dir(trial))
+            except Exception as e:
+                result = self._create_job_error(job["tool"], job["benchmark"], e)
+            result["trial"] = trial
+            records.append(result)
+        return records
+    
+    async def execute_portfolio_async(self, job):
+        """Race the tools of a benchmark; one record per tool (cancelled ones included)"""
+        benchmark = job["benchmark"]
+        race = PortfolioRace(
+            self.portfolio_policy,
+            estimate=lambda tool_name: self.scheduler.estimate_tool(tool_name, benchmark)
+        )
+        
+        def execute(tool_name):
+            return self.execute_job_async({"benchmark": benchmark, "tool": tool_name})
+        
+        def cancelled_result(tool_name, elapsed, winner):
+            return self.tool_runners[tool_name]._create_cancelled_result(benchmark.name, elapsed, winner)
+        
+        return await race.run(job["tools"], execute, cancelled_result)
+    
+    def execute_job(self, job):
+        """Run a single (benchmark, tool) pair"""
+        if "trials" in job:
+            return self.execute_trials(job)
+        benchmark = job["benchmark"]
+        tool_name = job["tool"]
+        try:
+            runner = self.tool_runners[tool_name]
+            cache_key, cached = self.lookup_cache(runner, benchmark)
+            if cached is not None:
+                return cached
+            
+            result = runner.run_verification(
+                benchmark, 
+                self.results_path / "raw"
+            )
+            if cache_key:
+                self.cache.put(cache_key, result)
+            return result
+        except Exception as e:
+            return self._create_job_error(tool_name, benchmark, e)
+    
+    async def execute_job_async(self, job):
+        """Run a single (benchmark, tool) pair on the event loop"""
+        if "trials" in job:
+            return await self.execute_trials_async(job)
+        if "tools" in job:
+            return await self.execute_portfolio_async(job)
+        benchmark = job["benchmark"]
+        tool_name = job["tool"]
+        try:
+            runner = self.tool_runners[tool_name]
+            cache_key, cached = self.lookup_cache(runner, benchmark)
+            if cached is not None:
+                return cached
+            
+            result = await runner.run_verification_async(
+                benchmark,
+                self.results_path / "raw"
+            )
+            if cache_key:
+                self.cache.put(cache_key, result)
+            return result
+        except Exception as e:
+            return self._create_job_error(tool_name, benchmark, e)
+    
+    def lookup_cache(self, runner, benchmark):
+        """Cache key and cached result (None on a miss) for a job"""
+        if not self.cache:
+            return None, None
+        cache_key = self.cache_key(runner, benchmark)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            cached["cache_hit"] = True
+        return cache_key, cached
+    
+    def _create_job_error(self, tool_name, benchmark, error):
+        print(f"❌ Error running {tool_name} on {benchmark.name}: {error}")
+        return {
+            "tool": tool_name,
+            "benchmark": benchmark.name,
+            "success": False,
+            "error": str(error),
+            "execution_time": 0,
+            "result": {"status": "ERROR"}
+        }
+    
+    def cache_key(self, runner, benchmark):
+        """Cache key for running a tool on a benchmark"""
+        tool_config = self.config.get("tools", {}).get(runner.tool_name, {})
+        flags = runner.build_command("<benchmark>")
+        return ResultCache.make_key(benchmark, runner.tool_name, flags, tool_config.get("version", ""),
+                                    self.benchmark_hash(benchmark))
+    
+    def load_previous_results(self):
+        """Load results of the previous run, if any"""
+        latest_file = self.results_path / "raw" / "latest_results.json"
+        if not latest_file.exists():
+            return []
+        try:
+            with open(latest_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+    
     def save_results(self):
-        """Save results to JSON file"""
+        """Compact the results log into the consolidated JSON files"""
         timestamp = time.strftime("%Y%m%d_%H%M%S")
         results_file = self.results_path / "raw" / f"experiment_results_{timestamp}.json"
-        
-        with open(results_file, 'w') as f:
-            json.dump(self.results, f, indent=2)
-        
-        # Also save to latest file
         latest_file = self.results_path / "raw" / "latest_results.json"
-        with open(latest_file, 'w') as f:
-            json.dump(self.results, f, indent=2)
+        results = self.store.compact([results_file, latest_file])
+        
+        # Columnar copy read by the analysis and visualization
+        ResultsTable.write(results, results_file.with_suffix(".parquet"))
+        ResultsTable.write(results, self.results_table())
+    
+    def results_table(self):
+        """Parquet file of the latest results"""
+        return self.results_path / "raw" / "latest_results.parquet"
     
     def analyze_results(self):
         """Analyze and visualize results"""
         print("📈 Analyzing results...")
         
-        analyzer = ResultsAnalyzer(self.results_path / "raw" / "latest_results.json")
+        # Load the results once and share them between analysis and plots
+        results_table = self.results_table()
+        df = ResultsTable.load(results_table)
+        
+        scaling_manifest = self.scaling_manifest()
+        analyzer = ResultsAnalyzer(results_table, df=df, scaling=scaling_manifest, ground_truth=self.ground_truth())
         analyzer.generate_comprehensive_analysis()
         
-        visualizer = ResultsVisualizer(self.results_path / "raw" / "latest_results.json")
+        visualizer = ResultsVisualizer.from_config(
+            self.config, results_table, df=df, image_format=self.figure_format, dpi=self.figure_dpi,
+            scaling=scaling_manifest
+        )
         visualizer.generate_all_visualizations()
         
         print("✅ Analysis complete! Check results/processed/ for outputs.")
@@ -134,13 +539,91 @@ def main():
     print("      SAFETY-CRITICAL VERIFICATION EXPERIMENTAL SETUP")
     print("=" * 60)
     
-    runner = ExperimentRunner()
+    parser = argparse.ArgumentParser(description="Run verification tool experiments")
+    parser.add_argument("--config", default="config/experiment_config.yaml",
+                        help="Path to the experiment configuration")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of concurrent verification jobs (default: settings.max_workers)")
+    parser.add_argument("--backend", choices=["compose", "warm", "local"], default=None,
+                        help="Execution backend (default: settings.execution_backend)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Neither read nor write the result cache")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Ignore cached results but store the fresh ones")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted run from the results log")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Drive all jobs from one asyncio event loop instead of a thread pool")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Measured trials per (benchmark, tool) pair; every sample is stored")
+    parser.add_argument("--warmup", type=int, default=0,
+                        help="Discarded warm-up runs before the measured trials of each pair")
+    parser.add_argument("--figure-format", choices=["png", "pdf", "svg"], default=None,
+                        help="Image format of the figures (default: settings.figures.format)")
+    parser.add_argument("--figure-dpi", type=int, default=None,
+                        help="Resolution of raster figures (default: settings.figures.dpi)")
+    parser.add_argument("--portfolio", nargs="?", const="config", default=None, metavar="POLICY",
+                        help="Race the tools of each benchmark and cancel the others once one is decisive; "
+                             f"POLICY is one of {', '.join(PORTFOLIO_POLICIES)} (default: settings.portfolio_policy)")
+    parser.add_argument("--distributed", action="store_true",
+                        help="Coordinator mode: publish the jobs to a queue served by run_worker.py processes")
+    parser.add_argument("--spawn-workers", type=int, default=0, metavar="N",
+                        help="With --distributed, also start N workers on this host")
+    parser.add_argument("--queue", default=None,
+                        help="Job queue database (default: settings.distributed.queue)")
+    parser.add_argument("--scaling", action="store_true",
+                        help="Also generate and run the synthetic scaling suite (benchmarks.scaling)")
+    parser.add_argument("--category", action="append", default=None, dest="categories",
+                        help="Only run the benchmarks of this category (repeatable)")
+    parser.add_argument("--tag", action="append", default=None, dest="tags",
+                        help="Only run the benchmarks with this tag (repeatable)")
+    parser.add_argument("--changed-since", default=None, metavar="COMMIT",
+                        help="Only run the benchmarks changed since a git commit (file or generator)")
+    args = parser.parse_args()
+    if args.portfolio not in (None, "config", *PORTFOLIO_POLICIES):
+        parser.error(f"--portfolio: unknown policy {args.portfolio!r}")
+    if args.portfolio and (args.repeat > 1 or args.warmup > 0):
+        parser.error("--portfolio cannot be combined with --repeat/--warmup")
+    if args.distributed and args.portfolio:
+        parser.error("--distributed cannot be combined with --portfolio")
+    if args.spawn_workers and not args.distributed:
+        parser.error("--spawn-workers requires --distributed")
+    if args.changed_since:
+        try:
+            BenchmarkIndex.changed_paths(args.changed_since)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    runner = ExperimentRunner(
+        args.config,
+        max_workers=args.workers,
+        backend=args.backend,
+        use_cache=not args.no_cache,
+        refresh_cache=args.refresh,
+        resume=args.resume,
+        use_async=args.use_async,
+        repeat=args.repeat,
+        warmup=args.warmup,
+        figure_format=args.figure_format,
+        figure_dpi=args.figure_dpi,
+        portfolio=args.portfolio,
+        distributed=args.distributed,
+        spawn_workers=args.spawn_workers,
+        queue_path=args.queue,
+        scaling=args.scaling,
+        categories=args.categories,
+        tags=args.tags,
+        changed_since=args.changed_since
+    )
     
     # Step 1: Setup environment
     runner.setup_environment()
     
     # Step 2: Run experiments
-    results = runner.run_all_experiments()
+    try:
+        results = runner.run_all_experiments()
+    finally:
+        runner.backend.shutdown()
     
     # Step 3: Analyze results
     runner.analyze_results()
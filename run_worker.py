@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+import argparse
+import signal
+from run_experiments import ExperimentRunner
+from src.job_queue import JobQueue
+from src.queue_worker import QueueWorker
+
+def main():
+    """Serve jobs published by `run_experiments.py --distributed`"""
+    parser = argparse.ArgumentParser(description="Run verification jobs from a coordinator's job queue")
+    parser.add_argument("--config", default="config/experiment_config.yaml",
+                        help="Path to the experiment configuration")
+    parser.add_argument("--queue", default=None,
+                        help="Job queue database (default: settings.distributed.queue)")
+    parser.add_argument("--backend", choices=["compose", "warm", "local"], default=None,
+                        help="Execution backend (default: settings.execution_backend)")
+    parser.add_argument("--slots", type=int, default=None,
+                        help="Jobs run at the same time by this worker (default: settings.distributed.worker_slots)")
+    parser.add_argument("--worker-id", default=None,
+                        help="Name in the throughput metrics (default: <host>-<pid>)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Neither read nor write the result cache")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Ignore cached results but store the fresh ones")
+    parser.add_argument("--exit-when-idle", action="store_true",
+                        help="Exit once no job is pending or running instead of waiting for the next run")
+    args = parser.parse_args()
+
+    runner = ExperimentRunner(
+        args.config,
+        backend=args.backend,
+        use_cache=not args.no_cache,
+        refresh_cache=args.refresh
+    )
+    settings = runner.config.get("experiment", {}).get("settings", {})
+    queue = JobQueue.from_config(runner.config, args.queue)
+    tool_limits = {tool_name: tool_config["max_concurrent"]
+                   for tool_name, tool_config in runner.config.get("tools", {}).items()
+                   if tool_config.get("max_concurrent")}
+    worker = QueueWorker(
+        queue,
+        lambda payload: runner.execute_queued_job(payload, worker.worker_id),
+        worker_id=args.worker_id,
+        slots=args.slots or settings.get("distributed", {}).get("worker_slots", 1),
+        tool_limits=tool_limits,
+        poll_interval=settings.get("distributed", {}).get("poll_interval", 1.0),
+        exit_when_idle=args.exit_when_idle
+    )
+    # SIGTERM lets the running jobs finish; their results still reach the queue
+    signal.signal(signal.SIGTERM, lambda signum, frame: worker.stop())
+
+    print(f"👷 Worker {worker.worker_id} serving {queue.path} with {worker.slots} slot(s)")
+    try:
+        completed = worker.run()
+    except KeyboardInterrupt:
+        worker.stop()
+        completed = worker.completed
+    finally:
+        runner.backend.shutdown()
+    print(f"👷 Worker {worker.worker_id} done: {completed} jobs")
+
+if __name__ == "__main__":
+    main()
@@ -54,7 +54,7 @@ $COMPOSE_CMD build --no-cache
 # ----------------------------
 echo "📝 Generating benchmarks..."
 # Run benchmark generator in the Python/tools container
-$COMPOSE_CMD run --rm tools python3 src/benchmark_generator.py
+$COMPOSE_CMD run --rm tools python3 -m src.benchmark_generator
 
 echo "✅ Benchmarks generated!"
 
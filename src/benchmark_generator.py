@@ -1,12 +1,68 @@
 #!/usr/bin/env python3
 import os
+import re
 from pathlib import Path
+from src.benchmark_manifest import BenchmarkManifest
+
+# Expected outcome of every function of the generated benchmarks: the defects it
+# contains as (category, property class, start of the defective statement). The
+# statement is looked up from the function's header, which gives its line.
+GROUND_TRUTH = {
+    "buffer_overflow.c": {
+        "buffer_overflow_unsafe": [("out_of_bounds", "array_bounds", "buffer[index] = 'x';")],
+        "buffer_overflow_safe": [],
+        "main": []
+    },
+    "null_pointer.c": {
+        "null_pointer_unsafe": [("null_pointer", "pointer_dereference", "printf(")],
+        "null_pointer_safe": [],
+        "main": []
+    },
+    "arithmetic_safety.c": {
+        "integer_overflow_unsafe": [("integer_overflow", "overflow", "return a + b;")],
+        "integer_overflow_safe": [],
+        "division_by_zero_unsafe": [("division_by_zero", "division_by_zero", "return a / b;")],
+        "division_by_zero_safe": [],
+        "main": []
+    },
+    "resource_usage.c": {
+        "potential_infinite_loop": [],
+        "memory_leak_unsafe": [("memory_leak", "memory_leak", "int* ptr = (int*)malloc")],
+        "memory_leak_safe": [],
+        "real_time_bound_unsafe": [("timing_bound", "timing", "for (int i = 0; i < 1000; i++)")],
+        "main": []
+    },
+    "functional_correctness.c": {
+        "safe_division": [],
+        "unsafe_division": [("division_by_zero", "division_by_zero", "return numerator / divisor;")],
+        "misra_unsafe_cast": [("misra_cast", "misra", "char* ptr = (char*)x;")],
+        "misra_loop_violation": [("misra_loop", "misra", "while (i < 10)")],
+        "main": []
+    },
+    "concurrency_safety.c": {
+        "safe_increment": [],
+        "unsafe_increment": [("data_race", "data_race", "for (int i = 0; i < 1000; i++) non_atomic_shared++;")],
+        "producer_unsafe": [("data_race", "data_race", "buffer[write_index] = i;")],
+        "main": []
+    },
+    "cruise_control.c": {
+        "activate_cruise_control": [],
+        "regulate_speed_safe": [],
+        "main": []
+    }
+}
 
 class BenchmarkGenerator:
     def __init__(self, base_path="benchmarks"):
         self.base_path = Path(base_path)
+        # Hashes and ground truth of the benchmarks, by file name; unchanged files are not rewritten
+        self.manifest = BenchmarkManifest(self.manifest_path)
         self.create_directories()
     
+    @property
+    def manifest_path(self):
+        return self.base_path / "manifest.json"
+    
     def create_directories(self):
         """Create benchmark directory structure"""
         directories = [
@@ -26,7 +82,32 @@ class BenchmarkGenerator:
         self.generate_resource_benchmarks()
         self.generate_functional_benchmarks()
         self.generate_advanced_benchmarks()
-        print("✅ All benchmarks generated successfully!")
+        self.manifest.save(generator=os.path.relpath(__file__))
+        print(f"✅ All benchmarks generated successfully! ({self.manifest.summary()})")
+    
+    def write_benchmark(self, category, name, code):
+        """Write one benchmark (unless unchanged) and record its hash and ground truth"""
+        self.manifest.write(name, self.base_path / category / name, code, category=category,
+                            **self.locate_defects(name, code))
+    
+    @staticmethod
+    def locate_defects(name, code):
+        """Ground truth of a benchmark with the line of every defect listed in GROUND_TRUTH"""
+        lines = code.split("\n")
+        truth = {"functions": {}}
+        for function, defects in GROUND_TRUTH.get(name, {}).items():
+            header = next(index for index, line in enumerate(lines)
+                          if re.search(rf"\b{function}\s*\(", line) and line.rstrip().endswith("{"))
+            bugs = []
+            for category, property_class, statement in defects:
+                line = next(index for index in range(header, len(lines))
+                            if lines[index].strip().startswith(statement))
+                bugs.append({"category": category, "property_class": property_class, "line": line + 1})
+            truth["functions"][function] = {"expected": "UNSAFE" if bugs else "SAFE", "bugs": bugs}
+        bug_count = sum(len(function["bugs"]) for function in truth["functions"].values())
+        truth["expected_verdict"] = "UNSAFE" if bug_count else "SAFE"
+        truth["bug_count"] = bug_count
+        return truth
     
     def generate_memory_safety_benchmarks(self):
         """B1-B2: Memory safety benchmarks"""
@@ -82,10 +163,8 @@ class BenchmarkGenerator:
                 return 0;
             }
             """
-        with open(self.base_path / "memory_safety" / "buffer_overflow.c", "w") as f:
-            f.write(buffer_overflow_code)
-        with open(self.base_path / "memory_safety" / "null_pointer.c", "w") as f:
-            f.write(null_pointer_code)
+        self.write_benchmark("memory_safety", "buffer_overflow.c", buffer_overflow_code)
+        self.write_benchmark("memory_safety", "null_pointer.c", null_pointer_code)
     
     def generate_arithmetic_benchmarks(self):
         """B3: Arithmetic safety benchmarks"""
@@ -120,8 +199,7 @@ class BenchmarkGenerator:
                 return 0;
             }
             """
-        with open(self.base_path / "arithmetic" / "arithmetic_safety.c", "w") as f:
-            f.write(arithmetic_code)
+        self.write_benchmark("arithmetic", "arithmetic_safety.c", arithmetic_code)
     
     def generate_resource_benchmarks(self):
         """B4-B5: Resource usage benchmarks"""
@@ -160,8 +238,7 @@ class BenchmarkGenerator:
                 return 0;
             }
             """
-        with open(self.base_path / "resource" / "resource_usage.c", "w") as f:
-            f.write(resource_code)
+        self.write_benchmark("resource", "resource_usage.c", resource_code)
     
     def generate_functional_benchmarks(self):
         """B6-B7: Functional correctness benchmarks"""
@@ -201,8 +278,7 @@ class BenchmarkGenerator:
                 return 0;
             }
             """
-        with open(self.base_path / "functional" / "functional_correctness.c", "w") as f:
-            f.write(functional_code)
+        self.write_benchmark("functional", "functional_correctness.c", functional_code)
     
     def generate_advanced_benchmarks(self):
         """B9-B10: Advanced benchmarks"""
@@ -288,11 +364,9 @@ class BenchmarkGenerator:
                 return 0;
             }
             """
-        with open(self.base_path / "advanced" / "concurrency_safety.c", "w") as f:
-            f.write(concurrency_code)
+        self.write_benchmark("advanced", "concurrency_safety.c", concurrency_code)
         
-        with open(self.base_path / "advanced" / "cruise_control.c", "w") as f:
-            f.write(statemachine_code)
+        self.write_benchmark("advanced", "cruise_control.c", statemachine_code)
 
 if __name__ == "__main__":
     generator = BenchmarkGenerator()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+import fnmatch
+import json
+import os
+import re
+import subprocess
+from pathlib import Path
+from src.benchmark_manifest import BenchmarkManifest
+
+# `// @benchmark tools=cbmc,eacsl tags=memory,bounds expected=UNSAFE` in the leading comments of a file
+HEADER_PATTERN = re.compile(r"@benchmark\b(.*)")
+HEADER_FIELD = re.compile(r"(\w+)=([^\s*]+)")
+LIST_FIELDS = ("tools", "tags")
+
+class BenchmarkIndex:
+    """Benchmarks of the experiment: path, category, hash, tools, tags and expected verdict.
+
+    Discovery is declarative. Every category of the `benchmarks.categories`
+    configuration section has a directory (`benchmarks/<name>` by default)
+    and `files`: glob patterns, or entries with a `file` pattern and their
+    own `tools`, `tags` and `expected` verdict (the first matching entry
+    applies). A `@benchmark` comment among a file's leading comments
+    overrides both. Files without tools of their own get the category's
+    `tools`, or every tool.
+
+    The index is stored in `index.json`; `refresh` only re-reads the files
+    whose size or mtime changed (hashes of generated files come from their
+    suite's manifest), and `select` filters the entries by category, tag
+    or change since a git commit without touching the benchmarks.
+    """
+
+    def __init__(self, path="benchmarks/index.json", base_path="benchmarks", categories=None, default_tools=None,
+                 manifests=()):
+        self.path = Path(path)
+        self.base_path = Path(base_path)
+        self.categories = categories or []
+        self.default_tools = list(default_tools or [])
+        # Generator manifests (BenchmarkManifest), source of hashes and expected verdicts
+        self.manifests = list(manifests)
+        previous = BenchmarkManifest.load(self.path) or {}
+        self.entries = previous.get("benchmarks", {})
+
+    @classmethod
+    def from_config(cls, config, default_tools=None, manifests=()):
+        """Build an index from the `benchmarks` section of the configuration"""
+        benchmarks_config = config.get("benchmarks", {})
+        return cls(
+            path=benchmarks_config.get("index", "benchmarks/index.json"),
+            base_path=benchmarks_config.get("directory", "benchmarks"),
+            categories=benchmarks_config.get("categories"),
+            default_tools=default_tools,
+            manifests=manifests
+        )
+
+    @staticmethod
+    def read_header(path):
+        """Fields of the `@benchmark` comment in a file's header (before the first line of code)"""
+        fields = {}
+        in_comment = False
+        with open(path, 'r', errors='replace') as f:
+            for line in f:
+                stripped = line.strip()
+                if stripped and not in_comment and not stripped.startswith(("//", "/*")):
+                    break
+                if stripped.startswith("/*") or in_comment:
+                    in_comment = "*/" not in stripped
+                match = HEADER_PATTERN.search(stripped)
+                if match:
+                    for key, value in HEADER_FIELD.findall(match.group(1)):
+                        fields[key] = [item for item in value.split(",") if item] if key in LIST_FIELDS else value
+        return fields
+
+    def manifest_entries(self):
+        """Generated benchmarks by path: (manifest entry, generator source file)"""
+        entries = {}
+        for manifest_path in self.manifests:
+            manifest = BenchmarkManifest.load(manifest_path) or {}
+            for entry in manifest.get("benchmarks", {}).values():
+                entries[os.path.normpath(entry["path"])] = (entry, manifest.get("generator"))
+        return entries
+
+    def discover(self):
+        """(path, category, file entry) of every benchmark the categories select"""
+        found = []
+        for category in self.categories:
+            directory = Path(category.get("directory", self.base_path / category["name"]))
+            patterns = [item if isinstance(item, dict) else {"file": item} for item in category.get("files", ["*.c"])]
+            if not directory.is_dir():
+                continue
+            for path in sorted(directory.iterdir()):
+                if not path.is_file():
+                    continue
+                file_entry = next((item for item in patterns if fnmatch.fnmatch(path.name, item["file"])), None)
+                if file_entry is not None:
+                    found.append((path, category, file_entry))
+        return found
+
+    def refresh(self, extra=()):
+        """Rebuild the index from the categories (plus `extra` entries, e.g. a scaling suite); return it.
+
+        `extra` holds (path, category name, tools, tags) of benchmarks found
+        by other means. A file is only read when it is new or its size or
+        mtime changed.
+        """
+        generated = self.manifest_entries()
+        discovered = [(path, category["name"], file_entry.get("tools") or category.get("tools"),
+                       list(category.get("tags", [])) + list(file_entry.get("tags", [])), file_entry.get("expected"))
+                      for path, category, file_entry in self.discover()]
+        discovered += [(Path(path), category, tools, list(tags), None) for path, category, tools, tags in extra]
+
+        entries = {}
+        for path, category, tools, tags, expected in discovered:
+            key = os.path.normpath(path)
+            stat = path.stat()
+            previous = self.entries.get(key)
+            manifest_entry, generator = generated.get(key, (None, None))
+            if previous and previous.get("size") == stat.st_size and previous.get("mtime_ns") == stat.st_mtime_ns:
+                sha256, header = previous["sha256"], previous["header"]
+            else:
+                sha256 = BenchmarkManifest.current_hash(path, manifest_entry)
+                header = self.read_header(path)
+            if manifest_entry is not None and expected is None:
+                expected = manifest_entry.get("expected_verdict")
+            entries[key] = {
+                "name": path.name,
+                "path": key,
+                "category": header.get("category", category),
+                "sha256": sha256,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "tools": header.get("tools") or tools or self.default_tools,
+                "tags": sorted(set(tags) | set(header.get("tags", []))),
+                "expected_verdict": header.get("expected", expected),
+                "sources": [key] + ([generator] if generator else []),
+                "header": header
+            }
+
+        names = {}
+        for entry in entries.values():
+            if entry["name"] in names:
+                print(f"⚠️  Benchmarks {names[entry['name']]} and {entry['path']} share a name; "
+                      f"their results cannot be told apart")
+            names[entry["name"]] = entry["path"]
+
+        self.entries = entries
+        self.save()
+        return self
+
+    def save(self):
+        text = json.dumps({"benchmarks": self.entries}, indent=2)
+        try:
+            if self.path.read_text() == text:
+                return
+        except OSError:
+            pass
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.path.with_suffix(".tmp")
+        tmp_file.write_text(text)
+        os.replace(tmp_file, self.path)
+
+    @staticmethod
+    def changed_paths(commit):
+        """Files changed since a git commit (committed, staged, unstaged or untracked), relative to here"""
+        def git(*args):
+            result = subprocess.run(["git", *args], capture_output=True, text=True)
+            if result.returncode != 0:
+                raise ValueError(f"Cannot list the changes since {commit}: {result.stderr.strip()}")
+            return result.stdout.splitlines()
+        top = git("rev-parse", "--show-toplevel")[0]
+        changed = git("diff", "--name-only", commit, "--") + git("ls-files", "--others", "--exclude-standard")
+        return {os.path.normpath(os.path.relpath(os.path.join(top, name))) for name in changed}
+
+    def select(self, categories=None, tags=None, changed_since=None):
+        """Index entries in one of `categories`, with one of `tags`, and changed since a commit
+        (their file or the generator producing it); each filter applies only when given"""
+        changed = None
+        if changed_since:
+            # The index and the manifests are rewritten by every run, wherever the configuration puts them
+            generated = {os.path.normpath(path) for path in [self.path, *self.manifests]}
+            changed = self.changed_paths(changed_since) - generated
+        selected = []
+        for entry in self.entries.values():
+            if categories and entry["category"] not in categories:
+                continue
+            if tags and not set(tags) & set(entry["tags"]):
+                continue
+            if changed is not None and not changed & set(entry["sources"]):
+                continue
+            selected.append(entry)
+        return selected
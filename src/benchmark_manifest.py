@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+from pathlib import Path
+
+class BenchmarkManifest:
+    """Content hashes of a generated benchmark suite, kept in its manifest.json.
+
+    Generators write their files through `write`, which leaves a file alone
+    (content and mtime) when the manifest already records the same hash and
+    the file was not touched since, so regenerating an unchanged suite does
+    not write anything. Each entry holds the benchmark's path, sha256, size
+    and mtime next to whatever the generator records (ground truth,
+    category, ...); `current_hash` answers from the entry without reading
+    the file unless its size or mtime changed. Generators whose output is
+    costly to produce also record a hash of their inputs and skip
+    regenerating the files for which `reuse` finds it unchanged.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        previous = self.load(self.path) or {}
+        # Entries of the last generation, and of the one in progress
+        self.previous = previous.get("benchmarks", {})
+        self.benchmarks = {}
+        self.stats = {"written": 0, "unchanged": 0, "removed": 0}
+
+    @staticmethod
+    def load(path):
+        """Contents of a manifest, or None when there is none"""
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def content_hash(content):
+        return hashlib.sha256(content.encode() if isinstance(content, str) else content).hexdigest()
+
+    @staticmethod
+    def unchanged_on_disk(entry):
+        """Whether the file of an entry still has the size and mtime recorded for it"""
+        try:
+            stat = os.stat(entry["path"])
+        except (OSError, KeyError):
+            return False
+        return stat.st_size == entry.get("size") and stat.st_mtime_ns == entry.get("mtime_ns")
+
+    @classmethod
+    def current_hash(cls, path, entry=None):
+        """sha256 of a benchmark: the recorded one while the file is unchanged, else read from disk"""
+        if entry is not None and cls.unchanged_on_disk(entry):
+            return entry["sha256"]
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def reuse(self, name, inputs):
+        """Keep the entry of a benchmark generated from the same inputs and untouched since.
+
+        `inputs` is a hash of whatever determines the file (parameters, seed,
+        generator code); a True return saves generating the content at all.
+        """
+        previous = self.previous.get(name)
+        if previous is None or previous.get("inputs") != inputs or not self.unchanged_on_disk(previous):
+            return False
+        self.benchmarks[name] = previous
+        self.stats["unchanged"] += 1
+        return True
+
+    def write(self, name, path, content, **fields):
+        """Write a benchmark unless it already has this content; True when the file was written"""
+        path = Path(path)
+        digest = self.content_hash(content)
+        previous = self.previous.get(name)
+        written = not (previous and previous.get("sha256") == digest and previous.get("path") == str(path)
+                       and self.unchanged_on_disk(previous))
+        if written:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = path.with_name(f".{path.name}.tmp")
+            with open(tmp_file, 'w') as f:
+                f.write(content)
+            os.replace(tmp_file, path)
+        stat = path.stat()
+        self.benchmarks[name] = dict(fields, path=str(path), sha256=digest, size=stat.st_size,
+                                     mtime_ns=stat.st_mtime_ns)
+        self.stats["written" if written else "unchanged"] += 1
+        return written
+
+    def save(self, **header):
+        """Record this generation: remove the files it no longer produces, then write the manifest"""
+        current_paths = {entry["path"] for entry in self.benchmarks.values()}
+        for entry in self.previous.values():
+            if entry["path"] not in current_paths and self.unchanged_on_disk(entry):
+                # Generated by us and not edited since
+                Path(entry["path"]).unlink()
+                self.stats["removed"] += 1
+
+        manifest = dict(header, benchmarks=self.benchmarks)
+        text = json.dumps(manifest, indent=2)
+        try:
+            if self.path.read_text() == text:
+                return manifest
+        except OSError:
+            pass
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.path.with_suffix(".tmp")
+        tmp_file.write_text(text)
+        os.replace(tmp_file, self.path)
+        return manifest
+
+    def summary(self):
+        """One-line account of the last generation"""
+        return (f"{self.stats['written']} written, {self.stats['unchanged']} unchanged"
+                + (f", {self.stats['removed']} removed" if self.stats["removed"] else ""))
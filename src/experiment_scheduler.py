@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+import asyncio
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+class ExperimentScheduler:
+    def __init__(self, max_workers=1, tool_limits=None, expected_durations=None, history=None):
+        self.max_workers = max(1, int(max_workers or 1))
+        self.tool_limits = tool_limits or {}
+        self.expected_durations = expected_durations or {}
+        self.history = history or {}
+
+    @classmethod
+    def from_config(cls, config, max_workers=None, history=None):
+        """Build a scheduler from the experiment configuration"""
+        settings = config.get("experiment", {}).get("settings", {})
+        tools = config.get("tools", {})
+
+        tool_limits = {}
+        expected_durations = {}
+        for tool_name, tool_config in tools.items():
+            if tool_config.get("max_concurrent"):
+                tool_limits[tool_name] = tool_config["max_concurrent"]
+            if tool_config.get("expected_seconds") is not None:
+                expected_durations[tool_name] = tool_config["expected_seconds"]
+
+        return cls(
+            max_workers=max_workers or settings.get("max_workers", 1),
+            tool_limits=tool_limits,
+            expected_durations=expected_durations,
+            history=history
+        )
+
+    @staticmethod
+    def build_history(results):
+        """Mean execution time per (tool, benchmark) from previous results"""
+        totals = {}
+        for result in results:
+            # Errors and cancelled portfolio runs say nothing about the duration, nor do
+            # records of older runs without a verdict dict (CBMC's raw JSON-UI list)
+            verdict = result.get("result")
+            if not isinstance(verdict, dict) or verdict.get("status") in ("ERROR", "CANCELLED", None):
+                continue
+            key = (result.get("tool"), result.get("benchmark"))
+            elapsed, count = totals.get(key, (0.0, 0))
+            totals[key] = (elapsed + result.get("execution_time", 0), count + 1)
+        return {key: elapsed / count for key, (elapsed, count) in totals.items()}
+
+    def estimate_duration(self, job):
+        """Expected runtime of a job, used for longest-first ordering"""
+        if "tools" in job:
+            # A portfolio job runs its tools side by side
+            return max((self.estimate_tool(tool, job["benchmark"]) for tool in job["tools"]), default=0)
+        # A repeated-trial job runs the pair several times in a row
+        return self.estimate_tool(job["tool"], job["benchmark"]) * job.get("runs", 1)
+
+    def estimate_tool(self, tool_name, benchmark):
+        """Expected runtime of one run of a tool on a benchmark"""
+        key = (tool_name, Path(benchmark).name)
+        if key in self.history:
+            return self.history[key]
+        return self.expected_durations.get(tool_name, 0)
+
+    def order_jobs(self, jobs):
+        """Order jobs longest-first, keeping submission order for ties"""
+        return sorted(jobs, key=lambda job: (-self.estimate_duration(job), job["index"]))
+
+    def run(self, jobs, execute, on_start=None, on_complete=None):
+        """Run jobs concurrently and return results in the original job order"""
+        pending = self.order_jobs(jobs)
+        running = {}
+        active_per_tool = {}
+        results = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                # Fill free worker slots with the longest runnable jobs
+                while pending and len(running) < self.max_workers:
+                    job = self._next_runnable(pending, active_per_tool)
+                    if job is None:
+                        break
+                    pending.remove(job)
+                    for tool in self.job_tools(job):
+                        active_per_tool[tool] = active_per_tool.get(tool, 0) + 1
+                    if on_start:
+                        on_start(job)
+                    running[executor.submit(execute, job)] = job
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    for tool in self.job_tools(job):
+                        active_per_tool[tool] -= 1
+                    result = future.result()
+                    results[job["index"]] = result
+                    if on_complete:
+                        on_complete(job, result)
+
+        return [results[job["index"]] for job in sorted(jobs, key=lambda job: job["index"])]
+
+    async def run_async(self, jobs, execute, on_start=None, on_complete=None):
+        """Asyncio variant of run(): execute is a coroutine function, no thread per job"""
+        pending = self.order_jobs(jobs)
+        running = {}
+        active_per_tool = {}
+        results = {}
+
+        try:
+            while pending or running:
+                while pending and len(running) < self.max_workers:
+                    job = self._next_runnable(pending, active_per_tool)
+                    if job is None:
+                        break
+                    pending.remove(job)
+                    for tool in self.job_tools(job):
+                        active_per_tool[tool] = active_per_tool.get(tool, 0) + 1
+                    if on_start:
+                        on_start(job)
+                    running[asyncio.ensure_future(execute(job))] = job
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    job = running.pop(task)
+                    for tool in self.job_tools(job):
+                        active_per_tool[tool] -= 1
+                    result = task.result()
+                    results[job["index"]] = result
+                    if on_complete:
+                        on_complete(job, result)
+        finally:
+            # Cancelling a task kills the process group of its tool run
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return [results[job["index"]] for job in sorted(jobs, key=lambda job: job["index"])]
+
+    @staticmethod
+    def job_tools(job):
+        """Tools a job runs: every raced tool of a portfolio job, else its own"""
+        return job.get("tools") or [job["tool"]]
+
+    def _next_runnable(self, pending, active_per_tool):
+        """First pending job whose tools are all below their concurrency cap"""
+        for job in pending:
+            if all(self.tool_limits.get(tool) is None or active_per_tool.get(tool, 0) < self.tool_limits[tool]
+                   for tool in self.job_tools(job)):
+                return job
+        return None
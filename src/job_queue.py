@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+class JobQueue:
+    """SQLite job queue shared by a coordinator and its workers.
+
+    The coordinator publishes the jobs of a run; workers lease them one at a
+    time, renew the lease while the tool runs and hand back the result
+    records. A lease that is not renewed in time (the worker died, or its
+    host did) expires and the job goes back to the queue, until it has been
+    leased `max_attempts` times; after that it is marked failed.
+
+    Every process opens the same database file: on one host, or on hosts
+    sharing a file system with working locks (use journal_mode "delete"
+    there, WAL needs shared memory).
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id TEXT PRIMARY KEY,
+            created_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY,
+            run_id TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            tool TEXT NOT NULL,
+            priority REAL NOT NULL DEFAULT 0,
+            state TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            worker TEXT,
+            lease_expires REAL,
+            started_at REAL,
+            finished_at REAL,
+            records TEXT,
+            collected INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, priority DESC, id);
+        CREATE INDEX IF NOT EXISTS jobs_run ON jobs (run_id, collected, state);
+        CREATE TABLE IF NOT EXISTS workers (
+            run_id TEXT NOT NULL,
+            worker TEXT NOT NULL,
+            host TEXT,
+            leased INTEGER NOT NULL DEFAULT 0,
+            completed INTEGER NOT NULL DEFAULT 0,
+            expired INTEGER NOT NULL DEFAULT 0,
+            busy_seconds REAL NOT NULL DEFAULT 0,
+            first_lease REAL,
+            last_seen REAL,
+            PRIMARY KEY (run_id, worker)
+        );
+    """
+
+    def __init__(self, path="results/queue.sqlite", lease_seconds=60, max_attempts=3, journal_mode="wal"):
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.journal_mode = journal_mode
+        # One connection per thread: sqlite3 connections must not be shared
+        self.local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection().executescript(self.SCHEMA)
+
+    @classmethod
+    def from_config(cls, config, path=None):
+        """Build a queue from the `settings.distributed` section of the configuration"""
+        queue_config = config.get("experiment", {}).get("settings", {}).get("distributed", {})
+        return cls(
+            path=path or queue_config.get("queue", "results/queue.sqlite"),
+            lease_seconds=queue_config.get("lease_seconds", 60),
+            max_attempts=queue_config.get("max_attempts", 3),
+            journal_mode=queue_config.get("journal_mode", "wal")
+        )
+
+    def connection(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            connection.execute(f"PRAGMA journal_mode={self.journal_mode}")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+        return connection
+
+    @contextmanager
+    def transaction(self):
+        """Write transaction holding the database lock from the start"""
+        connection = self.connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def publish(self, payloads, priorities=None):
+        """Start a run with the given jobs (JSON-compatible dicts); return its id.
+
+        Jobs of earlier runs that never finished are withdrawn: a new run
+        supersedes them. Higher priorities are leased first.
+        """
+        run_id = time.strftime("%Y%m%d_%H%M%S_") + uuid.uuid4().hex[:6]
+        priorities = priorities or [0] * len(payloads)
+        with self.transaction() as connection:
+            connection.execute("UPDATE jobs SET state = 'withdrawn' WHERE state IN ('pending', 'leased')")
+            connection.execute("INSERT INTO runs (id, created_at) VALUES (?, ?)", (run_id, time.time()))
+            connection.executemany(
+                "INSERT INTO jobs (run_id, payload, tool, priority) VALUES (?, ?, ?, ?)",
+                [(run_id, json.dumps(payload, default=str), payload.get("tool", ""), priority)
+                 for payload, priority in zip(payloads, priorities)]
+            )
+        return run_id
+
+    def lease(self, worker, host=None, exclude_tools=()):
+        """Lease the next job for a worker: (job id, run id, payload), or None when nothing is runnable"""
+        now = time.time()
+        with self.transaction() as connection:
+            self._expire(connection, now)
+            placeholders = ",".join("?" * len(exclude_tools))
+            row = connection.execute(
+                "SELECT id, run_id, payload FROM jobs WHERE state = 'pending'"
+                + (f" AND tool NOT IN ({placeholders})" if exclude_tools else "")
+                + " ORDER BY priority DESC, id LIMIT 1",
+                tuple(exclude_tools)
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, run_id, payload = row
+            connection.execute(
+                "UPDATE jobs SET state = 'leased', worker = ?, attempts = attempts + 1, lease_expires = ?, "
+                "started_at = ? WHERE id = ?",
+                (worker, now + self.lease_seconds, now, job_id)
+            )
+            connection.execute(
+                "INSERT INTO workers (run_id, worker, host, leased, first_lease, last_seen) VALUES (?, ?, ?, 1, ?, ?) "
+                "ON CONFLICT (run_id, worker) DO UPDATE SET leased = leased + 1, last_seen = excluded.last_seen",
+                (run_id, worker, host, now, now)
+            )
+        return job_id, run_id, json.loads(payload)
+
+    def renew(self, job_id, worker):
+        """Extend a lease; False when the worker no longer holds it"""
+        now = time.time()
+        with self.transaction() as connection:
+            renewed = connection.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+                (now + self.lease_seconds, job_id, worker)
+            ).rowcount
+            connection.execute(
+                "UPDATE workers SET last_seen = ? WHERE worker = ? AND run_id = (SELECT run_id FROM jobs WHERE id = ?)",
+                (now, worker, job_id)
+            )
+        return bool(renewed)
+
+    def complete(self, job_id, worker, records):
+        """Store the result of a leased job; False when the lease was lost (the result is dropped)"""
+        now = time.time()
+        with self.transaction() as connection:
+            row = connection.execute(
+                "SELECT run_id, started_at FROM jobs WHERE id = ? AND worker = ? AND state = 'leased'",
+                (job_id, worker)
+            ).fetchone()
+            if row is None:
+                return False
+            run_id, started_at = row
+            connection.execute(
+                "UPDATE jobs SET state = 'done', finished_at = ?, records = ? WHERE id = ?",
+                (now, json.dumps(records, default=str), job_id)
+            )
+            connection.execute(
+                "UPDATE workers SET completed = completed + 1, busy_seconds = busy_seconds + ?, last_seen = ? "
+                "WHERE run_id = ? AND worker = ?",
+                (now - started_at, now, run_id, worker)
+            )
+        return True
+
+    def _expire(self, connection, now):
+        """Requeue (or fail, after max_attempts) the jobs whose lease ran out"""
+        expired = connection.execute(
+            "SELECT id, run_id, worker, attempts FROM jobs WHERE state = 'leased' AND lease_expires < ?", (now,)
+        ).fetchall()
+        for job_id, run_id, worker, attempts in expired:
+            if attempts < self.max_attempts:
+                connection.execute(
+                    "UPDATE jobs SET state = 'pending', worker = NULL, lease_expires = NULL WHERE id = ?", (job_id,)
+                )
+            else:
+                # The last worker stays recorded for the report
+                connection.execute(
+                    "UPDATE jobs SET state = 'failed', lease_expires = NULL, finished_at = ? WHERE id = ?",
+                    (now, job_id)
+                )
+            connection.execute(
+                "UPDATE workers SET expired = expired + 1 WHERE run_id = ? AND worker = ?", (run_id, worker)
+            )
+
+    def collect(self, run_id):
+        """Finished jobs of a run not collected yet: (payload, state, records, worker, attempts)"""
+        with self.transaction() as connection:
+            self._expire(connection, time.time())
+            rows = connection.execute(
+                "SELECT id, payload, state, records, worker, attempts FROM jobs "
+                "WHERE run_id = ? AND collected = 0 AND state IN ('done', 'failed') ORDER BY id",
+                (run_id,)
+            ).fetchall()
+            connection.executemany("UPDATE jobs SET collected = 1 WHERE id = ?", [(row[0],) for row in rows])
+        return [(json.loads(payload), state, json.loads(records) if records else None, worker, attempts)
+                for _, payload, state, records, worker, attempts in rows]
+
+    def open_jobs(self, run_id=None):
+        """Number of pending or leased jobs (of one run, or of every run)"""
+        query = "SELECT COUNT(*) FROM jobs WHERE state IN ('pending', 'leased')"
+        if run_id is None:
+            return self.connection().execute(query).fetchone()[0]
+        return self.connection().execute(query + " AND run_id = ?", (run_id,)).fetchone()[0]
+
+    def worker_stats(self, run_id):
+        """Throughput of every worker of a run"""
+        rows = self.connection().execute(
+            "SELECT worker, host, leased, completed, expired, busy_seconds, first_lease, last_seen "
+            "FROM workers WHERE run_id = ? ORDER BY worker", (run_id,)
+        ).fetchall()
+        stats = []
+        for worker, host, leased, completed, expired, busy_seconds, first_lease, last_seen in rows:
+            active = max((last_seen or 0) - (first_lease or 0), 0.0)
+            stats.append({
+                "worker": worker,
+                "host": host,
+                "jobs_leased": leased,
+                "jobs_completed": completed,
+                "leases_expired": expired,
+                "busy_seconds": busy_seconds,
+                "active_seconds": active,
+                "jobs_per_minute": completed / active * 60 if active else None,
+                "utilization": busy_seconds / active if active else None
+            })
+        return stats
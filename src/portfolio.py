@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+import asyncio
+import time
+
+PORTFOLIO_POLICIES = ("first-unsafe", "first-any", "all")
+# Verdicts that settle a benchmark
+CONCLUSIVE_STATUSES = ("SAFE", "UNSAFE")
+
+class PortfolioRace:
+    """Run several tools on one benchmark concurrently and stop at the first decisive verdict.
+
+    Policies:
+      first-unsafe  stop as soon as a tool reports UNSAFE (a bug was found)
+      first-any     stop at the first SAFE or UNSAFE verdict
+      all           let every tool finish; the first conclusive tool still wins
+
+    The tools still running when the race is decided are cancelled (their
+    process group is killed) and recorded as CANCELLED. Every record of the
+    benchmark gets a `portfolio` summary: the winner, when the race was
+    decided and the time saved, estimated from the expected duration of the
+    cancelled tools (or, with `all`, measured from the slowest tool).
+    """
+
+    def __init__(self, policy="first-unsafe", estimate=None):
+        if policy not in PORTFOLIO_POLICIES:
+            raise ValueError(f"Unknown portfolio policy: {policy}")
+        self.policy = policy
+        # tool name -> expected seconds of a run
+        self.estimate = estimate or (lambda tool: 0)
+
+    def is_decisive(self, result):
+        status = (result.get("result") or {}).get("status")
+        if self.policy == "first-unsafe":
+            return status == "UNSAFE"
+        return status in CONCLUSIVE_STATUSES
+
+    async def run(self, tools, execute, cancelled_result):
+        """Race `execute(tool)` coroutines; return one record per tool, in the order of `tools`.
+
+        `cancelled_result(tool, elapsed, winner)` builds the record of a
+        cancelled tool.
+        """
+        start = time.monotonic()
+        tasks = {asyncio.ensure_future(execute(tool)): tool for tool in tools}
+        finished = {}
+        winner = None
+        decided_after = None
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                elapsed = time.monotonic() - start
+                # Simultaneous finishers are judged in portfolio order
+                for task in sorted(done, key=lambda t: tools.index(tasks[t])):
+                    tool = tasks[task]
+                    finished[tool] = (task.result(), elapsed)
+                    if winner is None and self.is_decisive(finished[tool][0]):
+                        winner = tool
+                        decided_after = elapsed
+                if winner is not None and self.policy != "all":
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        wall_time = time.monotonic() - start
+
+        records = []
+        cancelled = []
+        for tool in tools:
+            if tool in finished:
+                records.append(finished[tool][0])
+            else:
+                cancelled.append(tool)
+                records.append(cancelled_result(tool, wall_time, winner))
+
+        summary = {
+            "policy": self.policy,
+            "tools": list(tools),
+            "winner": winner,
+            "winner_status": (finished[winner][0].get("result") or {}).get("status") if winner else None,
+            "decided_after": decided_after,
+            "wall_time": wall_time,
+            "cancelled": cancelled,
+            "time_saved": self.time_saved(finished, cancelled, wall_time)
+        }
+        for record in records:
+            record["portfolio"] = summary
+        return records
+
+    def time_saved(self, finished, cancelled, wall_time):
+        """Wall time the race saved over running every tool to completion"""
+        if cancelled:
+            expected_end = max(self.estimate(tool) for tool in cancelled)
+            return max(0.0, expected_end - wall_time)
+        # Nothing was cancelled (policy `all` or no decisive verdict): what stopping
+        # at the first conclusive verdict would have saved
+        conclusive = [elapsed for result, elapsed in finished.values() if self.is_decisive(result)]
+        if not conclusive:
+            return 0.0
+        return max(elapsed for _, elapsed in finished.values()) - min(conclusive)
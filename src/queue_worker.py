@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+import os
+import socket
+import threading
+
+class QueueWorker:
+    """Pull jobs from a JobQueue and run them until stopped.
+
+    `execute(payload)` runs one job and returns its result (a record or a
+    list of records). Each of the `slots` threads leases one job at a time
+    and renews the lease while the job runs, so a job outlives its lease
+    only if the whole worker dies. Tools at their `tool_limits` cap on this
+    worker are not leased until a slot of that tool frees up.
+    """
+
+    def __init__(self, queue, execute, worker_id=None, slots=1, tool_limits=None, poll_interval=1.0,
+                 exit_when_idle=False):
+        self.queue = queue
+        self.execute = execute
+        self.host = socket.gethostname()
+        self.worker_id = worker_id or f"{self.host}-{os.getpid()}"
+        self.slots = max(1, int(slots or 1))
+        self.tool_limits = tool_limits or {}
+        self.poll_interval = poll_interval
+        # Stop once no job is pending or leased anywhere (used by spawned local workers)
+        self.exit_when_idle = exit_when_idle
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.active_per_tool = {}
+        self.completed = 0
+
+    def run(self):
+        """Work with every slot until stopped (or idle, with exit_when_idle); return the jobs completed"""
+        threads = [threading.Thread(target=self.work_loop, name=f"{self.worker_id}-slot{slot}", daemon=True)
+                   for slot in range(self.slots)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(0.5)
+        return self.completed
+
+    def stop(self):
+        """Finish the running jobs, lease no new ones"""
+        self.stop_event.set()
+
+    def capped_tools(self):
+        with self.lock:
+            return [tool for tool, limit in self.tool_limits.items() if self.active_per_tool.get(tool, 0) >= limit]
+
+    def work_loop(self):
+        while not self.stop_event.is_set():
+            leased = self.queue.lease(self.worker_id, self.host, self.capped_tools())
+            if leased is None:
+                if self.exit_when_idle and self.queue.open_jobs() == 0:
+                    break
+                self.stop_event.wait(self.poll_interval)
+                continue
+            job_id, _, payload = leased
+            self.run_job(job_id, payload)
+
+    def run_job(self, job_id, payload):
+        tool = payload.get("tool")
+        with self.lock:
+            self.active_per_tool[tool] = self.active_per_tool.get(tool, 0) + 1
+        finished = threading.Event()
+        heartbeat = threading.Thread(target=self.keep_lease, args=(job_id, finished), daemon=True)
+        heartbeat.start()
+        try:
+            result = self.execute(payload)
+        finally:
+            finished.set()
+            heartbeat.join()
+            with self.lock:
+                self.active_per_tool[tool] -= 1
+        if self.queue.complete(job_id, self.worker_id, result):
+            with self.lock:
+                self.completed += 1
+        else:
+            print(f"⚠️  {self.worker_id}: lease of job {job_id} was lost, result dropped")
+
+    def keep_lease(self, job_id, finished):
+        """Renew the lease of a running job a few times per lease period"""
+        while not finished.wait(self.queue.lease_seconds / 3):
+            if not self.queue.renew(job_id, self.worker_id):
+                return
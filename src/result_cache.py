@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+class ResultCache:
+    """Content-addressed on-disk cache of verification results"""
+
+    # Only deterministic verdicts of successful runs are worth reusing
+    # (UNKNOWN is also what CBMC reports when its run fails)
+    CACHEABLE_STATUSES = ("SAFE", "UNSAFE", "COMPLETED")
+
+    def __init__(self, cache_dir="results/cache", max_size_mb=512, max_age_days=30, refresh=False):
+        self.cache_dir = Path(cache_dir)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024) if max_size_mb else None
+        self.max_age_seconds = max_age_days * 86400 if max_age_days else None
+        self.refresh = refresh
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self.lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.current_size = sum(entry.stat().st_size for entry in self.cache_dir.glob("*/*.json"))
+
+    @classmethod
+    def from_config(cls, config, refresh=False):
+        """Build a cache from the `settings.cache` section of the configuration"""
+        cache_config = config.get("experiment", {}).get("settings", {}).get("cache", {})
+        return cls(
+            cache_dir=cache_config.get("directory", "results/cache"),
+            max_size_mb=cache_config.get("max_size_mb", 512),
+            max_age_days=cache_config.get("max_age_days", 30),
+            refresh=refresh
+        )
+
+    @classmethod
+    def make_key(cls, benchmark_path, tool_name, flags, tool_version, benchmark_hash=None):
+        """Hash of the benchmark content, tool name, effective flags and tool version.
+
+        `benchmark_hash` is the benchmark's sha256 when already known (see
+        BenchmarkManifest), which saves reading the file.
+        """
+        digest = hashlib.sha256()
+        digest.update((benchmark_hash or cls.file_hash(benchmark_path)).encode())
+        digest.update(b"\0")
+        digest.update(json.dumps([tool_name, list(flags), str(tool_version)]).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def file_hash(path):
+        """sha256 of a file's bytes"""
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def _entry_path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key):
+        """Return the cached result for a key, or None on a miss"""
+        entry = self._entry_path(key)
+        if self.refresh or not entry.exists():
+            self._count("misses")
+            return None
+
+        if self.max_age_seconds and time.time() - entry.stat().st_mtime > self.max_age_seconds:
+            self._remove(entry)
+            self._count("misses")
+            return None
+
+        try:
+            with open(entry, 'r') as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            self._remove(entry)
+            self._count("misses")
+            return None
+        if not self.cacheable(result):
+            # Stored before failed runs were kept out of the cache
+            self._remove(entry)
+            self._count("misses")
+            return None
+
+        self._count("hits")
+        return result
+
+    @classmethod
+    def cacheable(cls, result):
+        """Whether a result is a successful run with a deterministic verdict"""
+        verdict = result.get("result")
+        return (result.get("success") is True and isinstance(verdict, dict)
+                and verdict.get("status") in cls.CACHEABLE_STATUSES)
+
+    def put(self, key, result):
+        """Store a result if it is a successful run with a deterministic verdict"""
+        if not self.cacheable(result):
+            return
+
+        entry = self._entry_path(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = entry.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(result, f)
+        os.replace(tmp_file, entry)
+        with self.lock:
+            self.stats["stores"] += 1
+            self.current_size += entry.stat().st_size
+
+        if self.max_size_bytes and self.current_size > self.max_size_bytes:
+            self.evict()
+
+    def evict(self):
+        """Drop expired entries, then the oldest ones until under the size limit"""
+        with self.lock:
+            entries = []
+            for entry in self.cache_dir.glob("*/*.json"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry))
+
+            now = time.time()
+            if self.max_age_seconds:
+                expired = [e for e in entries if now - e[0] > self.max_age_seconds]
+                for _, _, entry in expired:
+                    self._remove(entry, locked=True)
+                entries = [e for e in entries if now - e[0] <= self.max_age_seconds]
+
+            total_size = sum(size for _, size, _ in entries)
+            if self.max_size_bytes:
+                for _, size, entry in sorted(entries, key=lambda e: e[0]):
+                    if total_size <= self.max_size_bytes:
+                        break
+                    self._remove(entry, locked=True)
+                    total_size -= size
+            self.current_size = total_size
+
+    def hit_rate(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def summary(self):
+        """Cache statistics for reporting"""
+        return dict(self.stats, hit_rate=self.hit_rate())
+
+    def _remove(self, entry, locked=False):
+        try:
+            entry.unlink()
+        except OSError:
+            return
+        if locked:
+            self.stats["evictions"] += 1
+        else:
+            self._count("evictions")
+
+    def _count(self, stat):
+        with self.lock:
+            self.stats[stat] += 1
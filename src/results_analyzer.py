@@ -1,22 +1,45 @@
 #!/usr/bin/env python3
 import json
+import re
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from src.results_table import ResultsTable
 
 class ResultsAnalyzer:
-    def __init__(self, results_file):
+    """Reports over a results table.
+
+    Every per-tool figure comes from one cached groupby aggregation
+    (`aggregate`), so the reports never re-filter the DataFrame per tool or
+    per benchmark and stay fast on millions of rows.
+    """
+    
+    # Resource columns recorded by the runners (see BaseToolRunner.resource_usage)
+    RESOURCE_COLUMNS = ["tool_wall_time", "cpu_user_time", "cpu_system_time",
+                        "container_overhead_time", "container_prepare_time"]
+    EFFECTIVENESS_COLUMNS = ["bugs_detected", "properties_verified", "alarms_generated"]
+    # Metrics followed along the families of a scaling suite
+    SCALING_COLUMNS = ["execution_time", "tool_wall_time", "peak_memory_mb", "goals_proven", "goals_failed",
+                       "properties_verified", "bugs_detected"]
+    # Lines a finding may be off by and still match a bug (multi-line statements)
+    LINE_TOLERANCE = 1
+    # Runs that end early say nothing about a tool's timing (as in ExperimentScheduler.build_history)
+    UNTIMED_STATUSES = ("ERROR", "CANCELLED")
+    
+    def __init__(self, results_file, df=None, scaling=None, ground_truth=None):
         self.results_file = Path(results_file)
-        self.df = self.load_results()
+        # A DataFrame already loaded by the caller can be shared with the visualizer
+        self.df = df if df is not None else self.load_results()
+        # Manifest of a generated scaling suite (see ScalingBenchmarkGenerator)
+        self.scaling = scaling
+        # Expected defects per benchmark and function (BenchmarkGenerator, ScalingBenchmarkGenerator)
+        self.ground_truth = ground_truth
+        self.aggregates = {}
+        self.detections = None
     
     def load_results(self):
-        """Load results from JSON file"""
-        with open(self.results_file, 'r') as f:
-            results = json.load(f)
-        
-        # Convert to DataFrame
-        df = pd.json_normalize(results)
-        return df
+        """Load the metric columns of a Parquet (or JSON) results file"""
+        return ResultsTable.load(self.results_file)
     
     def generate_comprehensive_analysis(self):
         """Generate comprehensive analysis of results"""
@@ -25,9 +48,14 @@ class ResultsAnalyzer:
         analysis = {
             "summary": self.generate_summary(),
             "performance_comparison": self.performance_analysis(),
+            "timing_statistics": self.timing_statistics(),
             "effectiveness_comparison": self.effectiveness_analysis(),
             "tool_recommendations": self.generate_recommendations()
         }
+        if self.scaling:
+            analysis["scaling_curves"] = self.scaling_analysis()
+        if self.ground_truth:
+            analysis["detection_scores"] = self.detection_scores()
         
         # Save analysis
         output_dir = Path("results/processed")
@@ -41,16 +69,75 @@ class ResultsAnalyzer:
         
         return analysis
     
+    def aggregate(self, keys):
+        """Aggregation table grouped by `keys`, computed once and shared by every report"""
+        keys = tuple(keys)
+        if keys not in self.aggregates:
+            self.aggregates[keys] = self._build_aggregate(list(keys))
+        return self.aggregates[keys]
+    
+    def _build_aggregate(self, keys):
+        """One groupby pass computing every per-group figure the reports use"""
+        df = self.df
+        columns = {key: df[key] for key in keys}
+        columns['_success'] = df['success'].eq(True) if 'success' in df else pd.Series(False, index=df.index)
+        named = {
+            "runs": ('_success', 'size'),
+            "successes": ('_success', 'sum')
+        }
+        
+        if 'execution_time' in df:
+            columns['execution_time'] = df['execution_time']
+            columns['_timeout'] = df['status'].eq('TIMEOUT') if 'status' in df else pd.Series(False, index=df.index)
+            named.update(
+                mean_execution_time=('execution_time', 'mean'),
+                median_execution_time=('execution_time', 'median'),
+                std_execution_time=('execution_time', 'std'),
+                min_execution_time=('execution_time', 'min'),
+                max_execution_time=('execution_time', 'max'),
+                total_execution_time=('execution_time', 'sum'),
+                timeout_count=('_timeout', 'sum')
+            )
+        for column in self.RESOURCE_COLUMNS:
+            if column in df:
+                columns[column] = df[column]
+                named[f"mean_{column}"] = (column, 'mean')
+        if 'peak_memory_mb' in df:
+            columns['peak_memory_mb'] = df['peak_memory_mb']
+            named["mean_peak_memory_mb"] = ('peak_memory_mb', 'mean')
+            named["max_peak_memory_mb"] = ('peak_memory_mb', 'max')
+        if 'container_overhead_time' in df and 'execution_time' in df:
+            # Wall time of the runs whose container overhead is known
+            columns['_measured_time'] = df['execution_time'].where(df['container_overhead_time'].notna())
+            named["_overhead_sum"] = ('container_overhead_time', 'sum')
+            named["_measured_sum"] = ('_measured_time', 'sum')
+        for column in self.EFFECTIVENESS_COLUMNS:
+            if column in df:
+                columns[column] = df[column]
+                named[f"{column}_avg"] = (column, 'mean')
+                named[f"{column}_total"] = (column, 'sum')
+        
+        frame = pd.DataFrame(columns)
+        table = frame.groupby(keys, observed=True, sort=False).agg(**named)
+        table['success_rate'] = table['successes'] / table['runs'].clip(lower=1)
+        if '_overhead_sum' in table:
+            # Share of the measured wall time spent outside the verifier itself
+            measured = table.pop('_measured_sum')
+            overhead = table.pop('_overhead_sum')
+            table['container_overhead_share'] = (overhead / measured.where(measured != 0)).fillna(0)
+        
+        # Groups in order of first appearance, like the per-tool loops this replaces
+        order = frame[keys].drop_duplicates()
+        index = pd.MultiIndex.from_frame(order) if len(keys) > 1 else pd.Index(order[keys[0]])
+        return table.reindex(index)
+    
     def generate_summary(self):
         """Generate summary statistics"""
-        total_experiments = len(self.df)
-        successful_runs = len(self.df[self.df.get('success', False) == True])
-        failed_runs = len(self.df[self.df.get('success', False) == False])
-        
+        success = self.df['success'] if 'success' in self.df else pd.Series(dtype=object)
         summary = {
-            "total_experiments": total_experiments,
-            "successful_runs": successful_runs,
-            "failed_runs": failed_runs,
+            "total_experiments": len(self.df),
+            "successful_runs": int(success.eq(True).sum()),
+            "failed_runs": int(success.eq(False).sum()),
             "tools_tested": self.df['tool'].unique().tolist() if 'tool' in self.df else [],
             "benchmarks_tested": self.df['benchmark'].unique().tolist() if 'benchmark' in self.df else [],
             "average_execution_time": self.df['execution_time'].mean() if 'execution_time' in self.df else 0,
@@ -60,49 +147,126 @@ class ResultsAnalyzer:
         # Tool-specific summaries
         tool_summary = {}
         if 'tool' in self.df:
-            for tool in self.df['tool'].unique():
-                tool_data = self.df[self.df['tool'] == tool]
+            table = self.aggregate(['tool'])
+            for tool, row in table.to_dict('index').items():
                 tool_summary[tool] = {
-                    "runs": len(tool_data),
-                    "success_rate": len(tool_data[tool_data.get('success', False) == True]) / max(len(tool_data), 1),
-                    "avg_time": tool_data['execution_time'].mean() if 'execution_time' in tool_data else 0,
-                    "total_bugs_detected": tool_data['bugs_detected'].sum() if 'bugs_detected' in tool_data else 0
+                    "runs": row['runs'],
+                    "success_rate": row['success_rate'],
+                    "avg_time": row.get('mean_execution_time', 0),
+                    "total_bugs_detected": row.get('bugs_detected_total', 0)
                 }
         summary['tool_performance'] = tool_summary
         return summary
     
     def performance_analysis(self):
         """Analyze performance metrics"""
-        performance = {}
         if 'tool' not in self.df or 'execution_time' not in self.df:
-            return performance
-        
-        for tool in self.df['tool'].unique():
-            tool_data = self.df[self.df['tool'] == tool]
-            execution_times = tool_data['execution_time']
-            performance[tool] = {
-                "mean_execution_time": execution_times.mean(),
-                "median_execution_time": execution_times.median(),
-                "std_execution_time": execution_times.std(),
-                "min_execution_time": execution_times.min(),
-                "max_execution_time": execution_times.max(),
-                "timeout_count": len(tool_data[execution_times >= 299])
+            return {}
+        
+        table = self.aggregate(['tool'])
+        columns = [column for column in [
+            "mean_execution_time", "median_execution_time", "std_execution_time",
+            "min_execution_time", "max_execution_time", "timeout_count",
+            *[f"mean_{column}" for column in self.RESOURCE_COLUMNS],
+            "mean_peak_memory_mb", "max_peak_memory_mb", "container_overhead_share"
+        ] if column in table]
+        return table[columns].to_dict('index')
+    
+    def timing_statistics(self, metric='execution_time', confidence=0.95, resamples=2000, seed=0):
+        """Per (tool, benchmark) statistics over repeated trials (see --repeat).
+
+        Reports the bootstrap confidence interval of the mean, the coefficient
+        of variation and the trials outside the 1.5 IQR Tukey fences. Runs
+        without a verdict, failed or cancelled (they end early) and cache hits
+        (they repeat an earlier run's time) are not trials.
+        """
+        if 'tool' not in self.df or 'benchmark' not in self.df or metric not in self.df:
+            return {}
+        df = self.df
+        status = df['status'].astype(object) if 'status' in df else pd.Series(None, index=df.index, dtype=object)
+        timed = df[metric].notna() & status.notna() & ~status.isin(self.UNTIMED_STATUSES)
+        if 'cache_hit' in df:
+            timed &= ~df['cache_hit'].eq(True)
+        data = df.loc[timed]
+        if data.empty:
+            return {}
+        
+        grouped = data.groupby(['tool', 'benchmark'], observed=True)[metric]
+        table = grouped.agg(['size', 'mean', 'median', 'std'])
+        q1 = grouped.quantile(0.25).to_numpy()
+        q3 = grouped.quantile(0.75).to_numpy()
+        table['std'] = table['std'].fillna(0.0)
+        
+        # Rows of each pair, contiguous and in group order
+        codes = grouped.ngroup().to_numpy()
+        order = np.argsort(codes, kind='stable')
+        values = data[metric].to_numpy(dtype=float)[order]
+        sizes = table['size'].to_numpy()
+        offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        ci_low, ci_high = self.bootstrap_ci(values, offsets, sizes, np.random.default_rng(seed),
+                                            confidence, resamples)
+        
+        # Tukey fences, broadcast back to the samples
+        fence = 1.5 * (q3 - q1)
+        sample_values = data[metric].to_numpy(dtype=float)
+        flagged = (sample_values < (q1 - fence)[codes]) | (sample_values > (q3 + fence)[codes])
+        trials = data['trial'].to_numpy() if 'trial' in data else grouped.cumcount().to_numpy()
+        outlier_trials = pd.Series(trials[flagged]).groupby(codes[flagged]).agg(list).to_dict()
+        
+        statistics = {}
+        for position, ((tool, benchmark), row) in enumerate(zip(table.index, table.itertuples(index=False))):
+            std = float(row.std)
+            mean = float(row.mean)
+            statistics.setdefault(tool, {})[benchmark] = {
+                "samples": int(row.size),
+                "mean": mean,
+                "median": float(row.median),
+                "std": std,
+                "cv": std / mean if mean else 0.0,
+                "ci_low": float(ci_low[position]),
+                "ci_high": float(ci_high[position]),
+                "confidence": confidence,
+                "outlier_trials": [int(trial) for trial in outlier_trials.get(position, [])]
             }
-        return performance
+        return statistics
+    
+    @staticmethod
+    def bootstrap_ci(values, offsets, sizes, rng, confidence=0.95, resamples=2000, max_cells=4_000_000):
+        """Percentile bootstrap confidence interval of the mean of every group.
+
+        Groups of equal size are resampled together, a block at a time, with
+        the same resampling draws for every group of the block.
+        """
+        low = values[offsets].copy()
+        high = values[offsets].copy()
+        alpha = (1 - confidence) / 2
+        for size in np.unique(sizes[sizes >= 2]):
+            groups = np.flatnonzero(sizes == size)
+            block = max(1, max_cells // (resamples * size))
+            for start in range(0, len(groups), block):
+                members = groups[start:start + block]
+                samples = values[offsets[members][:, None] + np.arange(size)]
+                # How often each sample is drawn in each resample
+                picks = rng.integers(0, size, size=(resamples, size))
+                counts = np.zeros((resamples, size))
+                np.add.at(counts, (np.arange(resamples)[:, None], picks), 1)
+                means = samples @ counts.T / size
+                low[members], high[members] = np.quantile(means, [alpha, 1 - alpha], axis=1)
+        return low, high
     
     def effectiveness_analysis(self):
         """Analyze effectiveness metrics"""
-        effectiveness = {}
         if 'tool' not in self.df:
-            return effectiveness
+            return {}
         
-        for tool in self.df['tool'].unique():
-            tool_data = self.df[self.df['tool'] == tool]
+        table = self.aggregate(['tool'])
+        effectiveness = {}
+        for tool, row in table.to_dict('index').items():
             effectiveness[tool] = {
-                "success_rate": len(tool_data[tool_data.get('success', False) == True]) / max(len(tool_data), 1),
-                "bugs_detected_avg": tool_data['bugs_detected'].mean() if 'bugs_detected' in tool_data else 0,
-                "properties_verified_avg": tool_data['properties_verified'].mean() if 'properties_verified' in tool_data else 0,
-                "alarms_generated_avg": tool_data['alarms_generated'].mean() if 'alarms_generated' in tool_data else 0
+                "success_rate": row['success_rate'],
+                "bugs_detected_avg": row.get('bugs_detected_avg', 0),
+                "properties_verified_avg": row.get('properties_verified_avg', 0),
+                "alarms_generated_avg": row.get('alarms_generated_avg', 0)
             }
         return effectiveness
     
@@ -114,21 +278,172 @@ class ResultsAnalyzer:
         
         if performance_data:
             recommendations["fastest_tool"] = min(performance_data.items(), key=lambda x: x[1]["mean_execution_time"])[0]
-        if effectiveness_data:
+        detection_data = self.detection_scores() if self.ground_truth else {}
+        if detection_data:
+            # Real bugs found, then the cheapest per bug
+            recommendations["most_effective_bug_finder"] = max(
+                detection_data.items(),
+                key=lambda x: (x[1]["recall"] or 0, -(x[1]["cost_per_true_bug"] or float('inf')))
+            )[0]
+        elif effectiveness_data:
             recommendations["most_effective_bug_finder"] = max(effectiveness_data.items(), key=lambda x: x[1]["bugs_detected_avg"])[0]
+        if effectiveness_data:
             recommendations["best_for_proofs"] = max(effectiveness_data.items(), key=lambda x: x[1]["properties_verified_avg"])[0]
         
-        # Property-specific recommendations
+        # Property-specific recommendations: the first successful tool per benchmark
+        # (or the first tool tried when none succeeded)
         property_recommendations = {}
-        if 'benchmark' in self.df and 'success' in self.df:
-            for benchmark in self.df['benchmark'].unique():
-                bench_data = self.df[self.df['benchmark'] == benchmark]
-                if not bench_data.empty:
-                    best_tool = bench_data.loc[bench_data['success'].idxmax(), 'tool']
-                    property_recommendations[benchmark] = best_tool
+        if 'benchmark' in self.df and 'success' in self.df and not self.df.empty:
+            success = self.df['success'].eq(True).astype('int8')
+            best_rows = success.groupby(self.df['benchmark'], observed=True, sort=False).idxmax()
+            property_recommendations = dict(zip(best_rows.index, self.df['tool'].loc[best_rows.to_numpy()]))
         recommendations["property_specific"] = property_recommendations
         return recommendations
     
+    def scaling_table(self):
+        """Mean metrics per (family, tool, parameter value) of the scaling suite's benchmarks"""
+        benchmarks = self.scaling["benchmarks"]
+        if 'benchmark' not in self.df or 'tool' not in self.df:
+            return pd.DataFrame()
+        names = self.df['benchmark'].astype(object)
+        in_suite = names.isin(benchmarks.keys())
+        df = self.df[in_suite]
+        names = names[in_suite]
+        columns = {
+            'family': names.map(lambda name: benchmarks[name]['family']),
+            'tool': df['tool'].astype(object),
+            'value': names.map(lambda name: benchmarks[name]['value']),
+            'success': df['success'].eq(True) if 'success' in df else False
+        }
+        named = {"runs": ('success', 'size'), "success_rate": ('success', 'mean')}
+        for column in self.SCALING_COLUMNS:
+            if column in df:
+                columns[column] = df[column]
+                named[f"mean_{column}"] = (column, 'mean')
+        table = pd.DataFrame(columns).groupby(['family', 'tool', 'value']).agg(**named)
+        return table.reset_index()
+    
+    def scaling_analysis(self):
+        """Scaling curves: per family and tool, the mean metrics at each parameter value"""
+        curves = {}
+        for row in self.scaling_table().to_dict('records'):
+            family = curves.setdefault(row.pop('family'), {})
+            family.setdefault(row.pop('tool'), []).append(row)
+        return curves
+    
+    def detection_table(self):
+        """True/false positives and missed bugs of every run on a benchmark with ground truth"""
+        if self.detections is not None:
+            return self.detections
+        columns = ['tool', 'benchmark', 'trial', 'status', 'execution_time', 'true_positives',
+                   'false_positives', 'false_negatives', 'verdict_correct']
+        benchmarks = self.ground_truth["benchmarks"]
+        if 'benchmark' not in self.df or 'tool' not in self.df:
+            self.detections = pd.DataFrame(columns=columns)
+            return self.detections
+        
+        findings = ResultsTable.load_field(self.results_file, "findings")
+        names = self.df['benchmark'].astype(object).to_numpy()
+        tools = self.df['tool'].astype(object).to_numpy()
+        statuses = self.df['status'].astype(object).to_numpy() if 'status' in self.df else [None] * len(names)
+        trials = self.df['trial'].to_numpy() if 'trial' in self.df else [0] * len(names)
+        times = self.df['execution_time'].to_numpy() if 'execution_time' in self.df else [np.nan] * len(names)
+        rows = []
+        for index, name in enumerate(names):
+            truth = benchmarks.get(name)
+            if truth is None:
+                continue
+            true_positives, false_positives, false_negatives = self.match_findings(
+                findings[index] if index < len(findings) else None, truth, name
+            )
+            status = statuses[index]
+            rows.append((tools[index], name, trials[index], status, times[index], true_positives, false_positives,
+                         false_negatives,
+                         status == truth["expected_verdict"] if status in ("SAFE", "UNSAFE") else None))
+        self.detections = pd.DataFrame(rows, columns=columns)
+        return self.detections
+    
+    @classmethod
+    def match_findings(cls, findings, truth, benchmark):
+        """(true positives, false positives, false negatives) of one run against a benchmark's ground truth.
+
+        A finding matches a bug when it is on the bug's line (give or take
+        LINE_TOLERANCE) in the same function, or, without a line, in the
+        bug's function. Findings are deduplicated by (function, line); the
+        true positives are the bugs found, and findings repeating a bug
+        already found are not false positives.
+        """
+        functions = truth["functions"]
+        bugs = [(function, bug["line"]) for function, entry in functions.items() for bug in entry["bugs"]]
+        found = set()
+        seen = set()
+        false_positives = 0
+        for finding in findings or []:
+            if finding.get("file") and finding["file"] != benchmark:
+                continue  # library models, headers
+            function = finding.get("function") or cls.goal_function(finding.get("goal"), functions)
+            line = finding.get("line")
+            if (function, line) in seen:
+                continue
+            seen.add((function, line))
+            matches = [
+                index for index, (bug_function, bug_line) in enumerate(bugs)
+                if (line is not None and abs(line - bug_line) <= cls.LINE_TOLERANCE
+                    and function in (None, bug_function))
+                or (line is None and function == bug_function)
+            ]
+            if matches:
+                found.update(matches)
+            else:
+                false_positives += 1
+        return len(found), false_positives, len(bugs) - len(found)
+    
+    @staticmethod
+    def goal_function(goal, functions):
+        """Function of a WP goal (`typed_[ref_]<function>_<property>`), among the benchmark's functions"""
+        if not goal:
+            return None
+        name = re.sub(r"^typed_(ref_)?", "", goal)
+        candidates = [function for function in functions if name == function or name.startswith(function + "_")]
+        return max(candidates, key=len, default=None)
+    
+    def detection_scores(self):
+        """Precision, recall and cost per real bug of every tool, from the runs scored against ground truth.
+
+        The time to the first true bug is the execution time of the runs
+        that found at least one bug (the tools report once they finish),
+        and the cost per true bug is the total time of the tool's scored
+        runs divided by the bugs it found.
+        """
+        table = self.detection_table()
+        scores = {}
+        for tool, runs in table.groupby('tool', sort=True):
+            true_positives = int(runs['true_positives'].sum())
+            false_positives = int(runs['false_positives'].sum())
+            false_negatives = int(runs['false_negatives'].sum())
+            reported = true_positives + false_positives
+            expected = true_positives + false_negatives
+            precision = true_positives / reported if reported else None
+            recall = true_positives / expected if expected else None
+            finding_runs = runs[runs['true_positives'] > 0]
+            total_time = float(runs['execution_time'].sum())
+            verdicts = runs['verdict_correct'].dropna()
+            scores[tool] = {
+                "runs": len(runs),
+                "true_positives": true_positives,
+                "false_positives": false_positives,
+                "false_negatives": false_negatives,
+                "precision": precision,
+                "recall": recall,
+                "f1": 2 * precision * recall / (precision + recall) if precision and recall else None,
+                "verdict_accuracy": float(verdicts.astype(bool).mean()) if len(verdicts) else None,
+                "mean_time_to_first_true_bug":
+                    float(finding_runs['execution_time'].mean()) if len(finding_runs) else None,
+                "total_time": total_time,
+                "cost_per_true_bug": total_time / true_positives if true_positives else None
+            }
+        return scores
+    
     def generate_csv_reports(self, output_dir):
         """Generate CSV reports for detailed analysis"""
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -137,15 +452,27 @@ class ResultsAnalyzer:
         self.df.to_csv(output_dir / "experiment_results.csv", index=False)
         
         # Performance comparison CSV
-        performance_data = []
+        performance_df = pd.DataFrame(columns=['tool', 'mean_time', 'success_rate', 'total_runs'])
         if 'tool' in self.df:
-            for tool in self.df['tool'].unique():
-                tool_data = self.df[self.df['tool'] == tool]
-                performance_data.append({
-                    'tool': tool,
-                    'mean_time': tool_data['execution_time'].mean() if 'execution_time' in tool_data else 0,
-                    'success_rate': len(tool_data[tool_data.get('success', False) == True]) / max(len(tool_data), 1),
-                    'total_runs': len(tool_data)
-                })
-        performance_df = pd.DataFrame(performance_data)
+            table = self.aggregate(['tool'])
+            performance_df = pd.DataFrame({
+                'tool': table.index,
+                'mean_time': table['mean_execution_time'].to_numpy() if 'mean_execution_time' in table else 0,
+                'success_rate': table['success_rate'].to_numpy(),
+                'total_runs': table['runs'].to_numpy()
+            })
         performance_df.to_csv(output_dir / "performance_comparison.csv", index=False)
+        
+        # Per-pair timing statistics over repeated trials
+        timing_rows = [
+            dict(tool=tool, benchmark=benchmark, **{k: v for k, v in stats.items() if k != 'outlier_trials'},
+                 outliers=len(stats['outlier_trials']))
+            for tool, benchmarks in self.timing_statistics().items()
+            for benchmark, stats in benchmarks.items()
+        ]
+        pd.DataFrame(timing_rows).to_csv(output_dir / "timing_statistics.csv", index=False)
+        
+        if self.scaling:
+            self.scaling_table().to_csv(output_dir / "scaling_curves.csv", index=False)
+        if self.ground_truth:
+            self.detection_table().to_csv(output_dir / "detection_scores.csv", index=False)
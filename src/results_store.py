@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+class ResultsStore:
+    """Append-only JSON Lines log of result records, one line per job.
+
+    The log and the consolidated files compacted from it are stamped with
+    the run they belong to (`<file>.meta.json`: run id and a hash of the
+    run's configuration), so that a resumed run only picks up records of
+    the same configuration.
+    """
+
+    # Jobs with one of these statuses do not need to run again on resume
+    TERMINAL_STATUSES = ("SAFE", "UNSAFE", "COMPLETED", "TIMEOUT", "OUT_OF_MEMORY", "CANCELLED")
+
+    def __init__(self, log_file, fsync_every=20, fsync_interval=5.0):
+        self.log_file = Path(log_file)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.handle = None
+        # Stamp of the run writing the log (see run_stamp)
+        self.run_info = None
+        self.unsynced = 0
+        self.last_sync = time.time()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def record_key(record):
+        """Identity of a job; later records for the same key supersede earlier ones"""
+        return (record.get("tool"), record.get("benchmark"), record.get("trial", 0))
+
+    @staticmethod
+    def meta_path(path):
+        path = Path(path)
+        return path.with_name(f"{path.stem}.meta.json")
+
+    @classmethod
+    def read_stamp(cls, path):
+        """Run stamp of a log or consolidated file, or None when it has none"""
+        try:
+            with open(cls.meta_path(path), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def write_stamp(cls, path, run_info):
+        meta_file = cls.meta_path(path)
+        tmp_file = meta_file.with_suffix(".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(run_info, f)
+        os.replace(tmp_file, meta_file)
+
+    @staticmethod
+    def same_run(stamp, run_info):
+        """Whether a stamp was written by a run of the same configuration"""
+        return bool(stamp) and bool(run_info) and stamp.get("config_hash") == run_info.get("config_hash")
+
+    def open(self, fresh=True):
+        """Open the log for appending, discarding previous content when fresh"""
+        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        if not fresh:
+            self.repair()
+        self.handle = open(self.log_file, 'w' if fresh else 'a')
+        if fresh and self.run_info:
+            self.write_stamp(self.log_file, self.run_info)
+        return self
+
+    def append(self, record):
+        """Write a single record; fsync in batches"""
+        line = json.dumps(record, default=str)
+        with self.lock:
+            self.handle.write(line + "\n")
+            self.handle.flush()
+            self.unsynced += 1
+            if self.unsynced >= self.fsync_every or time.time() - self.last_sync >= self.fsync_interval:
+                self._sync()
+
+    def close(self):
+        with self.lock:
+            if self.handle:
+                self._sync()
+                self.handle.close()
+                self.handle = None
+
+    def _sync(self):
+        os.fsync(self.handle.fileno())
+        self.unsynced = 0
+        self.last_sync = time.time()
+
+    def load_records(self):
+        """Read every complete record in the log, in write order"""
+        records = []
+        if not self.log_file.exists():
+            return records
+        with open(self.log_file, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # A torn line can only be the tail of a crashed run
+                    break
+        return records
+
+    def latest_view(self):
+        """Latest record per job, in first-seen order"""
+        latest = {}
+        for record in self.load_records():
+            latest[self.record_key(record)] = record
+        return list(latest.values())
+
+    def finished_records(self):
+        """Latest records whose job reached a terminal status"""
+        return [r for r in self.latest_view()
+                if r.get("result", {}).get("status") in self.TERMINAL_STATUSES]
+
+    def seed(self, records):
+        """Start a new log from already consolidated records"""
+        self.open(fresh=True)
+        for record in records:
+            self.append(record)
+        self.close()
+
+    @staticmethod
+    def merge(*result_sets):
+        """Combine result lists; later records replace earlier ones for the same job"""
+        merged = {}
+        for results in result_sets:
+            for record in results:
+                merged[ResultsStore.record_key(record)] = record
+        return list(merged.values())
+
+    def repair(self):
+        """Truncate a partially written trailing line left by a crash"""
+        if not self.log_file.exists():
+            return
+        with open(self.log_file, 'rb+') as f:
+            valid_size = 0
+            last_line = b"\n"
+            for line in f:
+                try:
+                    json.loads(line)
+                except ValueError:
+                    if line.strip():
+                        break
+                valid_size += len(line)
+                last_line = line
+            f.truncate(valid_size)
+            if not last_line.endswith(b"\n"):
+                f.seek(valid_size)
+                f.write(b"\n")
+
+    def compact(self, output_files):
+        """Write the consolidated latest view to one or more JSON files"""
+        results = self.latest_view()
+        for output_file in output_files:
+            output_file = Path(output_file)
+            tmp_file = output_file.with_suffix(".tmp")
+            with open(tmp_file, 'w') as f:
+                json.dump(results, f, indent=2)
+            os.replace(tmp_file, output_file)
+            if self.run_info:
+                self.write_stamp(output_file, self.run_info)
+        return results
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+import json
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+
+def _category():
+    return pa.dictionary(pa.int32(), pa.string())
+
+class ResultsTable:
+    """Typed columnar storage of result records (Parquet).
+
+    Numeric metrics and the categorical tool/benchmark/status columns go to
+    `<name>.parquet` with a fixed schema. The bulky part of each record
+    (stdout/stderr excerpts, the tool-specific `result` dict, output
+    references, any other field) goes to `<name>_text.parquet`, one JSON
+    document per row, so the analysis never has to read it.
+    """
+
+    METRICS_SCHEMA = pa.schema([
+        ("tool", _category()),
+        ("benchmark", _category()),
+        ("status", _category()),
+        ("trial", pa.int32()),
+        ("success", pa.bool_()),
+        ("cache_hit", pa.bool_()),
+        ("return_code", pa.int32()),
+        ("execution_time", pa.float64()),
+        ("tool_wall_time", pa.float64()),
+        ("cpu_user_time", pa.float64()),
+        ("cpu_system_time", pa.float64()),
+        ("peak_memory_mb", pa.float64()),
+        ("container_overhead_time", pa.float64()),
+        ("container_prepare_time", pa.float64()),
+        ("bugs_detected", pa.int64()),
+        ("properties_verified", pa.int64()),
+        ("alarms_generated", pa.int64()),
+        ("proofs_established", pa.int64()),
+        ("goals_proven", pa.int64()),
+        ("goals_failed", pa.int64()),
+        ("runtime_checks_inserted", pa.int64()),
+        ("instrumentation_success", pa.bool_())
+    ])
+
+    TEXT_SCHEMA = pa.schema([
+        ("row", pa.int64()),
+        ("stdout", pa.string()),
+        ("stderr", pa.string()),
+        ("details", pa.string())
+    ])
+
+    @classmethod
+    def metric_columns(cls):
+        return cls.METRICS_SCHEMA.names
+
+    @staticmethod
+    def text_path(path):
+        path = Path(path)
+        return path.with_name(f"{path.stem}_text{path.suffix}")
+
+    @staticmethod
+    def record_status(record):
+        """Verdict status of a record, None when its `result` is not a verdict
+        (records of older runs hold CBMC's raw JSON-UI list there)"""
+        result = record.get("result")
+        return result.get("status") if isinstance(result, dict) else None
+
+    @classmethod
+    def to_arrow(cls, records):
+        """Metrics table of a list of result records"""
+        columns = {}
+        for field in cls.METRICS_SCHEMA:
+            if field.name == "status":
+                values = [cls.record_status(r) for r in records]
+            elif field.name == "trial":
+                values = [r.get("trial", 0) for r in records]
+            else:
+                values = [r.get(field.name) for r in records]
+            if pa.types.is_floating(field.type):
+                values = [None if v is None else float(v) for v in values]
+            columns[field.name] = pa.array(values, type=field.type)
+        return pa.Table.from_pydict(columns, schema=cls.METRICS_SCHEMA)
+
+    @classmethod
+    def text_to_arrow(cls, records):
+        """Text table (stdout/stderr and every non-metric field) of result records"""
+        metric_names = set(cls.metric_columns())
+        details = [
+            json.dumps({k: v for k, v in r.items() if k not in metric_names and k not in ("stdout", "stderr")},
+                       default=str)
+            for r in records
+        ]
+        return pa.Table.from_pydict({
+            "row": pa.array(range(len(records)), type=pa.int64()),
+            "stdout": pa.array([r.get("stdout") for r in records], type=pa.string()),
+            "stderr": pa.array([r.get("stderr") for r in records], type=pa.string()),
+            "details": pa.array(details, type=pa.string())
+        }, schema=cls.TEXT_SCHEMA)
+
+    @classmethod
+    def write(cls, records, path):
+        """Write records to `path` (metrics) and its `_text` companion, atomically"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for table, target in ((cls.to_arrow(records), path), (cls.text_to_arrow(records), cls.text_path(path))):
+            tmp_file = target.with_suffix(".tmp")
+            pq.write_table(table, tmp_file, compression="zstd")
+            tmp_file.replace(target)
+
+    @classmethod
+    def load(cls, path, columns=None):
+        """DataFrame of the metric columns (or a subset) of a results file.
+
+        Reads Parquet directly; a JSON results file is converted through the
+        same schema so both give identical dtypes.
+        """
+        path = Path(path)
+        if columns is not None:
+            columns = [c for c in columns if c in cls.metric_columns()]
+        if path.suffix == ".parquet":
+            table = pq.read_table(path, columns=columns)
+        else:
+            with open(path, 'r') as f:
+                table = cls.to_arrow(json.load(f))
+            if columns is not None:
+                table = table.select(columns)
+        return table.to_pandas()
+
+    @classmethod
+    def load_field(cls, path, field):
+        """One non-metric field (e.g. `findings`) of every record in row order, None where absent"""
+        path = Path(path)
+        if path.suffix == ".parquet":
+            table = pq.read_table(cls.text_path(path), columns=["row", "details"]).to_pandas()
+            return [json.loads(details).get(field) for details in table.sort_values("row")["details"]]
+        with open(path, 'r') as f:
+            return [record.get(field) for record in json.load(f)]
+
+    @classmethod
+    def load_text(cls, path, rows=None):
+        """stdout/stderr excerpts and details of selected rows of a Parquet results file"""
+        table = pq.read_table(cls.text_path(path))
+        df = table.to_pandas()
+        if rows is not None:
+            df = df[df["row"].isin(rows)]
+        df["details"] = df["details"].map(json.loads)
+        return df
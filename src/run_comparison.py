@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+import json
+import numpy as np
+import pyarrow as pa
+from pathlib import Path
+from scipy.stats import mannwhitneyu
+from src.results_table import ResultsTable
+
+class RunComparison:
+    """Compare result sets of several experiment runs against a baseline run.
+
+    Result sets are read with ResultsTable (Parquet or JSON) and aligned by
+    (tool, benchmark). Timing samples (several per pair with --repeat) are
+    compared with a one-sided Mann-Whitney U test; a pair regresses when it
+    is significantly slower by at least `min_slowdown`, or when its verdict
+    changes.
+    """
+
+    # Verdicts that mean the tool no longer produced an answer
+    FAILURE_STATUSES = ("ERROR", "TIMEOUT", "OUT_OF_MEMORY", "CANCELLED")
+    # Measured columns of the results table a comparison can be made on
+    METRICS = tuple(field.name for field in ResultsTable.METRICS_SCHEMA if pa.types.is_floating(field.type))
+
+    def __init__(self, baseline_file, candidate_files, metric='execution_time', alpha=0.05,
+                 min_slowdown=0.10, min_samples=3):
+        self.baseline_file = Path(baseline_file)
+        self.candidate_files = [Path(f) for f in candidate_files]
+        if metric not in self.METRICS:
+            raise ValueError(f"Unknown metric: {metric} (one of {', '.join(self.METRICS)})")
+        self.metric = metric
+        self.alpha = alpha
+        self.min_slowdown = min_slowdown
+        self.min_samples = min_samples
+        self.baseline = self.load_pairs(self.baseline_file)
+
+    def load_pairs(self, results_file):
+        """Timing samples and verdicts of a result set, keyed by (tool, benchmark).
+
+        Records of older runs may lack a verdict (CBMC's raw JSON-UI list was
+        stored as the result) or the metric; their status or samples are
+        left out rather than guessed.
+        """
+        df = ResultsTable.load(results_file, ['tool', 'benchmark', 'status', self.metric])
+        pairs = {}
+        for (tool, benchmark), pair_data in df.groupby(['tool', 'benchmark'], observed=True):
+            statuses = pair_data['status'].astype(object)
+            # Failed runs say nothing about the tool's speed
+            answered = pair_data[~statuses.isin(self.FAILURE_STATUSES)]
+            samples = answered[self.metric].dropna()
+            known = statuses.dropna()
+            pairs[(tool, benchmark)] = {
+                "samples": samples.to_numpy(dtype=float),
+                "status": known.mode().iloc[0] if not known.empty else None
+            }
+        return pairs
+
+    def compare(self):
+        """Report of every candidate run against the baseline"""
+        report = {
+            "baseline": str(self.baseline_file),
+            "baseline_trials": sum(len(pair["samples"]) for pair in self.baseline.values()),
+            "metric": self.metric,
+            "alpha": self.alpha,
+            "min_slowdown": self.min_slowdown,
+            "candidates": []
+        }
+        for candidate_file in self.candidate_files:
+            report["candidates"].append(self.compare_run(candidate_file))
+        report["regression"] = any(c["regressions"] for c in report["candidates"])
+        return report
+
+    def compare_run(self, candidate_file):
+        candidate = self.load_pairs(candidate_file)
+        pairs = []
+        for key in sorted(set(self.baseline) | set(candidate)):
+            pairs.append(self.compare_pair(key, self.baseline.get(key), candidate.get(key)))
+        return {
+            "file": str(candidate_file),
+            "trials": sum(len(pair["samples"]) for pair in candidate.values()),
+            "pairs": pairs,
+            "regressions": [p for p in pairs if p["regression"]],
+            "improvements": [p for p in pairs if p["timing"] == "faster"],
+            "warnings": [p for p in pairs if not p["regression"]
+                         and p["timing"] in ("slower_untested", "missing", "no_samples")]
+        }
+
+    def compare_pair(self, key, baseline, candidate):
+        tool, benchmark = key
+        row = {
+            "tool": tool,
+            "benchmark": benchmark,
+            "baseline_status": baseline["status"] if baseline else None,
+            "candidate_status": candidate["status"] if candidate else None,
+            "baseline_samples": len(baseline["samples"]) if baseline else 0,
+            "candidate_samples": len(candidate["samples"]) if candidate else 0,
+            "baseline_median": None,
+            "candidate_median": None,
+            "ratio": None,
+            "p_value": None,
+            "timing": None,
+            "verdict_changed": False,
+            "regression": False
+        }
+        if baseline is None:
+            row["timing"] = "new"
+            return row
+        if candidate is None:
+            row["timing"] = "missing"
+            return row
+
+        # Without a verdict on both sides (e.g. records of older runs) there is nothing to compare
+        row["verdict_changed"] = (None not in (row["baseline_status"], row["candidate_status"])
+                                  and row["baseline_status"] != row["candidate_status"])
+        row["timing"] = self.compare_timing(baseline["samples"], candidate["samples"], row)
+        # A pair that failed in the baseline and answers now is a fix, not a regression
+        verdict_regressed = row["verdict_changed"] and row["baseline_status"] not in self.FAILURE_STATUSES
+        row["regression"] = verdict_regressed or row["timing"] == "slower"
+        return row
+
+    def compare_timing(self, baseline_samples, candidate_samples, row):
+        """Classify the timing change as slower, faster, unchanged or slower_untested"""
+        if len(baseline_samples) == 0 or len(candidate_samples) == 0:
+            return "no_samples"
+        baseline_median = float(np.median(baseline_samples))
+        candidate_median = float(np.median(candidate_samples))
+        row["baseline_median"] = baseline_median
+        row["candidate_median"] = candidate_median
+        if baseline_median <= 0:
+            return "unchanged"
+        ratio = candidate_median / baseline_median
+        row["ratio"] = ratio
+
+        if min(len(baseline_samples), len(candidate_samples)) < self.min_samples:
+            # Too few trials for a test (run with --repeat): only warn
+            return "slower_untested" if ratio >= 1 + self.min_slowdown else "unchanged"
+
+        slower = mannwhitneyu(candidate_samples, baseline_samples, alternative='greater').pvalue
+        faster = mannwhitneyu(candidate_samples, baseline_samples, alternative='less').pvalue
+        if slower < self.alpha and ratio >= 1 + self.min_slowdown:
+            row["p_value"] = float(slower)
+            return "slower"
+        if faster < self.alpha and ratio <= 1 - self.min_slowdown:
+            row["p_value"] = float(faster)
+            return "faster"
+        row["p_value"] = float(min(slower, faster))
+        return "unchanged"
+
+    def save_report(self, report, output_file):
+        output_file = Path(output_file)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_file, 'w') as f:
+            json.dump(report, f, indent=2)
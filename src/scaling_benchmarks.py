@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import random
+from pathlib import Path
+from src.benchmark_manifest import BenchmarkManifest
+
+# Size parameters of a synthetic benchmark and their defaults
+DEFAULT_PARAMETERS = {
+    "functions": 4,        # worker functions, bug-free or with one injected bug each
+    "array_size": 16,      # elements of each function's local array
+    "loop_bound": 8,       # iterations of every loop (CBMC needs --unwind above this, see min_unwind)
+    "nesting_depth": 1,    # loops nested in each function
+    "threads": 0,          # pthreads incrementing a shared counter (0: sequential program)
+    "bugs": {}             # injected bugs per category, see BUG_CATEGORIES
+}
+
+# Injected defect -> (property class, statements placed after the loops of a function,
+# index of the statement with the defect). `{n}` is the array size, `{l}` the loop bound.
+BUG_CATEGORIES = {
+    "out_of_bounds": ("array_bounds", [
+        "for (int k = 0; k <= {n}; k++) buf[k] = k;"
+    ], 0),
+    "division_by_zero": ("division_by_zero", [
+        "int divisor = {l};",
+        "for (int k = 0; k < {l}; k++) divisor--;",
+        "result = result / divisor;"
+    ], 2),
+    "integer_overflow": ("overflow", [
+        "int acc = INT_MAX - {l};",
+        "for (int k = 0; k <= {l}; k++) acc = acc + 1;",
+        "result = acc;"
+    ], 1),
+    "null_pointer": ("pointer_dereference", [
+        "int *ptr = ({l} > 0) ? NULL : &result;",
+        "result = *ptr;"
+    ], 1)
+}
+
+# Correct counterparts of the bug snippets, so that bug-free functions do the same work
+SAFE_SNIPPETS = {
+    "out_of_bounds": [
+        "for (int k = 0; k < {n}; k++) buf[k] = k;"
+    ],
+    "division_by_zero": [
+        "int divisor = {l};",
+        "for (int k = 0; k < {l} - 1; k++) divisor--;",
+        "result = result / divisor;"
+    ],
+    "integer_overflow": [
+        "int acc = INT_MAX - {l};",
+        "for (int k = 0; k < {l}; k++) acc = acc + 1;",
+        "result = acc;"
+    ],
+    "null_pointer": [
+        "int *ptr = ({l} > 0) ? &result : NULL;",
+        "if (ptr != NULL) result = *ptr;"
+    ]
+}
+
+# Generated files depend on this module's code: editing it regenerates the suite
+GENERATOR_FINGERPRINT = BenchmarkManifest.content_hash(Path(__file__).read_bytes())
+
+class ScalingBenchmarkGenerator:
+    """Families of synthetic benchmarks that grow along one size parameter.
+
+    A family varies one parameter (e.g. `loop_bound` for CBMC unwinding or
+    `functions` for WP goal counts) over a list of values, the others being
+    taken from the base parameters. Every file is deterministic given the
+    seed, family and parameters, and comes with ground truth: the expected
+    verdict and, per function, the injected bugs with their category,
+    property class and line. The ground truth and hash of every file are
+    written to `manifest.json` next to the families; files whose content
+    did not change are not rewritten.
+    """
+
+    def __init__(self, base_path="benchmarks/scaling", seed=0, base=None, families=None, tools=None, unwind=None):
+        self.base_path = Path(base_path)
+        self.seed = seed
+        self.base = dict(DEFAULT_PARAMETERS, **(base or {}))
+        # family (parameter name) -> values taken by that parameter
+        self.families = families or {}
+        self.tools = list(tools or ["cbmc", "framac_value", "framac_wp"])
+        # --unwind CBMC runs with: benchmarks with longer loops would only be checked in part
+        self.unwind = unwind
+
+    @classmethod
+    def from_config(cls, config):
+        """Build a generator from the `benchmarks.scaling` section of the configuration"""
+        scaling_config = config.get("benchmarks", {}).get("scaling", {})
+        cbmc_flags = [str(flag) for flag in config.get("tools", {}).get("cbmc", {}).get("default_flags") or []]
+        unwind = None
+        if "--unwind" in cbmc_flags[:-1]:
+            unwind = int(cbmc_flags[cbmc_flags.index("--unwind") + 1])
+        return cls(
+            base_path=scaling_config.get("directory", "benchmarks/scaling"),
+            seed=scaling_config.get("seed", 0),
+            base=scaling_config.get("base"),
+            families=scaling_config.get("families"),
+            tools=scaling_config.get("tools"),
+            unwind=unwind
+        )
+
+    @property
+    def manifest_path(self):
+        return self.base_path / "manifest.json"
+
+    def generate_suite(self):
+        """Write every family (only the files that changed) and the manifest; return the manifest"""
+        manifest = BenchmarkManifest(self.manifest_path)
+        for family, values in self.families.items():
+            if family not in DEFAULT_PARAMETERS or family == "bugs":
+                raise ValueError(f"Unknown scaling parameter: {family}")
+            for value in values:
+                parameters = dict(self.base, **{family: value})
+                name = f"{family}_{value:04d}.c" if isinstance(value, int) else f"{family}_{value}.c"
+                path = self.base_path / family / name
+                seed = f"{self.seed}:{family}:{value}"
+                min_unwind = self.min_unwind(parameters)
+                if self.unwind and "cbmc" in self.tools and min_unwind > self.unwind:
+                    raise ValueError(f"{family}={value} needs CBMC --unwind {min_unwind} (configured: {self.unwind}); "
+                                     f"lower the family's values or raise the unwind bound")
+                inputs = BenchmarkManifest.content_hash(
+                    json.dumps([GENERATOR_FINGERPRINT, seed, parameters, str(path), self.tools], sort_keys=True)
+                )
+                if manifest.reuse(name, inputs):
+                    continue
+                code, truth = self.generate_benchmark(parameters, seed)
+                manifest.write(name, path, code, inputs=inputs, family=family, parameter=family, value=value,
+                               parameters=parameters, tools=self.tools, min_unwind=min_unwind, **truth)
+
+        saved = manifest.save(generator=os.path.relpath(__file__), seed=self.seed, base=self.base)
+        print(f"✅ Generated {len(saved['benchmarks'])} scaling benchmarks in {self.base_path}/ ({manifest.summary()})")
+        return saved
+
+    def generate_benchmark(self, parameters, seed):
+        """C source and ground truth of one benchmark"""
+        rng = random.Random(seed)
+        functions = max(1, int(parameters["functions"]))
+        size = max(1, int(parameters["array_size"]))
+        bound = max(1, int(parameters["loop_bound"]))
+        depth = max(1, int(parameters["nesting_depth"]))
+        threads = max(0, int(parameters["threads"]))
+
+        # Which functions get which bug: one bug per function, placed at random
+        unknown = set(parameters["bugs"]) - set(BUG_CATEGORIES) - {"data_race"}
+        if unknown:
+            raise ValueError(f"Unknown bug categories: {', '.join(sorted(unknown))}")
+        injected = [category for category, count in sorted(parameters["bugs"].items())
+                    if category != "data_race" for _ in range(int(count))]
+        if len(injected) > functions:
+            raise ValueError(f"{len(injected)} bugs cannot be injected into {functions} functions")
+        buggy = dict(zip(rng.sample(range(functions), len(injected)), injected))
+        racy = threads > 0 and int(parameters["bugs"].get("data_race", 0)) > 0
+
+        lines = ["#include <limits.h>", "#include <stddef.h>"]
+        if threads:
+            lines += ["#include <pthread.h>"]
+        lines.append("")
+        truth = {"functions": {}}
+
+        for index in range(functions):
+            name = f"work_{index:03d}"
+            bug = buggy.get(index)
+            # The safe snippet of a bug-free function is picked at random, for variety
+            snippet_kind = bug or rng.choice(sorted(SAFE_SNIPPETS))
+            snippet = BUG_CATEGORIES[bug][1] if bug else SAFE_SNIPPETS[snippet_kind]
+            lines += self.function_lines(name, size, bound, depth)
+            first_statement = len(lines) + 1
+            for statement in snippet:
+                lines.append("    " + statement.format(n=size, l=bound))
+            bugs = []
+            if bug:
+                property_class, _, defect = BUG_CATEGORIES[bug]
+                bugs.append({"category": bug, "property_class": property_class, "line": first_statement + defect})
+            lines += ["    return result;", "}", ""]
+            truth["functions"][name] = {"expected": "UNSAFE" if bugs else "SAFE", "bugs": bugs}
+
+        if threads:
+            lines += self.thread_lines(bound, racy, truth, first_line=len(lines) + 1)
+
+        lines.append("int main(void) {")
+        lines += [f"    work_{index:03d}();" for index in range(functions)]
+        if threads:
+            lines += [
+                f"    pthread_t workers[{threads}];",
+                f"    for (int t = 0; t < {threads}; t++) pthread_create(&workers[t], NULL, increment, NULL);",
+                f"    for (int t = 0; t < {threads}; t++) pthread_join(workers[t], NULL);"
+            ]
+        lines += ["    return 0;", "}", ""]
+        truth["functions"]["main"] = {"expected": "SAFE", "bugs": []}
+
+        bugs = [bug for function in truth["functions"].values() for bug in function["bugs"]]
+        truth["expected_verdict"] = "UNSAFE" if bugs else "SAFE"
+        truth["bug_count"] = len(bugs)
+        return "\n".join(lines), truth
+
+    @staticmethod
+    def min_unwind(parameters):
+        """Smallest CBMC --unwind checking every loop of a benchmark completely.
+
+        The longest loops run one iteration past the array size or loop
+        bound (the out-of-bounds and overflow snippets), and CBMC needs one
+        unwinding more than a loop's iterations to see it exit.
+        """
+        return max(int(parameters["loop_bound"]), int(parameters["array_size"])) + 2
+
+    @staticmethod
+    def function_lines(name, size, bound, depth):
+        """Head of a worker function: `depth` nested loops of `bound` iterations over a local array"""
+        counters = [f"i{level}" for level in range(depth)]
+        lines = [
+            f"int {name}(void) {{",
+            f"    int buf[{size}] = {{0}};",
+            "    int result = 1;"
+        ]
+        for level, counter in enumerate(counters):
+            indent = "    " * (level + 1)
+            lines += [
+                f"{indent}/*@ loop invariant 0 <= {counter} <= {bound};",
+                f"{indent}    loop assigns {counter}, buf[0 .. {size - 1}]; */",
+                f"{indent}for (int {counter} = 0; {counter} < {bound}; {counter}++) {{"
+            ]
+        indent = "    " * (depth + 1)
+        lines.append(f"{indent}buf[({' + '.join(counters)}) % {size}] = {counters[-1]};")
+        for level in reversed(range(depth)):
+            lines.append("    " * (level + 1) + "}")
+        lines.append(f"    result += buf[{size // 2}] & 1;")
+        return lines
+
+    @staticmethod
+    def thread_lines(bound, racy, truth, first_line):
+        """Shared counter incremented by every thread, with or without its mutex"""
+        lines = [
+            "int shared_counter = 0;",
+            "pthread_mutex_t counter_lock = PTHREAD_MUTEX_INITIALIZER;",
+            "",
+            "void *increment(void *arg) {",
+            f"    for (int k = 0; k < {bound}; k++) {{"
+        ]
+        bugs = []
+        if racy:
+            lines.append("        shared_counter++;")
+            bugs.append({"category": "data_race", "property_class": "data_race",
+                         "line": first_line + len(lines) - 1})
+        else:
+            lines += [
+                "        pthread_mutex_lock(&counter_lock);",
+                "        shared_counter++;",
+                "        pthread_mutex_unlock(&counter_lock);"
+            ]
+        lines += ["    }", "    return NULL;", "}", ""]
+        truth["functions"]["increment"] = {"expected": "UNSAFE" if bugs else "SAFE", "bugs": bugs}
+        return lines
+
+    @staticmethod
+    def load_manifest(path):
+        """Ground truth of a generated suite, or None when there is none"""
+        return BenchmarkManifest.load(path)
+
+def parse_value(text):
+    return int(text) if text.lstrip("-").isdigit() else text
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate families of synthetic benchmarks of growing size")
+    parser.add_argument("--output", default="benchmarks/scaling", help="Directory of the generated suite")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the bug placement and code variations")
+    parser.add_argument("--family", action="append", default=[], metavar="PARAMETER=V1,V2,...",
+                        help=f"Family varying one of {', '.join(p for p in DEFAULT_PARAMETERS if p != 'bugs')}")
+    parser.add_argument("--set", action="append", default=[], metavar="PARAMETER=VALUE",
+                        help="Base parameter shared by every family (bugs.<category>=N for injected bugs)")
+    parser.add_argument("--unwind", type=int, default=None,
+                        help="CBMC --unwind the benchmarks must be fully checkable with")
+    args = parser.parse_args()
+
+    base = {"bugs": {}}
+    for assignment in args.set:
+        key, value = assignment.split("=", 1)
+        if key.startswith("bugs."):
+            base["bugs"][key[len("bugs."):]] = int(value)
+        else:
+            base[key] = parse_value(value)
+    families = {}
+    for family in args.family:
+        key, values = family.split("=", 1)
+        families[key] = [parse_value(value) for value in values.split(",")]
+
+    ScalingBenchmarkGenerator(args.output, args.seed, base, families, unwind=args.unwind).generate_suite()
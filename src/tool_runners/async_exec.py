@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+import asyncio
+import os
+import signal
+import subprocess
+
+# Longest single output line accepted from a tool
+STREAM_LINE_LIMIT = 16 * 1024 * 1024
+
+async def _pump(stream, lines, on_line):
+    """Read a stream line by line, handing each line to the parser as it arrives"""
+    while True:
+        raw = await stream.readline()
+        if not raw:
+            break
+        line = raw.decode(errors="replace")
+        lines.append(line)
+        if on_line:
+            on_line(line)
+
+def _kill_process_group(process):
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+async def run_streaming(cmd, timeout, on_stdout_line=None, on_stderr_line=None, env=None):
+    """Run a command, parsing its output incrementally.
+
+    The command runs in its own process group so that a timeout or a
+    cancellation kills it together with everything it spawned.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
+        limit=STREAM_LINE_LIMIT,
+        env=env
+    )
+    stdout_lines = []
+    stderr_lines = []
+
+    async def communicate():
+        await asyncio.gather(
+            _pump(process.stdout, stdout_lines, on_stdout_line),
+            _pump(process.stderr, stderr_lines, on_stderr_line)
+        )
+        return await process.wait()
+
+    try:
+        returncode = await asyncio.wait_for(communicate(), timeout)
+    except asyncio.TimeoutError:
+        _kill_process_group(process)
+        await process.wait()
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    except asyncio.CancelledError:
+        _kill_process_group(process)
+        await process.wait()
+        raise
+
+    return subprocess.CompletedProcess(cmd, returncode, "".join(stdout_lines), "".join(stderr_lines))
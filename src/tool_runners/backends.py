@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+import atexit
+import math
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from src.tool_runners.job_stats import GNU_TIME, GNU_TIME_FORMAT
+
+JOB_STATS_SCRIPT = str(Path(__file__).with_name("job_stats.py"))
+
+# Time between the SIGXCPU sent at the CPU budget and the final SIGKILL
+CPU_LIMIT_GRACE_SECONDS = 5
+
+def limit_command(argv, limits=None, measure=False):
+    """Wrap argv in a shell that sets per-process rlimits before exec'ing the tool.
+
+    With measure, the tool runs under GNU time (when the image has it), which
+    appends its wall time, CPU time and peak RSS to stderr.
+    """
+    limits = limits or {}
+    settings = []
+    if limits.get("memory_mb"):
+        settings.append(f"ulimit -v {int(limits['memory_mb']) * 1024}")
+    if limits.get("cpu_seconds"):
+        # SIGXCPU at the budget (reported as a timeout), SIGKILL shortly after
+        cpu_seconds = math.ceil(limits["cpu_seconds"])
+        settings.append(f"ulimit -S -t {cpu_seconds}")
+        settings.append(f"ulimit -H -t {cpu_seconds + CPU_LIMIT_GRACE_SECONDS}")
+    if measure:
+        run = f'if [ -x {GNU_TIME} ]; then exec {GNU_TIME} -f \'{GNU_TIME_FORMAT}\' "$@"; else exec "$@"; fi'
+    elif settings:
+        run = 'exec "$@"'
+    else:
+        return list(argv)
+    return ["sh", "-c", " && ".join(settings + [run]), "sh", *argv]
+
+
+class ComposeRunBackend:
+    """Start a fresh `docker compose run --rm` container for every job.
+
+    Memory and CPU limits are applied to the container's cgroup through the
+    TOOL_MEMORY_LIMIT / TOOL_CPUS variables interpolated in docker-compose.yml,
+    and as rlimits on the tool process itself.
+    """
+
+    name = "compose"
+
+    def container_path(self, host_path):
+        """Path of a host file inside the tool container"""
+        return f"/workspace/{Path(host_path).resolve().relative_to(Path.cwd())}"
+
+    def prepare(self, service):
+        """Nothing to prepare: each job brings up its own container"""
+
+    def build_command(self, service, argv, timeout=None, limits=None):
+        """Host command that runs argv inside the service container"""
+        argv = limit_command(argv, limits, measure=True)
+        return [
+            "docker", "compose", "run", "--rm",
+            "--entrypoint", argv[0],
+            service,
+            *argv[1:]
+        ]
+
+    def command_env(self, limits=None):
+        """Environment for the host command (None: inherit)"""
+        limits = limits or {}
+        if not limits.get("memory_mb") and not limits.get("cpus"):
+            return None
+        env = dict(os.environ)
+        if limits.get("memory_mb"):
+            env["TOOL_MEMORY_LIMIT"] = f"{int(limits['memory_mb'])}m"
+        if limits.get("cpus"):
+            env["TOOL_CPUS"] = str(limits["cpus"])
+        return env
+
+    def run(self, service, argv, timeout, limits=None):
+        """Run argv for a service and return the completed process"""
+        return subprocess.run(
+            self.build_command(service, argv, timeout, limits),
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            env=self.command_env(limits)
+        )
+
+    def shutdown(self):
+        """Nothing to clean up"""
+
+
+class WarmContainerBackend(ComposeRunBackend):
+    """Keep one long-lived container per compose service and `docker exec` jobs into it.
+
+    Jobs share the container, so limits are enforced per job as rlimits.
+    """
+
+    name = "warm"
+
+    def __init__(self, health_check_interval=30):
+        self.health_check_interval = health_check_interval
+        self.containers = {}
+        self.last_health_check = {}
+        self.locks = {}
+        self.lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    def container_name(self, service):
+        return f"{Path.cwd().name.lower()}-{service}-warm-{os.getpid()}"
+
+    def prepare(self, service):
+        """Make sure the service container is up, restarting it if it died"""
+        with self._service_lock(service):
+            name = self.containers.get(service)
+            if name is None:
+                self.start(service)
+            elif time.time() - self.last_health_check.get(service, 0) >= self.health_check_interval:
+                if not self.is_healthy(name):
+                    print(f"♻️  Restarting {service} container")
+                    self.stop(service)
+                    self.start(service)
+                self.last_health_check[service] = time.time()
+            return self.containers[service]
+
+    def start(self, service):
+        """Start a detached container that idles until jobs are sent to it"""
+        name = self.container_name(service)
+        subprocess.run(["docker", "rm", "-f", name], capture_output=True, text=True)
+        subprocess.run(
+            ["docker", "compose", "run", "-d", "--rm", "--name", name,
+             "--entrypoint", "sleep", service, "infinity"],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        self.containers[service] = name
+        self.last_health_check[service] = time.time()
+        return name
+
+    def is_healthy(self, name):
+        """Check that the container is running and accepts exec requests"""
+        try:
+            probe = subprocess.run(
+                ["docker", "exec", name, "true"],
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
+        except subprocess.TimeoutExpired:
+            return False
+        return probe.returncode == 0
+
+    def build_command(self, service, argv, timeout=None, limits=None):
+        return self.exec_command(self.prepare(service), argv, timeout, limits)
+
+    def exec_command(self, name, argv, timeout=None, limits=None):
+        """Host command that runs argv in the container `name`"""
+        cmd = ["docker", "exec", name]
+        if timeout:
+            # Killing the docker client does not stop the process inside the
+            # container, so enforce the budget in the container as well
+            cmd += ["timeout", "-s", "KILL", str(int(timeout) + 1)]
+        return cmd + limit_command(argv, limits, measure=True)
+
+    def command_env(self, limits=None):
+        return None
+
+    def run(self, service, argv, timeout, limits=None):
+        # The container this job runs in, even if another job replaces it meanwhile
+        name = self.prepare(service)
+        result = subprocess.run(
+            self.exec_command(name, argv, timeout, limits),
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+        if result.returncode != 0 and not self.is_healthy(name):
+            # The container crashed underneath the job: restart it (unless another job already did) and retry once
+            with self._service_lock(service):
+                if self.containers.get(service) in (name, None):
+                    self.stop(service)
+                    self.start(service)
+            result = super().run(service, argv, timeout, limits)
+        return result
+
+    def stop(self, service):
+        name = self.containers.pop(service, None)
+        if name:
+            subprocess.run(["docker", "rm", "-f", name], capture_output=True, text=True)
+
+    def shutdown(self):
+        """Remove all warm containers"""
+        for service in list(self.containers):
+            self.stop(service)
+
+    def _service_lock(self, service):
+        with self.lock:
+            return self.locks.setdefault(service, threading.Lock())
+
+
+class LocalBackend(ComposeRunBackend):
+    """Run tools as plain local processes (no Docker), limited by rlimits"""
+
+    name = "local"
+
+    def __init__(self, executables=None):
+        # Optional mapping of tool executable -> local replacement command
+        self.executables = executables or {}
+
+    def container_path(self, host_path):
+        return str(Path(host_path).resolve())
+
+    def build_command(self, service, argv, timeout=None, limits=None):
+        replacement = self.executables.get(argv[0])
+        if replacement is not None:
+            if isinstance(replacement, str):
+                replacement = [replacement]
+            argv = list(replacement) + list(argv[1:])
+        # GNU time may not be installed on the host: measure with the bundled helper
+        return limit_command([sys.executable, JOB_STATS_SCRIPT, *argv], limits)
+
+    def command_env(self, limits=None):
+        return None
+
+
+BACKENDS = {
+    "compose": ComposeRunBackend,
+    "warm": WarmContainerBackend,
+    "local": LocalBackend
+}
+
+def create_backend(name="compose", **kwargs):
+    """Instantiate an execution backend by name"""
+    try:
+        return BACKENDS[name](**kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown execution backend: {name}")
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+import asyncio
+import re
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from src.tool_runners.backends import ComposeRunBackend
+from src.tool_runners.async_exec import run_streaming
+from src.tool_runners.raw_output import RawOutputWriter
+from src.tool_runners.job_stats import parse_job_stats
+
+# SIGXCPU (CPU time limit) as seen directly and through a shell/docker
+CPU_LIMIT_EXIT_CODES = (-24, 152)
+# SIGKILL as seen directly and through a shell/docker: the cgroup OOM killer, the hard
+# CPU limit after SIGXCPU or a timeout kill; which one only the job's usage tells
+KILLED_EXIT_CODES = (-9, 137)
+# Allocation failures reported by CBMC (C++) and Frama-C (OCaml) under ulimit -v
+MEMORY_LIMIT_MARKERS = ("out of memory", "out_of_memory", "bad_alloc", "cannot allocate memory")
+# A killed job whose peak RSS came this close to the memory limit was killed by the OOM killer
+OOM_PEAK_FRACTION = 0.9
+# `file.c:12` locations of diagnostics, and the words marking a diagnostic as a reported defect
+LOCATION_PATTERN = re.compile(r"([\w./-]+\.[ch]):(\d+)")
+FUNCTION_CONTEXT_PATTERN = re.compile(r"In function '(\w+)'")
+FINDING_MARKERS = ("error", "fail", "alarm")
+# Findings kept in a record; a tool flooding its output with diagnostics does not flood the results
+MAX_FINDINGS = 1000
+
+class BaseToolRunner:
+    """Shared execution logic for the verification tool runners"""
+
+    tool_name = None
+    container = None  # service name in docker-compose.yml
+    timeout = 300
+    required_flags = []  # flags the output parser depends on, always passed
+    default_flags = []   # used when the configuration lists no flags
+
+    def __init__(self, backend=None, raw_output=None, timeout=None, flags=None, memory_mb=None, cpus=None):
+        self.backend = backend or ComposeRunBackend()
+        self.raw_output = raw_output or RawOutputWriter()
+        if timeout:
+            self.timeout = timeout
+        self.flags = list(self.default_flags if flags is None else flags)
+        self.memory_mb = memory_mb
+        self.cpus = cpus
+
+    @classmethod
+    def from_config(cls, config, backend=None, raw_output=None):
+        """Build a runner from the global settings and the tool's section of the configuration.
+
+        Per-tool `timeout_seconds`, `max_memory_mb` and `cpus` override the
+        values under `experiment.settings`.
+        """
+        settings = config.get("experiment", {}).get("settings", {})
+        tool_config = config.get("tools", {}).get(cls.tool_name, {})
+        return cls(
+            backend,
+            raw_output,
+            timeout=tool_config.get("timeout_seconds", settings.get("timeout_seconds")),
+            flags=tool_config.get("default_flags"),
+            memory_mb=tool_config.get("max_memory_mb", settings.get("max_memory_mb")),
+            cpus=tool_config.get("cpus", settings.get("cpus_per_job")),
+            **cls.config_options(tool_config)
+        )
+
+    @classmethod
+    def config_options(cls, tool_config):
+        """Tool-specific constructor arguments taken from the tool's configuration"""
+        return {}
+
+    def command_flags(self):
+        """Required flags followed by the configured ones"""
+        return list(self.required_flags) + [flag for flag in self.flags if flag not in self.required_flags]
+
+    def limits(self):
+        """Resource limits the backend enforces on each job"""
+        return {
+            "memory_mb": self.memory_mb,
+            "cpus": self.cpus,
+            # CPU time cap inside the job: a runaway tool dies at the budget even
+            # if the container outlives the killed docker client
+            "cpu_seconds": self.timeout
+        }
+
+    def build_command(self, container_benchmark_path):
+        """Tool command line (executable first) for a benchmark"""
+        raise NotImplementedError
+
+    def is_success(self, result):
+        return result.returncode == 0
+
+    def create_parser(self, benchmark_name=None, output_dir=None):
+        """Single-pass output parser for this tool"""
+        raise NotImplementedError
+
+    def metric_fields(self):
+        """Parser counters copied to the top level of the result record"""
+        return ()
+
+    def collect_metrics(self, result, parsed):
+        """Tool-specific counters added to the result record"""
+        return {field: parsed[field] for field in self.metric_fields()}
+
+    def empty_metrics(self):
+        """Tool-specific counters for runs that produced no output"""
+        return {}
+
+    def parse_output(self, result, parsed=None):
+        raise NotImplementedError
+    
+    def findings(self, result, analysis):
+        """Defects reported by the tool: dicts with the file, function, line and category when known.
+
+        They are matched against the benchmarks' ground truth by
+        ResultsAnalyzer.detection_scores. By default, every diagnostic line
+        with a `file.c:<line>` location and an error/failure/alarm marker.
+        """
+        return self.located_findings(f"{result.stdout or ''}\n{result.stderr or ''}", FINDING_MARKERS)
+    
+    @staticmethod
+    def located_findings(text, markers):
+        """Findings of the lines of `text` that carry a location and one of `markers`"""
+        findings = []
+        function = None
+        for line in text.splitlines():
+            context = FUNCTION_CONTEXT_PATTERN.search(line)
+            if context:
+                function = context.group(1)
+            location = LOCATION_PATTERN.search(line)
+            if location is None or not any(marker in line.lower() for marker in markers):
+                continue
+            findings.append({"file": Path(location.group(1)).name, "function": function,
+                             "line": int(location.group(2)), "category": None})
+            if len(findings) >= MAX_FINDINGS:
+                break
+        return findings
+
+    def run_verification(self, benchmark_path, output_dir):
+        """Run the tool on a benchmark through the execution backend"""
+        benchmark_path = Path(benchmark_path).resolve()
+        container_benchmark_path = self.backend.container_path(benchmark_path)
+        cmd = self.build_command(container_benchmark_path)
+
+        try:
+            # Bring up the container (if any) before the clock starts
+            prepare_start = time.time()
+            self.backend.prepare(self.container)
+            prepare_time = time.time() - prepare_start
+
+            start_time = time.time()
+            result = self.backend.run(self.container, cmd, timeout=self.timeout, limits=self.limits())
+            execution_time = time.time() - start_time
+            resources = self.resource_usage(result, execution_time, prepare_time)
+            if self.limit_exceeded(result, execution_time, resources) == "TIMEOUT":
+                return self._create_timeout_result(benchmark_path.name)
+
+            parsed = self.create_parser(benchmark_path.name, output_dir).parse(result.stdout)
+            return self._create_result(benchmark_path.name, result, execution_time, parsed, output_dir, resources)
+
+        except subprocess.TimeoutExpired:
+            return self._create_timeout_result(benchmark_path.name)
+        except Exception as e:
+            return self._create_error_result(benchmark_path.name, str(e))
+
+    async def run_verification_async(self, benchmark_path, output_dir, on_line=None):
+        """Run the tool without blocking, counting findings while it is still running"""
+        benchmark_path = Path(benchmark_path).resolve()
+        container_benchmark_path = self.backend.container_path(benchmark_path)
+        cmd = self.build_command(container_benchmark_path)
+
+        parser = self.create_parser(benchmark_path.name, output_dir)
+
+        def on_stdout_line(line):
+            parser.feed(line)
+            if on_line:
+                on_line(self, line, parser)
+
+        try:
+            loop = asyncio.get_running_loop()
+            prepare_start = time.time()
+            await loop.run_in_executor(None, self.backend.prepare, self.container)
+            prepare_time = time.time() - prepare_start
+            limits = self.limits()
+            host_cmd = self.backend.build_command(self.container, cmd, self.timeout, limits)
+
+            start_time = time.time()
+            result = await run_streaming(
+                host_cmd, self.timeout, on_stdout_line=on_stdout_line, env=self.backend.command_env(limits)
+            )
+            execution_time = time.time() - start_time
+            resources = self.resource_usage(result, execution_time, prepare_time)
+            if self.limit_exceeded(result, execution_time, resources) == "TIMEOUT":
+                return self._create_timeout_result(benchmark_path.name)
+
+            return self._create_result(
+                benchmark_path.name, result, execution_time, parser.summary(), output_dir, resources
+            )
+
+        except subprocess.TimeoutExpired:
+            return self._create_timeout_result(benchmark_path.name)
+        except Exception as e:
+            return self._create_error_result(benchmark_path.name, str(e))
+
+    def run_parallel(self, commands, max_parallel=None):
+        """Run several tool command lines side by side.
+
+        Returns (completed process, or None on timeout; wall time) per command, in order.
+        """
+        limits = self.limits()
+        
+        def run_one(cmd):
+            start_time = time.time()
+            try:
+                result = self.backend.run(self.container, cmd, timeout=self.timeout, limits=limits)
+            except subprocess.TimeoutExpired:
+                result = None
+            return result, time.time() - start_time
+        
+        with ThreadPoolExecutor(max_workers=max_parallel or len(commands)) as pool:
+            return list(pool.map(run_one, commands))
+    
+    async def run_parallel_async(self, commands, max_parallel=None):
+        """Event-loop version of run_parallel (cancelling it kills every running command)"""
+        limits = self.limits()
+        env = self.backend.command_env(limits)
+        semaphore = asyncio.Semaphore(max_parallel or len(commands))
+        
+        async def run_one(cmd):
+            async with semaphore:
+                start_time = time.time()
+                host_cmd = self.backend.build_command(self.container, cmd, self.timeout, limits)
+                try:
+                    result = await run_streaming(host_cmd, self.timeout, env=env)
+                except subprocess.TimeoutExpired:
+                    result = None
+                return result, time.time() - start_time
+        
+        return await asyncio.gather(*(run_one(cmd) for cmd in commands))
+    
+    @staticmethod
+    def combine_usage(parallel, execution_time, prepare_time, sequential=()):
+        """Resource usage of a job made of several tool runs.
+
+        `sequential` runs happened one after another, followed by the
+        `parallel` ones side by side: tool time is the critical path, CPU
+        time the sum and peak memory the largest single run.
+        """
+        usage = {
+            "tool_wall_time": None,
+            "cpu_user_time": None,
+            "cpu_system_time": None,
+            "peak_memory_mb": None,
+            "container_overhead_time": None,
+            "container_prepare_time": prepare_time
+        }
+        measured = [*sequential, *parallel]
+        if measured and all(u["tool_wall_time"] is not None for u in measured):
+            usage["tool_wall_time"] = (sum(u["tool_wall_time"] for u in sequential)
+                                       + max((u["tool_wall_time"] for u in parallel), default=0.0))
+            usage["cpu_user_time"] = sum(u["cpu_user_time"] for u in measured)
+            usage["cpu_system_time"] = sum(u["cpu_system_time"] for u in measured)
+            usage["peak_memory_mb"] = max(u["peak_memory_mb"] for u in measured)
+            usage["container_overhead_time"] = max(0.0, execution_time - usage["tool_wall_time"])
+        return usage
+    
+    def resource_usage(self, result, execution_time, prepare_time):
+        """Tool-only time, CPU time, peak memory and container overhead of a job.
+
+        The statistics line written by GNU time (or the local helper) is
+        removed from result.stderr. Without it only the overhead of preparing
+        the backend is known.
+        """
+        stats, result.stderr = parse_job_stats(result.stderr)
+        usage = {
+            "tool_wall_time": None,
+            "cpu_user_time": None,
+            "cpu_system_time": None,
+            "peak_memory_mb": None,
+            "container_overhead_time": None,
+            "container_prepare_time": prepare_time
+        }
+        if stats:
+            usage.update(stats)
+            # Container create/start/stop and docker client round trips
+            usage["container_overhead_time"] = max(0.0, execution_time - stats["tool_wall_time"])
+        return usage
+
+    def _create_result(self, benchmark_name, result, execution_time, parsed=None, output_dir=None, resources=None):
+        if parsed is None:
+            parsed = self.create_parser().parse(result.stdout)
+        record = {
+            "tool": self.tool_name,
+            "benchmark": benchmark_name,
+            "success": self.is_success(result),
+            "execution_time": execution_time,
+            "return_code": result.returncode,
+            "stdout": result.stdout,
+            "stderr": result.stderr,
+            "result": self.parse_output(result, parsed)
+        }
+        record["findings"] = self.findings(result, record["result"])
+        record.update(self.collect_metrics(result, parsed))
+        if resources:
+            record.update(resources)
+        exceeded = self.limit_exceeded(result, execution_time, resources)
+        if exceeded == "OUT_OF_MEMORY":
+            record["success"] = False
+            record["result"] = {"status": "OUT_OF_MEMORY", "memory_limit_mb": self.memory_mb}
+        elif exceeded == "ERROR":
+            record["success"] = False
+            record["result"] = {"status": "ERROR", "killed": True}
+        if output_dir is not None:
+            record.update(self._spill_output(benchmark_name, result, output_dir))
+        return record
+    
+    def _spill_output(self, benchmark_name, result, output_dir):
+        """Move the full output to disk, keeping excerpts and references in the record"""
+        fields = {"output": {}}
+        for stream_name in ("stdout", "stderr"):
+            excerpt, reference = self.raw_output.spill(
+                output_dir, self.tool_name, benchmark_name, stream_name, getattr(result, stream_name) or ""
+            )
+            fields[stream_name] = excerpt
+            fields["output"][stream_name] = reference
+        return fields
+
+    def limit_exceeded(self, result, elapsed=None, usage=None):
+        """Status of a job stopped by its resource limits or killed, else None.
+
+        OUT_OF_MEMORY needs positive evidence: an allocation failure on stderr,
+        or a SIGKILL with the peak RSS at the memory limit. Another SIGKILL is
+        a TIMEOUT when the job used up its time budget (wall or CPU time), and
+        an ERROR otherwise. `usage` is the job's resource usage, read from the
+        statistics line of stderr when not given.
+        """
+        if result.returncode in CPU_LIMIT_EXIT_CODES:
+            return "TIMEOUT"
+        stderr = (result.stderr or "").lower()
+        if self.memory_mb and result.returncode != 0 and any(marker in stderr for marker in MEMORY_LIMIT_MARKERS):
+            return "OUT_OF_MEMORY"
+        if result.returncode not in KILLED_EXIT_CODES:
+            return None
+        if usage is None:
+            usage = parse_job_stats(result.stderr)[0] or {}
+        peak_memory = usage.get("peak_memory_mb")
+        if self.memory_mb and peak_memory is not None and peak_memory >= OOM_PEAK_FRACTION * self.memory_mb:
+            return "OUT_OF_MEMORY"
+        cpu_time = (usage.get("cpu_user_time") or 0) + (usage.get("cpu_system_time") or 0)
+        if self.timeout and ((elapsed or 0) >= self.timeout or cpu_time >= self.timeout):
+            return "TIMEOUT"
+        return "ERROR"
+
+    def _create_timeout_result(self, benchmark_name):
+        record = {
+            "tool": self.tool_name,
+            "benchmark": benchmark_name,
+            "success": False,
+            "execution_time": self.timeout,
+            "return_code": -1,
+            "stdout": "",
+            "stderr": f"Timeout after {self.timeout} seconds",
+            "result": {"status": "TIMEOUT", "timeout_seconds": self.timeout}
+        }
+        record.update(self.empty_metrics())
+        return record
+
+    def _create_cancelled_result(self, benchmark_name, execution_time, winner=None):
+        """Record of a run cancelled because another tool decided the benchmark (portfolio mode)"""
+        record = {
+            "tool": self.tool_name,
+            "benchmark": benchmark_name,
+            "success": False,
+            "execution_time": execution_time,
+            "return_code": -1,
+            "stdout": "",
+            "stderr": f"Cancelled: {winner} decided the benchmark first" if winner else "Cancelled",
+            "result": {"status": "CANCELLED", "winner": winner}
+        }
+        record.update(self.empty_metrics())
+        return record
+    
+    def _create_error_result(self, benchmark_name, error_msg):
+        record = {
+            "tool": self.tool_name,
+            "benchmark": benchmark_name,
+            "success": False,
+            "execution_time": 0,
+            "return_code": -1,
+            "stdout": "",
+            "stderr": f"Error: {error_msg}",
+            "result": {"status": "ERROR"}
+        }
+        record.update(self.empty_metrics())
+        return record
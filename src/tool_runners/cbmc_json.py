@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+import json
+import re
+from pathlib import Path
+
+class CBMCJsonUIDecoder:
+    """Streaming decoder for the message array CBMC prints with --json-ui.
+
+    Text is fed in arbitrary chunks. The decoder walks the document with a
+    small resumable state machine and only hands the small leaves to
+    `json.JSONDecoder.raw_decode`: whole status messages, single property
+    fields and single counterexample steps. The document is never built as
+    one object tree. Traces up to `max_trace_bytes` stay with their
+    property; larger ones are streamed to `spill_dir` (or dropped when no
+    directory is given) step by step.
+    """
+
+    skip_pattern = re.compile(r"[\s,]*")
+    key_pattern = re.compile(r'"((?:[^"\\]|\\.)*)"\s*:\s*')
+    result_pattern = re.compile(r'\{\s*"result"\s*:\s*\[')
+
+    def __init__(self, max_trace_bytes=4096, spill_dir=None):
+        self.max_trace_bytes = max_trace_bytes
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.decoder = json.JSONDecoder()
+
+        self.buffer = ""
+        self.state = "start"
+        self.current = None     # property being decoded
+        self.trace = None       # trace of that property, while it is read
+
+        self.valid = False
+        self.complete = False
+        self.properties = []
+        self.messages = []
+        self.cprover_status = None
+        self.program = None
+
+    def feed(self, text):
+        """Consume the next chunk of CBMC output"""
+        if self.complete or self.state == "invalid" or not text:
+            return
+        self.buffer += text
+        pos = self._advance()
+        self.buffer = self.buffer[pos:]
+
+    def finish(self):
+        """Summary of everything decoded so far (safe to call repeatedly)"""
+        if self.trace is not None and self.trace["spill"] is not None:
+            self.trace["spill"].close()
+        failed = sum(1 for p in self.properties if p["status"] == "FAILURE")
+        passed = sum(1 for p in self.properties if p["status"] == "SUCCESS")
+        return {
+            "valid": self.valid,
+            "complete": self.complete,
+            "program": self.program,
+            "cprover_status": self.cprover_status,
+            "properties": self.properties,
+            "properties_total": len(self.properties),
+            "properties_failed": failed,
+            "properties_passed": passed,
+            "errors": [m.get("messageText") for m in self.messages if m.get("messageType") == "ERROR"],
+            "warnings": [m.get("messageText") for m in self.messages if m.get("messageType") == "WARNING"]
+        }
+
+    # ------------------------------------------------------------------
+    # State machine
+    # ------------------------------------------------------------------
+
+    def _advance(self):
+        """Decode as much of the buffer as possible; return the first unconsumed position"""
+        buffer = self.buffer
+        end = len(buffer)
+        pos = 0
+        while True:
+            pos = self.skip_pattern.match(buffer, pos).end()
+            if pos >= end:
+                return pos
+            char = buffer[pos]
+
+            if self.state == "start":
+                if char != "[":
+                    self.state = "invalid"
+                    return end
+                self.valid = True
+                self.state = "messages"
+                pos += 1
+
+            elif self.state == "messages":
+                if char == "]":
+                    self.complete = True
+                    return end
+                match = self.result_pattern.match(buffer, pos)
+                if match:
+                    # The result message is decoded property by property
+                    self.state = "properties"
+                    pos = match.end()
+                    continue
+                value, new_pos = self._decode(pos)
+                if value is None:
+                    return pos
+                self._emit_message(value)
+                pos = new_pos
+
+            elif self.state == "properties":
+                if char == "]":
+                    self.state = "result_tail"
+                    pos += 1
+                elif char == "{":
+                    self.current = {}
+                    self.state = "property"
+                    pos += 1
+                else:
+                    self.state = "invalid"
+                    return end
+
+            elif self.state == "result_tail":
+                if char != "}":
+                    self.state = "invalid"
+                    return end
+                self.state = "messages"
+                pos += 1
+
+            elif self.state == "property":
+                if char == "}":
+                    self._emit_property()
+                    self.state = "properties"
+                    pos += 1
+                    continue
+                match = self.key_pattern.match(buffer, pos)
+                if match is None:
+                    return pos
+                key = json.loads(f'"{match.group(1)}"')
+                if key == "trace" and buffer.startswith("[", match.end()):
+                    self._start_trace()
+                    self.state = "trace"
+                    pos = match.end() + 1
+                    continue
+                value, new_pos = self._decode(match.end())
+                if value is None:
+                    return pos
+                self.current[key] = value
+                pos = new_pos
+
+            elif self.state == "trace":
+                if char == "]":
+                    self._end_trace()
+                    self.state = "property"
+                    pos += 1
+                    continue
+                value, new_pos = self._decode(pos)
+                if value is None:
+                    return pos
+                self._add_step(value, buffer[pos:new_pos])
+                pos = new_pos
+
+            else:
+                return end
+
+    def _decode(self, pos):
+        """Decode one JSON value at pos, or (None, pos) if it is not complete yet"""
+        try:
+            return self.decoder.raw_decode(self.buffer, pos)
+        except json.JSONDecodeError:
+            return None, pos
+
+    # ------------------------------------------------------------------
+    # Records
+    # ------------------------------------------------------------------
+
+    def _emit_message(self, message):
+        if not isinstance(message, dict):
+            return
+        if "program" in message:
+            self.program = message["program"]
+        elif "cProverStatus" in message:
+            self.cprover_status = message["cProverStatus"]
+        elif "messageText" in message:
+            self.messages.append(message)
+
+    def _emit_property(self):
+        item = self.current
+        prop = {
+            "property": item.get("property"),
+            "class": self._property_class(item.get("property")),
+            "description": item.get("description"),
+            "status": item.get("status"),
+            "source_location": item.get("sourceLocation"),
+            "trace_length": 0,
+            "trace_bytes": 0
+        }
+
+        trace = item.get("_trace")
+        if trace is not None:
+            prop["trace_length"] = trace["steps"]
+            prop["trace_bytes"] = trace["bytes"]
+            last_step = trace["last_step"]
+            if prop["source_location"] is None and isinstance(last_step, dict) \
+                    and last_step.get("stepType") == "failure":
+                prop["source_location"] = last_step.get("sourceLocation")
+            if trace["spill_path"] is not None:
+                final_path = trace["spill_path"].with_name(f"{prop['property']}.json")
+                trace["spill_path"].replace(final_path)
+                prop["trace_file"] = str(final_path)
+            elif trace["bytes"] <= self.max_trace_bytes:
+                prop["trace"] = trace["steps_kept"]
+
+        self.properties.append(prop)
+        self.current = None
+
+    @staticmethod
+    def _property_class(property_id):
+        """`func.array_bounds.3` -> `array_bounds`"""
+        if not property_id:
+            return None
+        parts = property_id.split(".")
+        return parts[-2] if len(parts) >= 3 else parts[0]
+
+    # ------------------------------------------------------------------
+    # Traces
+    # ------------------------------------------------------------------
+
+    def _start_trace(self):
+        self.trace = {
+            "steps": 0,
+            "bytes": 0,
+            "steps_kept": [],
+            "texts_kept": [],
+            "last_step": None,
+            "spill": None,
+            "spill_path": None
+        }
+
+    def _add_step(self, step, text):
+        trace = self.trace
+        trace["steps"] += 1
+        trace["bytes"] += len(text)
+        trace["last_step"] = step
+
+        if trace["spill"] is None and trace["bytes"] <= self.max_trace_bytes:
+            trace["steps_kept"].append(step)
+            trace["texts_kept"].append(text)
+            return
+
+        if trace["spill"] is not None:
+            trace["spill"].write(",\n" + text)
+        elif self.spill_dir is not None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            trace["spill_path"] = self.spill_dir / f".trace_{len(self.properties)}.partial"
+            trace["spill"] = open(trace["spill_path"], "w")
+            trace["spill"].write("[\n" + ",\n".join(trace["texts_kept"] + [text]))
+        trace["steps_kept"] = []
+        trace["texts_kept"] = []
+
+    def _end_trace(self):
+        trace = self.trace
+        if trace["spill"] is not None:
+            trace["spill"].write("\n]\n")
+            trace["spill"].close()
+        trace["texts_kept"] = []
+        self.current["_trace"] = trace
+        self.trace = None
+
+
+def decode_json_ui(text, max_trace_bytes=4096, spill_dir=None):
+    """Decode a complete --json-ui output"""
+    decoder = CBMCJsonUIDecoder(max_trace_bytes=max_trace_bytes, spill_dir=spill_dir)
+    decoder.feed(text)
+    return decoder.finish()
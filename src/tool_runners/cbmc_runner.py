@@ -1,121 +1,315 @@
 #!/usr/bin/env python3
-import subprocess
+import asyncio
 import json
-import time
+import os
 import re
+import subprocess
+import time
 from pathlib import Path
+from src.tool_runners.async_exec import run_streaming
+from src.tool_runners.base_runner import BaseToolRunner
+from src.tool_runners.output_parsers import CBMCOutputParser
+from src.tool_runners.cbmc_json import CBMCJsonUIDecoder
 
-class CBMCRunner:
-    def __init__(self):
-        self.tool_name = "cbmc"
-        self.container = "cbmc"  # service name in docker-compose.yml
+# `[func.array_bounds.1] line 8 array 'buffer' upper bound in ...: FAILURE` (plain-text output)
+FAILED_PROPERTY_PATTERN = re.compile(r"^\[(\w+)\.([\w-]+)\.\d+\] line (\d+) .*: FAILURE$", re.MULTILINE)
+
+class CBMCRunner(BaseToolRunner):
+    tool_name = "cbmc"
+    container = "cbmc"  # service name in docker-compose.yml
+    required_flags = ["--json-ui"]
+    
+    def __init__(self, backend=None, raw_output=None, max_trace_bytes=4096, property_shards=1, **kwargs):
+        super().__init__(backend, raw_output, **kwargs)
+        # Counterexample traces larger than this are spilled to results/raw/traces/
+        self.max_trace_bytes = max_trace_bytes
+        # Parallel CBMC processes per benchmark, each checking a subset of the properties
+        self.property_shards = property_shards
+    
+    @classmethod
+    def config_options(cls, tool_config):
+        return {
+            "max_trace_bytes": tool_config.get("max_trace_bytes", 4096),
+            "property_shards": tool_config.get("property_shards", 1)
+        }
+    
+    def build_command(self, container_benchmark_path):
+        """CBMC command line for a benchmark"""
+        return ["cbmc", *self.command_flags(), container_benchmark_path]
+    
+    def shard_count(self):
+        """Number of property shards ("auto": one per core)"""
+        if self.property_shards == "auto":
+            return os.cpu_count() or 1
+        return max(1, int(self.property_shards or 1))
+    
+    def list_properties_command(self, container_benchmark_path):
+        """CBMC command line enumerating the properties of a benchmark"""
+        return ["cbmc", *self.command_flags(), "--show-properties", container_benchmark_path]
+    
+    def shard_command(self, container_benchmark_path, properties):
+        """CBMC command line checking only the given properties"""
+        selection = [arg for name in properties for arg in ("--property", name)]
+        return ["cbmc", *self.command_flags(), *selection, container_benchmark_path]
+    
+    @staticmethod
+    def listed_properties(stdout):
+        """Property names in the --json-ui output of --show-properties (empty if unreadable)"""
+        try:
+            messages = json.loads(stdout)
+        except ValueError:
+            return []
+        return [prop["name"] for message in messages if isinstance(message, dict)
+                for prop in message.get("properties", []) if "name" in prop]
+    
+    def split_properties(self, properties):
+        """Round-robin split, so that the dense parts of a file spread over the shards"""
+        count = min(self.shard_count(), len(properties))
+        return [properties[index::count] for index in range(count)] if count else []
     
     def run_verification(self, benchmark_path, output_dir):
-        """Run CBMC from host using Docker Compose"""
+        if self.shard_count() <= 1:
+            return super().run_verification(benchmark_path, output_dir)
+        
         benchmark_path = Path(benchmark_path).resolve()
-        output_dir = Path(output_dir).resolve()
-        container_benchmark_path = f"/workspace/{benchmark_path.relative_to(Path.cwd())}"
+        container_benchmark_path = self.backend.container_path(benchmark_path)
+        limits = self.limits()
+        try:
+            prepare_start = time.time()
+            self.backend.prepare(self.container)
+            prepare_time = time.time() - prepare_start
+            
+            start_time = time.time()
+            listing = self.backend.run(self.container, self.list_properties_command(container_benchmark_path),
+                                       timeout=self.timeout, limits=limits)
+            shards = self.split_properties(self.listed_properties(listing.stdout))
+            if len(shards) < 2:
+                return super().run_verification(benchmark_path, output_dir)
+            listing_time = time.time() - start_time
+            
+            outcomes = self.run_parallel([self.shard_command(container_benchmark_path, properties)
+                                          for properties in shards])
+            execution_time = time.time() - start_time
+            return self.merge_shards(benchmark_path.name, shards, outcomes, listing, listing_time,
+                                     execution_time, prepare_time, output_dir)
         
-        start_time = time.time()
-        cmd = [
-            "docker", "compose", "run", "--rm", "--platform", "linux/amd64",
-            self.container,
-            "--json-ui", container_benchmark_path
-        ]
+        except subprocess.TimeoutExpired:
+            return self._create_timeout_result(benchmark_path.name)
+        except Exception as e:
+            return self._create_error_result(benchmark_path.name, str(e))
+    
+    async def run_verification_async(self, benchmark_path, output_dir, on_line=None):
+        if self.shard_count() <= 1:
+            return await super().run_verification_async(benchmark_path, output_dir, on_line)
         
+        benchmark_path = Path(benchmark_path).resolve()
+        container_benchmark_path = self.backend.container_path(benchmark_path)
+        limits = self.limits()
+        env = self.backend.command_env(limits)
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300
+            loop = asyncio.get_running_loop()
+            prepare_start = time.time()
+            await loop.run_in_executor(None, self.backend.prepare, self.container)
+            prepare_time = time.time() - prepare_start
+            
+            start_time = time.time()
+            listing = await run_streaming(
+                self.backend.build_command(self.container, self.list_properties_command(container_benchmark_path),
+                                           self.timeout, limits),
+                self.timeout, env=env
             )
+            shards = self.split_properties(self.listed_properties(listing.stdout))
+            if len(shards) < 2:
+                return await super().run_verification_async(benchmark_path, output_dir, on_line)
+            listing_time = time.time() - start_time
             
+            outcomes = await self.run_parallel_async([self.shard_command(container_benchmark_path, properties)
+                                                      for properties in shards])
             execution_time = time.time() - start_time
-            analysis_result = self.parse_output(result)
-            
-            return {
-                "tool": self.tool_name,
-                "benchmark": benchmark_path.name,
-                "success": result.returncode == 0 or "VERIFICATION FAILED" in result.stdout,
-                "execution_time": execution_time,
-                "return_code": result.returncode,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "result": analysis_result,
-                "bugs_detected": self.count_bugs_detected(result.stdout),
-                "properties_verified": self.count_properties_verified(result.stdout)
-            }
-            
+            return self.merge_shards(benchmark_path.name, shards, outcomes, listing, listing_time,
+                                     execution_time, prepare_time, output_dir)
+        
         except subprocess.TimeoutExpired:
             return self._create_timeout_result(benchmark_path.name)
         except Exception as e:
             return self._create_error_result(benchmark_path.name, str(e))
     
-    def _create_timeout_result(self, benchmark_name):
-        return {
-            "tool": self.tool_name,
-            "benchmark": benchmark_name,
-            "success": False,
-            "execution_time": 300,
-            "return_code": -1,
-            "stdout": "",
-            "stderr": "Timeout after 300 seconds",
-            "result": {"status": "TIMEOUT"},
-            "bugs_detected": 0,
-            "properties_verified": 0
+    def merge_shards(self, benchmark_name, shards, outcomes, listing, listing_time, execution_time,
+                     prepare_time, output_dir):
+        """One result record from the runs of every shard, with per-shard timings.
+
+        The merged run is UNSAFE as soon as one shard finds a failing
+        property, SAFE when every shard succeeds, and TIMEOUT when a shard
+        ran out of time without any failure found elsewhere.
+        """
+        listing_usage = self.resource_usage(listing, listing_time, prepare_time)
+        shard_records = []
+        parsed_shards = []
+        finished = []
+        timed_out = 0
+        for index, (properties, (result, elapsed)) in enumerate(zip(shards, outcomes)):
+            entry = {"shard": index, "properties": len(properties), "execution_time": elapsed}
+            if result is None or self.limit_exceeded(result, elapsed) == "TIMEOUT":
+                timed_out += 1
+                entry.update(status="TIMEOUT", return_code=-1)
+                shard_records.append(entry)
+                continue
+            usage = self.resource_usage(result, elapsed, 0.0)
+            parsed = self.create_parser(benchmark_name, output_dir).parse(result.stdout)
+            entry.update(
+                status=self.parse_output(result, parsed)["status"],
+                return_code=result.returncode,
+                tool_wall_time=usage["tool_wall_time"],
+                cpu_user_time=usage["cpu_user_time"],
+                peak_memory_mb=usage["peak_memory_mb"]
+            )
+            shard_records.append(entry)
+            parsed_shards.append(parsed)
+            finished.append((result, usage))
+        
+        merged = self.merge_parsed(parsed_shards, complete=not timed_out)
+        returncodes = [result.returncode for result, _ in finished]
+        merged_result = subprocess.CompletedProcess(
+            listing.args,
+            # CBMC exits with 10 when a property fails
+            10 if 10 in returncodes else next((code for code in returncodes if code), 0 if not timed_out else -1),
+            "".join(result.stdout for result, _ in finished),
+            "".join(result.stderr for result, _ in finished)
+        )
+        resources = self.combine_usage([usage for _, usage in finished], execution_time,
+                                       listing_usage["container_prepare_time"], sequential=[listing_usage])
+        record = self._create_result(benchmark_name, merged_result, execution_time, merged, output_dir, resources)
+        if timed_out and record["result"].get("status") != "UNSAFE":
+            record["success"] = False
+            record["result"] = {"status": "TIMEOUT", "timeout_seconds": self.timeout, "shards_timed_out": timed_out}
+        record["property_listing_time"] = listing_time
+        record["shards"] = shard_records
+        return record
+    
+    @staticmethod
+    def merge_parsed(parsed_shards, complete=True):
+        """Parser summaries of several shards combined into one"""
+        merged = {}
+        for parsed in parsed_shards:
+            for key, value in parsed.items():
+                if key == "json_ui":
+                    continue
+                if isinstance(value, bool):
+                    merged[key] = merged.get(key, False) or value
+                else:
+                    merged[key] = merged.get(key, 0) + value
+        
+        decoded = [parsed["json_ui"] for parsed in parsed_shards if parsed.get("json_ui")]
+        properties = [prop for json_ui in decoded for prop in json_ui["properties"]]
+        statuses = [json_ui["cprover_status"] for json_ui in decoded]
+        cprover_status = None
+        if "failure" in statuses:
+            cprover_status = "failure"
+        elif complete and statuses and all(status == "success" for status in statuses):
+            cprover_status = "success"
+        merged["json_ui"] = {
+            "valid": bool(decoded) and all(json_ui["valid"] for json_ui in decoded),
+            "complete": complete and all(json_ui["complete"] for json_ui in decoded),
+            "program": decoded[0]["program"] if decoded else None,
+            "cprover_status": cprover_status,
+            "properties": properties,
+            "properties_total": len(properties),
+            "properties_failed": sum(1 for p in properties if p["status"] == "FAILURE"),
+            "properties_passed": sum(1 for p in properties if p["status"] == "SUCCESS"),
+            "errors": [error for json_ui in decoded for error in json_ui["errors"]],
+            "warnings": [warning for json_ui in decoded for warning in json_ui["warnings"]]
         }
+        return merged
+    
+    def is_success(self, result):
+        # CBMC exits with 10 when a property fails, which is a verdict rather than a failed run
+        return result.returncode in (0, 10) or "VERIFICATION FAILED" in result.stdout
     
-    def _create_error_result(self, benchmark_name, error_msg):
+    def create_parser(self, benchmark_name=None, output_dir=None):
+        spill_dir = None
+        if benchmark_name and output_dir:
+            spill_dir = Path(output_dir) / "traces" / Path(benchmark_name).stem
+        return CBMCOutputParser(CBMCJsonUIDecoder(self.max_trace_bytes, spill_dir))
+    
+    def metric_fields(self):
+        return ("bugs_detected", "properties_verified")
+    
+    def empty_metrics(self):
         return {
-            "tool": self.tool_name,
-            "benchmark": benchmark_name,
-            "success": False,
-            "execution_time": 0,
-            "return_code": -1,
-            "stdout": "",
-            "stderr": f"Error: {error_msg}",
-            "result": {"status": "ERROR"},
             "bugs_detected": 0,
             "properties_verified": 0
         }
     
-    def parse_output(self, result):
-        """Parse CBMC JSON output"""
-        try:
-            if result.stdout.strip():
-                return json.loads(result.stdout)
-        except:
-            pass
+    def parse_output(self, result, parsed=None):
+        """Parse CBMC JSON output into a compact per-property table"""
+        if parsed is None:
+            parsed = self.create_parser().parse(result.stdout)
+        
+        json_ui = parsed.get("json_ui")
+        if json_ui and json_ui["valid"] and (json_ui["properties"] or json_ui["cprover_status"]):
+            return self.summarize_properties(json_ui)
         
         # Fallback to text parsing
-        output = result.stdout + result.stderr
+        parsed_stderr = self.create_parser().parse(result.stderr)
         
         analysis_result = {
             "status": "UNKNOWN",
-            "verification_failed": "VERIFICATION FAILED" in output,
-            "verification_successful": "VERIFICATION SUCCESSFUL" in output,
-            "errors_found": len(re.findall(r"error|violation", output, re.IGNORECASE)),
-            "warnings": len(re.findall(r"warning", output, re.IGNORECASE))
+            "verification_failed": parsed["verification_failed"] or parsed_stderr["verification_failed"],
+            "verification_successful": parsed["verification_successful"] or parsed_stderr["verification_successful"],
+            "errors_found": parsed["errors_found"] + parsed_stderr["errors_found"],
+            "warnings": parsed["warnings"] + parsed_stderr["warnings"]
         }
         
-        if "VERIFICATION SUCCESSFUL" in output:
+        if analysis_result["verification_successful"]:
             analysis_result["status"] = "SAFE"
-        elif "VERIFICATION FAILED" in output:
+        elif analysis_result["verification_failed"]:
             analysis_result["status"] = "UNSAFE"
         
         return analysis_result
     
+    def summarize_properties(self, json_ui):
+        """Result record for a decoded --json-ui run"""
+        status = "UNKNOWN"
+        if json_ui["cprover_status"] == "failure" or json_ui["properties_failed"]:
+            status = "UNSAFE"
+        elif json_ui["cprover_status"] == "success" or (
+                json_ui["properties_total"] and json_ui["properties_passed"] == json_ui["properties_total"]):
+            status = "SAFE"
+        
+        return {
+            "status": status,
+            "cprover_status": json_ui["cprover_status"],
+            "properties_total": json_ui["properties_total"],
+            "properties_failed": json_ui["properties_failed"],
+            "properties_passed": json_ui["properties_passed"],
+            "properties": json_ui["properties"],
+            "errors": json_ui["errors"],
+            "warnings": json_ui["warnings"]
+        }
+    
+    def findings(self, result, analysis):
+        """Failed properties, located by their source location"""
+        if "properties" not in analysis:
+            return [{"file": None, "function": function, "line": int(line), "category": property_class}
+                    for function, property_class, line in FAILED_PROPERTY_PATTERN.findall(result.stdout or "")]
+        findings = []
+        for prop in analysis["properties"]:
+            if prop["status"] != "FAILURE":
+                continue
+            location = prop.get("source_location") or {}
+            line = location.get("line")
+            findings.append({
+                "file": Path(location["file"]).name if location.get("file") else None,
+                "function": location.get("function"),
+                "line": int(line) if line is not None else None,
+                "category": prop["class"]
+            })
+        return findings
+    
     def count_bugs_detected(self, output):
         """Count number of bugs detected in output"""
-        bugs = 0
-        bugs += len(re.findall(r"VERIFICATION FAILED", output))
-        bugs += len(re.findall(r"array.*out of bounds", output, re.IGNORECASE))
-        bugs += len(re.findall(r"pointer.*outside", output, re.IGNORECASE))
-        bugs += len(re.findall(r"division by zero", output, re.IGNORECASE))
-        bugs += len(re.findall(r"arithmetic overflow", output, re.IGNORECASE))
-        return bugs
+        return self.create_parser().parse(output)["bugs_detected"]
     
     def count_properties_verified(self, output):
         """Count number of properties verified"""
-        return len(re.findall(r"VERIFICATION SUCCESSFUL", output))
\ No newline at end of file
+        return self.create_parser().parse(output)["properties_verified"]
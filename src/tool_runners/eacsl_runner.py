@@ -1,107 +1,47 @@
 #!/usr/bin/env python3
-import subprocess
-import time
-import re
-from pathlib import Path
+from src.tool_runners.base_runner import BaseToolRunner
+from src.tool_runners.output_parsers import EACSLOutputParser
 
-class EACSLRunner:
-    def __init__(self):
-        self.tool_name = "eacsl"
-        self.container = "framac"  # Docker Compose service name
+class EACSLRunner(BaseToolRunner):
+    tool_name = "eacsl"
+    container = "framac"  # Docker Compose service name
+    required_flags = ["-e-acsl"]
     
-    def run_verification(self, benchmark_path, output_dir):
-        """Run E-ACSL from host using Docker Compose"""
-        benchmark_path = Path(benchmark_path).resolve()
-        output_dir = Path(output_dir).resolve()
-        container_benchmark_path = f"/workspace/{benchmark_path.relative_to(Path.cwd())}"
+    def build_command(self, container_benchmark_path):
+        """E-ACSL command line for a benchmark"""
+        return ["frama-c", *self.command_flags(), container_benchmark_path]
     
-        start_time = time.time()
-        
-        # Run E-ACSL
-        cmd = [
-            "docker", "compose", "run", "--rm",
-            self.container,
-            "frama-c", "-e-acsl", container_benchmark_path
-        ]
-
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-            
-            execution_time = time.time() - start_time
-            analysis_result = self.parse_output(result)
-            
-            instrumented_success = result.returncode == 0
-            
-            return {
-                "tool": self.tool_name,
-                "benchmark": benchmark_path.name,
-                "success": instrumented_success,
-                "execution_time": execution_time,
-                "return_code": result.returncode,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "result": analysis_result,
-                "runtime_checks_inserted": self.count_runtime_checks(result.stdout),
-                "instrumentation_success": instrumented_success
-            }
-            
-        except subprocess.TimeoutExpired:
-            return self._create_timeout_result(benchmark_path.name)
-        except Exception as e:
-            return self._create_error_result(benchmark_path.name, str(e))
+    def create_parser(self, benchmark_name=None, output_dir=None):
+        return EACSLOutputParser()
     
-    def _create_timeout_result(self, benchmark_name):
-        return {
-            "tool": self.tool_name,
-            "benchmark": benchmark_name,
-            "success": False,
-            "execution_time": 300,
-            "return_code": -1,
-            "stdout": "",
-            "stderr": "Timeout after 300 seconds",
-            "result": {"status": "TIMEOUT"},
-            "runtime_checks_inserted": 0,
-            "instrumentation_success": False
-        }
+    def metric_fields(self):
+        return ("runtime_checks_inserted",)
+    
+    def collect_metrics(self, result, parsed):
+        metrics = super().collect_metrics(result, parsed)
+        metrics["instrumentation_success"] = result.returncode == 0
+        return metrics
     
-    def _create_error_result(self, benchmark_name, error_msg):
+    def empty_metrics(self):
         return {
-            "tool": self.tool_name,
-            "benchmark": benchmark_name,
-            "success": False,
-            "execution_time": 0,
-            "return_code": -1,
-            "stdout": "",
-            "stderr": f"Error: {error_msg}",
-            "result": {"status": "ERROR"},
             "runtime_checks_inserted": 0,
             "instrumentation_success": False
         }
     
     def count_runtime_checks(self, output):
         """Count number of runtime checks inserted"""
-        return len(re.findall(r"assertion|check|instrumented", output, re.IGNORECASE))
+        return self.create_parser().parse(output)["runtime_checks_inserted"]
     
-    def parse_output(self, result):
+    def parse_output(self, result, parsed=None):
         """Parse E-ACSL output"""
-        output = result.stdout
+        if parsed is None:
+            parsed = self.create_parser().parse(result.stdout)
         
         return {
             "status": "COMPLETED",
-            "instrumentation_details": self.extract_instrumentation_details(output)
+            "instrumentation_details": parsed["instrumentation_details"]
         }
     
     def extract_instrumentation_details(self, output):
         """Extract instrumentation details from output"""
-        details = {}
-        for line in output.splitlines():
-            if 'instrumented' in line.lower():
-                details['instrumentation_line'] = line.strip()
-            if 'assertion' in line.lower():
-                details['assertions_found'] = line.strip()
-        return details
\ No newline at end of file
+        return self.create_parser().parse(output)["instrumentation_details"]
@@ -1,209 +1,306 @@
 #!/usr/bin/env python3
+import asyncio
+import os
+import re
 import subprocess
 import time
-import re
 from pathlib import Path
+from src.tool_runners.base_runner import BaseToolRunner
+from src.tool_runners.output_parsers import FramaCValueOutputParser, FramaCWPOutputParser
 
-class FramaCValueRunner:
-    def __init__(self):
-        self.tool_name = "framac_value"
-        self.container = "framac"
+class FramaCValueRunner(BaseToolRunner):
+    tool_name = "framac_value"
+    container = "framac"
+    required_flags = ["-eva"]
+    default_flags = ["-metrics"]
     
-    def run_verification(self, benchmark_path, output_dir):
-        """Run Frama-C Value Analysis on a benchmark"""
-        benchmark_path = Path(benchmark_path).resolve()
-        container_benchmark_path = f"/workspace/{benchmark_path.relative_to(Path.cwd())}"
-        start_time = time.time()
-        
-        # Run Frama-C
-        cmd = [
-            "docker", "compose", "run", "--rm",
-            self.container,
-            "frama-c", "-val", "-metrics", container_benchmark_path
-        ]
-
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-            
-            execution_time = time.time() - start_time
-            analysis_result = self.parse_output(result)
-            
-            return {
-                "tool": self.tool_name,
-                "benchmark": benchmark_path.name,
-                "success": result.returncode == 0,
-                "execution_time": execution_time,
-                "return_code": result.returncode,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "result": analysis_result,
-                "alarms_generated": self.count_alarms(result.stdout),
-                "proofs_established": self.count_proofs(result.stdout)
-            }
-            
-        except subprocess.TimeoutExpired:
-            return self._create_timeout_result(benchmark_path.name)
-        except Exception as e:
-            return self._create_error_result(benchmark_path.name, str(e))
+    def build_command(self, container_benchmark_path):
+        """Frama-C Value Analysis command line for a benchmark"""
+        return ["frama-c", *self.command_flags(), container_benchmark_path]
     
-    def _create_timeout_result(self, benchmark_name):
-        return {
-            "tool": self.tool_name,
-            "benchmark": benchmark_name,
-            "success": False,
-            "execution_time": 300,
-            "return_code": -1,
-            "stdout": "",
-            "stderr": "Timeout after 300 seconds",
-            "result": {"status": "TIMEOUT"},
-            "alarms_generated": 0,
-            "proofs_established": 0
-        }
+    def create_parser(self, benchmark_name=None, output_dir=None):
+        return FramaCValueOutputParser()
     
-    def _create_error_result(self, benchmark_name, error_msg):
+    def metric_fields(self):
+        return ("alarms_generated", "proofs_established")
+    
+    def empty_metrics(self):
         return {
-            "tool": self.tool_name,
-            "benchmark": benchmark_name,
-            "success": False,
-            "execution_time": 0,
-            "return_code": -1,
-            "stdout": "",
-            "stderr": f"Error: {error_msg}",
-            "result": {"status": "ERROR"},
             "alarms_generated": 0,
             "proofs_established": 0
         }
     
-    def parse_output(self, result):
+    def parse_output(self, result, parsed=None):
         """Parse Frama-C Value Analysis output"""
-        output = result.stdout
+        if parsed is None:
+            parsed = self.create_parser().parse(result.stdout)
         
         return {
             "status": "COMPLETED",
-            "alarms": self.extract_alarms(output),
-            "metrics": self.extract_metrics(output)
+            "alarms": parsed["alarms"],
+            "metrics": parsed["metrics"]
         }
     
+    def findings(self, result, analysis):
+        """The alarms that carry a location"""
+        return self.located_findings("\n".join(analysis["alarms"]), ("alarm", "assert"))
+    
     def count_alarms(self, output):
         """Count number of alarms generated"""
-        return len(re.findall(r"assertion|alarm", output, re.IGNORECASE))
+        return self.create_parser().parse(output)["alarms_generated"]
     
     def count_proofs(self, output):
         """Count number of proofs established"""
-        return len(re.findall(r"valid", output, re.IGNORECASE))
+        return self.create_parser().parse(output)["proofs_established"]
     
     def extract_alarms(self, output):
         """Extract detailed alarm information"""
-        alarms = []
-        for line in output.split('\n'):
-            if 'assertion' in line.lower() or 'alarm' in line.lower():
-                alarms.append(line.strip())
-        return alarms
+        return self.create_parser().parse(output)["alarms"]
     
     def extract_metrics(self, output):
         """Extract metrics from Frama-C output"""
-        metrics = {}
-        for line in output.split('\n'):
-            if ':' in line and any(term in line.lower() for term in ['time', 'memory', 'proof']):
-                parts = line.split(':', 1)
-                if len(parts) == 2:
-                    metrics[parts[0].strip()] = parts[1].strip()
-        return metrics
+        return self.create_parser().parse(output)["metrics"]
 
-class FramaCWPRunner:
-    def __init__(self):
-        self.tool_name = "framac_wp"
-        self.container = "framac"
+# Function definitions in a C file: return type and name at the start of a line,
+# a parameter list, then the opening brace of the body
+FUNCTION_DEFINITION = re.compile(
+    r"^[ \t]*(?:[A-Za-z_][\w]*[ \t\*]+)+?\**[ \t]*([A-Za-z_]\w*)[ \t]*\([^;{}]*\)[ \t\n]*\{",
+    re.MULTILINE
+)
+C_KEYWORDS = {"if", "for", "while", "switch", "return", "sizeof", "do", "else"}
+
+# Goal verdicts: `Goal typed_f_assert_rte_... : Timeout` (Frama-C < 26) and `[Timeout] typed_f_...`
+GOAL_STATUS_PATTERN = re.compile(
+    r"Goal (?P<goal>typed_\w+)\s*:\s*(?P<status>\w+)"
+    r"|\[(?P<tag>Valid|Failed|Timeout|Unknown|Stepout)\]\s+(?:Goal\s+)?(?P<tagged_goal>typed_\w+)"
+)
+
+class FramaCWPRunner(BaseToolRunner):
+    tool_name = "framac_wp"
+    container = "framac"
+    required_flags = ["-wp"]
+    default_flags = ["-wp-rte"]
+    
+    def __init__(self, backend=None, raw_output=None, split_functions=False, max_parallel="auto", wp_par=None,
+                 **kwargs):
+        super().__init__(backend, raw_output, **kwargs)
+        # Prove each function in its own Frama-C process (-wp-fct), several side by side
+        self.split_functions = split_functions
+        # Concurrent per-function processes ("auto": one per core of the machine)
+        self.max_parallel = max_parallel
+        # Prover processes of each Frama-C run (-wp-par; "auto": the cores left per process)
+        self.wp_par = wp_par
+        if self.split_functions and self.parallel_count() < 2:
+            print(f"⚠️  {self.__class__.__name__}: wp_split_functions has no effect with "
+                  f"{self.parallel_count()} per-function process at a time (wp_max_parallel: {self.max_parallel})")
+    
+    @classmethod
+    def config_options(cls, tool_config):
+        return {
+            "split_functions": tool_config.get("wp_split_functions", False),
+            "max_parallel": tool_config.get("wp_max_parallel", "auto"),
+            "wp_par": tool_config.get("wp_par")
+        }
+    
+    def build_command(self, container_benchmark_path):
+        """Frama-C WP command line for a benchmark"""
+        return ["frama-c", *self.command_flags(), container_benchmark_path]
+    
+    def function_command(self, container_benchmark_path, function, processes=1):
+        """Command line proving the goals of one function"""
+        return ["frama-c", *self.command_flags(processes), "-wp-fct", function, container_benchmark_path]
+    
+    def command_flags(self, processes=1):
+        flags = super().command_flags()
+        prover_processes = self.prover_processes(processes)
+        if prover_processes and "-wp-par" not in flags:
+            flags += ["-wp-par", str(prover_processes)]
+        return flags
+    
+    @staticmethod
+    def cores():
+        """Cores of the machine, shared by the per-function processes"""
+        return os.cpu_count() or 1
+    
+    def parallel_count(self):
+        """Number of per-function processes run side by side.
+
+        Each process gets a container of its own, so `cpus` (the limit of one
+        container) does not bound how many run at once.
+        """
+        if self.max_parallel == "auto":
+            return self.cores()
+        return max(1, int(self.max_parallel or 1))
+    
+    def prover_processes(self, processes=1):
+        """-wp-par value when `processes` Frama-C runs share the machine (None: Frama-C's default);
+        "auto" gives each run its share of the cores, at most its `cpus` limit"""
+        if self.wp_par == "auto":
+            share = max(1, self.cores() // processes)
+            return min(share, max(1, int(self.cpus))) if self.cpus else share
+        return int(self.wp_par) if self.wp_par else None
+    
+    @staticmethod
+    def defined_functions(source):
+        """Names of the functions defined in a C source, in order"""
+        # Comments could hide or fake definitions
+        source = re.sub(r"/\*.*?\*/|//[^\n]*", "", source, flags=re.DOTALL)
+        names = []
+        for match in FUNCTION_DEFINITION.finditer(source):
+            name = match.group(1)
+            if name not in C_KEYWORDS and name not in names:
+                names.append(name)
+        return names
     
     def run_verification(self, benchmark_path, output_dir):
-        """Run Frama-C WP on a benchmark"""
-        benchmark_path = Path(benchmark_path).resolve()
-        container_benchmark_path = f"/workspace/{benchmark_path.relative_to(Path.cwd())}"
-        start_time = time.time()
+        functions = self.functions_to_split(benchmark_path)
+        if functions is None:
+            return super().run_verification(benchmark_path, output_dir)
         
-        # Run Frama-C WP
-        cmd = [
-            "docker", "compose", "run", "--rm",
-            self.container,
-            "frama-c", "-wp", "-wp-rte", container_benchmark_path
-        ]
-
+        benchmark_path = Path(benchmark_path).resolve()
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
+            prepare_start = time.time()
+            self.backend.prepare(self.container)
+            prepare_time = time.time() - prepare_start
             
+            start_time = time.time()
+            outcomes = self.run_parallel(self.function_commands(benchmark_path, functions), self.parallel_count())
             execution_time = time.time() - start_time
-            analysis_result = self.parse_output(result)
-            
-            return {
-                "tool": self.tool_name,
-                "benchmark": benchmark_path.name,
-                "success": result.returncode == 0,
-                "execution_time": execution_time,
-                "return_code": result.returncode,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "result": analysis_result,
-                "goals_proven": self.count_proven_goals(result.stdout),
-                "goals_failed": self.count_failed_goals(result.stdout)
-            }
+            return self.merge_functions(benchmark_path.name, functions, outcomes, execution_time, prepare_time,
+                                        output_dir)
+        
+        except Exception as e:
+            return self._create_error_result(benchmark_path.name, str(e))
+    
+    async def run_verification_async(self, benchmark_path, output_dir, on_line=None):
+        functions = self.functions_to_split(benchmark_path)
+        if functions is None:
+            return await super().run_verification_async(benchmark_path, output_dir, on_line)
+        
+        benchmark_path = Path(benchmark_path).resolve()
+        try:
+            loop = asyncio.get_running_loop()
+            prepare_start = time.time()
+            await loop.run_in_executor(None, self.backend.prepare, self.container)
+            prepare_time = time.time() - prepare_start
             
-        except subprocess.TimeoutExpired:
-            return self._create_timeout_result(benchmark_path.name)
+            start_time = time.time()
+            outcomes = await self.run_parallel_async(self.function_commands(benchmark_path, functions),
+                                                     self.parallel_count())
+            execution_time = time.time() - start_time
+            return self.merge_functions(benchmark_path.name, functions, outcomes, execution_time, prepare_time,
+                                        output_dir)
+        
         except Exception as e:
             return self._create_error_result(benchmark_path.name, str(e))
     
-    def _create_timeout_result(self, benchmark_name):
-        return {
-            "tool": self.tool_name,
-            "benchmark": benchmark_name,
-            "success": False,
-            "execution_time": 300,
-            "return_code": -1,
-            "stdout": "",
-            "stderr": "Timeout after 300 seconds",
-            "result": {"status": "TIMEOUT"},
-            "goals_proven": 0,
-            "goals_failed": 0
+    def functions_to_split(self, benchmark_path):
+        """Functions to prove separately, or None for a single whole-file run"""
+        if not self.split_functions or self.parallel_count() < 2:
+            return None
+        try:
+            functions = self.defined_functions(Path(benchmark_path).read_text(errors="replace"))
+        except OSError:
+            return None
+        return functions if len(functions) > 1 else None
+    
+    def function_commands(self, benchmark_path, functions):
+        container_benchmark_path = self.backend.container_path(benchmark_path)
+        processes = min(self.parallel_count(), len(functions))
+        return [self.function_command(container_benchmark_path, function, processes) for function in functions]
+    
+    def merge_functions(self, benchmark_name, functions, outcomes, execution_time, prepare_time, output_dir):
+        """One result record from the per-function runs, with a per-function breakdown.
+
+        Goal counts are summed; the run is a TIMEOUT when any function ran
+        out of time (the goals of the other functions are kept).
+        """
+        breakdown = {}
+        parsed_functions = []
+        finished = []
+        timed_out = []
+        for function, (result, elapsed) in zip(functions, outcomes):
+            entry = {"execution_time": elapsed}
+            if result is None or self.limit_exceeded(result, elapsed) == "TIMEOUT":
+                timed_out.append(function)
+                entry.update(status="TIMEOUT", return_code=-1, goals_proven=0, goals_failed=0)
+                breakdown[function] = entry
+                continue
+            usage = self.resource_usage(result, elapsed, 0.0)
+            parsed = self.create_parser(benchmark_name, output_dir).parse(result.stdout)
+            entry.update(
+                status="COMPLETED",
+                return_code=result.returncode,
+                goals_proven=parsed["goals_proven"],
+                goals_failed=parsed["goals_failed"],
+                tool_wall_time=usage["tool_wall_time"],
+                cpu_user_time=usage["cpu_user_time"],
+                peak_memory_mb=usage["peak_memory_mb"]
+            )
+            breakdown[function] = entry
+            parsed_functions.append(parsed)
+            finished.append((result, usage))
+        
+        merged = {
+            "goals_proven": sum(parsed["goals_proven"] for parsed in parsed_functions),
+            "goals_failed": sum(parsed["goals_failed"] for parsed in parsed_functions)
         }
+        returncodes = [result.returncode for result, _ in finished]
+        merged_result = subprocess.CompletedProcess(
+            ["frama-c", *self.command_flags(), "-wp-fct", ",".join(functions)],
+            next((code for code in returncodes if code), 0 if not timed_out else -1),
+            "".join(result.stdout for result, _ in finished),
+            "".join(result.stderr for result, _ in finished)
+        )
+        resources = self.combine_usage([usage for _, usage in finished], execution_time, prepare_time)
+        record = self._create_result(benchmark_name, merged_result, execution_time, merged, output_dir, resources)
+        if timed_out:
+            record["success"] = False
+            record["result"]["status"] = "TIMEOUT"
+            record["result"]["timeout_seconds"] = self.timeout
+            record["result"]["functions_timed_out"] = timed_out
+        record["result"]["functions"] = breakdown
+        return record
+    
+    def create_parser(self, benchmark_name=None, output_dir=None):
+        return FramaCWPOutputParser()
     
-    def _create_error_result(self, benchmark_name, error_msg):
+    def metric_fields(self):
+        return ("goals_proven", "goals_failed")
+    
+    def empty_metrics(self):
         return {
-            "tool": self.tool_name,
-            "benchmark": benchmark_name,
-            "success": False,
-            "execution_time": 0,
-            "return_code": -1,
-            "stdout": "",
-            "stderr": f"Error: {error_msg}",
-            "result": {"status": "ERROR"},
             "goals_proven": 0,
             "goals_failed": 0
         }
     
+    def findings(self, result, analysis):
+        """Goals that were not proved, by name (`typed_<function>_...`: the function is resolved
+        against the benchmark's functions when scoring)"""
+        findings = []
+        for match in GOAL_STATUS_PATTERN.finditer(result.stdout or ""):
+            goal = match.group("goal") or match.group("tagged_goal")
+            status = match.group("status") or match.group("tag")
+            if status.lower() not in ("valid", "proved"):
+                findings.append({"file": None, "function": None, "line": None, "category": status.lower(),
+                                 "goal": goal})
+        return findings
+    
     def count_proven_goals(self, output):
         """Count number of proven goals"""
-        return len(re.findall(r"Proved", output, re.IGNORECASE))
+        return self.create_parser().parse(output)["goals_proven"]
     
     def count_failed_goals(self, output):
         """Count number of failed goals"""
-        return len(re.findall(r"Failed", output, re.IGNORECASE))
+        return self.create_parser().parse(output)["goals_failed"]
     
-    def parse_output(self, result):
+    def parse_output(self, result, parsed=None):
         """Parse Frama-C WP output"""
-        output = result.stdout
+        if parsed is None:
+            parsed = self.create_parser().parse(result.stdout)
         
         return {
             "status": "COMPLETED",
-            "goals_proven": self.count_proven_goals(output),
-            "goals_failed": self.count_failed_goals(output)
-        }
\ No newline at end of file
+            "goals_proven": parsed["goals_proven"],
+            "goals_failed": parsed["goals_failed"]
+        }
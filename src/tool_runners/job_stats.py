@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Run a command and report its wall time, CPU time and peak RSS on stderr.
+
+Used by the local backend; containers use GNU time with the same output format.
+Usage: python job_stats.py <command> [args...]
+"""
+import os
+import sys
+import time
+
+STATS_MARKER = "@@job-stats"
+# GNU time -f format producing the same line as this script
+GNU_TIME = "/usr/bin/time"
+GNU_TIME_FORMAT = f"{STATS_MARKER} wall=%e user=%U sys=%S maxrss_kb=%M"
+# Lines GNU time adds in front of the statistics when the command fails
+GNU_TIME_NOTICES = ("Command exited with non-zero status", "Command terminated by signal")
+
+def parse_job_stats(stderr):
+    """Split the statistics line off a job's stderr; return (stats or None, remaining stderr)"""
+    if not stderr or STATS_MARKER not in stderr:
+        return None, stderr
+
+    stats = None
+    kept = []
+    for line in stderr.splitlines(True):
+        if line.startswith(STATS_MARKER):
+            fields = dict(item.split("=", 1) for item in line.split()[1:] if "=" in item)
+            try:
+                stats = {
+                    "tool_wall_time": float(fields["wall"]),
+                    "cpu_user_time": float(fields["user"]),
+                    "cpu_system_time": float(fields["sys"]),
+                    "peak_memory_mb": int(fields["maxrss_kb"]) / 1024
+                }
+            except (KeyError, ValueError):
+                kept.append(line)
+        elif not line.startswith(GNU_TIME_NOTICES):
+            kept.append(line)
+    return stats, "".join(kept)
+
+def main(argv):
+    start = time.monotonic()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.execvp(argv[0], argv)
+        except OSError as e:
+            sys.stderr.write(f"{argv[0]}: {e}\n")
+            os._exit(127)
+
+    _, status, usage = os.wait4(pid, 0)
+    wall = time.monotonic() - start
+    sys.stderr.write(
+        f"{STATS_MARKER} wall={wall:.2f} user={usage.ru_utime:.2f} "
+        f"sys={usage.ru_stime:.2f} maxrss_kb={usage.ru_maxrss}\n"
+    )
+    # Same exit status convention as GNU time
+    if os.WIFSIGNALED(status):
+        return 128 + os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
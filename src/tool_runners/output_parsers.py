@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+import re
+
+class OutputParser:
+    """Single-pass parser for tool output.
+
+    The output is case-folded once; every counter and detail is then taken
+    from that copy with case-sensitive C-level searches (`str.count`,
+    `str.rfind`, compiled patterns without IGNORECASE), which is several
+    times faster than the per-counter `re.IGNORECASE` scans it replaces.
+    Only lines that actually contain a keyword are sliced out in Python.
+
+    `scan` works on any chunk of complete lines and `merge` folds chunk
+    results together, so streamed output (`feed`) and whole-text parsing
+    (`parse`) give identical results.
+    """
+
+    # Streamed lines are scanned in batches of roughly this many characters
+    feed_batch_size = 64 * 1024
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.state = self.empty()
+        self.pending = []
+        self.pending_size = 0
+
+    def empty(self):
+        """Counters and details of an empty output"""
+        raise NotImplementedError
+
+    def scan(self, text, lowered):
+        """Counters and details for a chunk of complete lines"""
+        raise NotImplementedError
+
+    def merge(self, partial):
+        """Fold the result of a later chunk into the parser state"""
+        for key, value in partial.items():
+            current = self.state[key]
+            if isinstance(current, bool):
+                self.state[key] = current or value
+            elif isinstance(current, list):
+                current.extend(value)
+            elif isinstance(current, dict):
+                current.update(value)
+            else:
+                self.state[key] = current + value
+
+    def feed(self, line):
+        """Parse one line of streamed output"""
+        self.pending.append(line)
+        self.pending_size += len(line)
+        if self.pending_size >= self.feed_batch_size:
+            self._flush()
+
+    def parse(self, text):
+        """Parse a complete output"""
+        self.reset()
+        self._scan_chunk(text)
+        return self.summary()
+
+    def summary(self):
+        """All counters and structured details collected so far"""
+        self._flush()
+        return self.state
+
+    def _flush(self):
+        if self.pending:
+            text = "".join(self.pending)
+            self.pending = []
+            self.pending_size = 0
+            self._scan_chunk(text)
+
+    def _scan_chunk(self, text):
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            self.merge(self.scan(text, lowered))
+        else:
+            # Some characters change length when lower-cased, so offsets in the
+            # folded copy no longer line up with the original: go line by line
+            for line in text.splitlines(True):
+                self.merge(self.scan(line, line.lower()))
+
+    @staticmethod
+    def line_bounds(text, pos):
+        """Start and end offsets of the line containing pos"""
+        start = text.rfind("\n", 0, pos) + 1
+        end = text.find("\n", pos)
+        return start, len(text) if end == -1 else end
+
+    @classmethod
+    def matching_lines(cls, pattern, text, lowered):
+        """Original text of each line whose folded copy matches pattern, in order"""
+        lines = []
+        pos = 0
+        search = pattern.search
+        while True:
+            match = search(lowered, pos)
+            if match is None:
+                break
+            start, end = cls.line_bounds(lowered, match.start())
+            lines.append(text[start:end])
+            pos = end + 1
+        return lines
+
+    @classmethod
+    def last_line_containing(cls, keyword, text, lowered):
+        pos = lowered.rfind(keyword)
+        if pos == -1:
+            return None
+        start, end = cls.line_bounds(lowered, pos)
+        return text[start:end]
+
+
+class CBMCOutputParser(OutputParser):
+    array_bounds_pattern = re.compile(r"array.*out of bounds")
+    pointer_outside_pattern = re.compile(r"pointer.*outside")
+
+    def __init__(self, json_decoder=None):
+        # Optional CBMCJsonUIDecoder fed with the same output
+        self.json_decoder = json_decoder
+        super().__init__()
+
+    def feed(self, line):
+        super().feed(line)
+        if self.json_decoder is not None:
+            self.json_decoder.feed(line)
+
+    def parse(self, text):
+        if self.json_decoder is not None:
+            self.json_decoder.feed(text)
+        return super().parse(text)
+
+    def summary(self):
+        summary = super().summary()
+        if self.json_decoder is not None:
+            summary = dict(summary, json_ui=self.json_decoder.finish())
+        return summary
+
+    def empty(self):
+        return {
+            "bugs_detected": 0,
+            "properties_verified": 0,
+            "verification_failed": False,
+            "verification_successful": False,
+            "errors_found": 0,
+            "warnings": 0
+        }
+
+    def scan(self, text, lowered):
+        failed = text.count("VERIFICATION FAILED")
+        successful = text.count("VERIFICATION SUCCESSFUL")
+        bugs = failed
+        # Both patterns are anchored on keywords rarely present in traces, so
+        # only check them when the keyword occurs at all
+        if "out of bounds" in lowered:
+            bugs += len(self.array_bounds_pattern.findall(lowered))
+        if "outside" in lowered:
+            bugs += len(self.pointer_outside_pattern.findall(lowered))
+        bugs += lowered.count("division by zero")
+        bugs += lowered.count("arithmetic overflow")
+        return {
+            "bugs_detected": bugs,
+            "properties_verified": successful,
+            "verification_failed": failed > 0,
+            "verification_successful": successful > 0,
+            "errors_found": lowered.count("error") + lowered.count("violation"),
+            "warnings": lowered.count("warning")
+        }
+
+
+class FramaCValueOutputParser(OutputParser):
+    alarm_pattern = re.compile(r"assertion|alarm")
+    metric_pattern = re.compile(r"time|memory|proof")
+
+    def empty(self):
+        return {
+            "alarms_generated": 0,
+            "proofs_established": 0,
+            "alarms": [],
+            "metrics": {}
+        }
+
+    def scan(self, text, lowered):
+        metrics = {}
+        for line in self.matching_lines(self.metric_pattern, text, lowered):
+            if ":" in line:
+                key, value = line.split(":", 1)
+                metrics[key.strip()] = value.strip()
+        return {
+            "alarms_generated": lowered.count("assertion") + lowered.count("alarm"),
+            "proofs_established": lowered.count("valid"),
+            "alarms": [line.strip() for line in self.matching_lines(self.alarm_pattern, text, lowered)],
+            "metrics": metrics
+        }
+
+
+class FramaCWPOutputParser(OutputParser):
+    def empty(self):
+        return {
+            "goals_proven": 0,
+            "goals_failed": 0
+        }
+
+    def scan(self, text, lowered):
+        return {
+            "goals_proven": lowered.count("proved"),
+            "goals_failed": lowered.count("failed")
+        }
+
+
+class EACSLOutputParser(OutputParser):
+    def empty(self):
+        return {
+            "runtime_checks_inserted": 0,
+            "instrumentation_details": {}
+        }
+
+    def scan(self, text, lowered):
+        details = {}
+        instrumented = self.last_line_containing("instrumented", text, lowered)
+        if instrumented is not None:
+            details["instrumentation_line"] = instrumented.strip()
+        assertion = self.last_line_containing("assertion", text, lowered)
+        if assertion is not None:
+            details["assertions_found"] = assertion.strip()
+        return {
+            "runtime_checks_inserted": (lowered.count("assertion") + lowered.count("check")
+                                        + lowered.count("instrumented")),
+            "instrumentation_details": details
+        }
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+import gzip
+import os
+from pathlib import Path
+
+class RawOutputWriter:
+    """Writes raw tool output to per-job files under results/raw/output/.
+
+    Result records only keep a reference to the file, its size and a bounded
+    head/tail excerpt, so the size of a record no longer grows with the
+    verbosity of the tool.
+    """
+
+    def __init__(self, compress=True, excerpt_chars=1024):
+        self.compress = compress
+        self.excerpt_chars = excerpt_chars
+
+    @classmethod
+    def from_config(cls, config):
+        """Build a writer from the `settings.raw_output` section of the configuration"""
+        raw_config = config.get("experiment", {}).get("settings", {}).get("raw_output", {})
+        return cls(
+            compress=raw_config.get("compress", True),
+            excerpt_chars=raw_config.get("excerpt_chars", 1024)
+        )
+
+    def output_path(self, output_dir, tool_name, benchmark_name, stream_name):
+        suffix = ".log.gz" if self.compress else ".log"
+        return Path(output_dir) / "output" / tool_name / f"{Path(benchmark_name).stem}.{stream_name}{suffix}"
+
+    def spill(self, output_dir, tool_name, benchmark_name, stream_name, text):
+        """Write one output stream to disk; return (excerpt, reference)"""
+        data = text.encode(errors="replace")
+        reference = {"file": None, "bytes": len(data), "truncated": len(text) > 2 * self.excerpt_chars}
+        if not data:
+            return "", reference
+
+        path = self.output_path(output_dir, tool_name, benchmark_name, stream_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        if self.compress:
+            with gzip.open(temp_path, 'wb', compresslevel=6) as f:
+                f.write(data)
+        else:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+        os.replace(temp_path, path)
+
+        reference["file"] = str(path)
+        return self.excerpt(text), reference
+
+    def excerpt(self, text):
+        """First and last excerpt_chars characters of the output"""
+        limit = self.excerpt_chars
+        if len(text) <= 2 * limit:
+            return text
+        omitted = len(text) - 2 * limit
+        return f"{text[:limit]}\n... [{omitted} characters omitted] ...\n{text[-limit:]}"
+
+    @staticmethod
+    def read(reference):
+        """Full output text of a reference written by spill"""
+        if not reference or not reference.get("file"):
+            return ""
+        path = Path(reference["file"])
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, 'rb') as f:
+            return f.read().decode(errors="replace")
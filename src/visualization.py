@@ -1,257 +1,258 @@
 #!/usr/bin/env python3
+import hashlib
+import json
+import os
 import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-import json
+from scipy.cluster.hierarchy import leaves_list, linkage
+from src.results_table import ResultsTable
+
+FIGURE_FORMATS = ("png", "pdf", "svg")
+FIG_SIZE = (12, 8)
+# Outliers drawn per box; the rest only move the whiskers
+MAX_FLIERS = 200
+# Rows drawn in the compatibility matrix; more benchmarks are averaged in bands
+MAX_MATRIX_ROWS = 500
+# Distinct row patterns ordered by hierarchical clustering; more are kept sorted
+MAX_CLUSTER_ROWS = 1000
+# Points kept of each runtime ECDF and bins of the runtime histograms
+ECDF_POINTS = 256
+HISTOGRAM_BINS = 40
 
 class ResultsVisualizer:
-    def __init__(self, results_file):
+    """Figures of a results table.
+
+    `figure_data` reduces the results to the small aggregates each figure
+    needs; the figures are then rendered from those aggregates alone, in a
+    process pool. A figure whose aggregates, format and DPI are unchanged
+    since the last run is not rendered again.
+
+    The aggregates are bounded in size whatever the number of benchmarks:
+    the success heatmap rolls up to benchmark categories beyond
+    `max_heatmap_rows`, the compatibility matrix is clustered and averaged
+    in bands, runtimes are summarized as downsampled ECDFs and histograms,
+    and cell values are only annotated up to `annotate_max_cells`.
+    """
+
+    # Metric columns the plots use
+    COLUMNS = ['tool', 'benchmark', 'status', 'success', 'execution_time',
+               'bugs_detected', 'properties_verified', 'alarms_generated', 'goals_proven', 'goals_failed']
+    # Bump when a render function changes so that cached figures are redrawn
+    RENDER_VERSION = 2
+
+    def __init__(self, results_file, df=None, output_dir="results/processed", image_format="png", dpi=300,
+                 workers=None, use_cache=True, max_heatmap_rows=50, annotate_max_cells=300, scaling=None):
+        if image_format not in FIGURE_FORMATS:
+            raise ValueError(f"Unsupported figure format {image_format!r} (expected one of {FIGURE_FORMATS})")
         self.results_file = Path(results_file)
-        self.df = self.load_results()
-        self.setup_plotting()
-    
-    def setup_plotting(self):
-        """Setup matplotlib styling"""
-        plt.style.use('seaborn-v0_8')
-        sns.set_palette("husl")
-        self.fig_size = (12, 8)
-    
+        # Only read: the DataFrame may be shared with the analyzer
+        self.df = df if df is not None else self.load_results()
+        self.output_dir = Path(output_dir)
+        self.image_format = image_format
+        self.dpi = dpi
+        self.workers = workers or os.cpu_count() or 1
+        self.use_cache = use_cache
+        self.max_heatmap_rows = max_heatmap_rows
+        self.annotate_max_cells = annotate_max_cells
+        # Manifest of a generated scaling suite: adds the scaling_curves figure
+        self.scaling = scaling
+        self.manifest_file = self.output_dir / ".figure_cache.json"
+
+    @classmethod
+    def from_config(cls, config, results_file, df=None, image_format=None, dpi=None, scaling=None):
+        """Build a visualizer from the `settings.figures` section of the configuration.
+
+        `image_format` and `dpi` override the configured values (command line).
+        """
+        figure_config = config.get("experiment", {}).get("settings", {}).get("figures", {})
+        return cls(
+            results_file,
+            df=df,
+            image_format=image_format or figure_config.get("format", "png"),
+            dpi=dpi or figure_config.get("dpi", 300),
+            workers=figure_config.get("workers"),
+            use_cache=figure_config.get("cache", True),
+            max_heatmap_rows=figure_config.get("max_heatmap_rows", 50),
+            annotate_max_cells=figure_config.get("annotate_max_cells", 300),
+            scaling=scaling
+        )
+
     def load_results(self):
-        """Load results from JSON file"""
-        with open(self.results_file, 'r') as f:
-            results = json.load(f)
-        return pd.json_normalize(results)
-    
+        """Load the columns used by the plots from a Parquet (or JSON) results file"""
+        return ResultsTable.load(self.results_file, self.COLUMNS)
+
     def generate_all_visualizations(self):
         """Generate all visualizations"""
         print("📊 Generating visualizations...")
-        
-        self.plot_performance_comparison()
-        self.plot_effectiveness_comparison()
-        self.plot_success_rates()
-        self.plot_tool_benchmark_heatmap()
-        self.plot_radar_chart_comparison()
-        
-        print("✅ Visualizations generated in results/processed/")
-    
-    def plot_performance_comparison(self):
-        """Plot performance comparison across tools"""
-        fig, axes = plt.subplots(2, 2, figsize=self.fig_size)
-        
-        # Execution time box plot
-        if not self.df.empty:
-            sns.boxplot(data=self.df, x='tool', y='execution_time', ax=axes[0,0])
-            axes[0,0].set_title('Execution Time Distribution by Tool')
-            axes[0,0].set_ylabel('Time (seconds)')
-            axes[0,0].tick_params(axis='x', rotation=45)
-        else:
-            axes[0,0].text(0.5, 0.5, "No data available", ha='center', va='center')
-            axes[0,0].set_axis_off()
-        
-        # Success rate bar plot
-        if 'success' in self.df.columns and not self.df.empty:
-            success_rates = self.df.groupby('tool')['success'].mean()
-            if not success_rates.empty:
-                success_rates.plot(kind='bar', ax=axes[0,1], color='skyblue')
-                axes[0,1].set_title('Success Rate by Tool')
-                axes[0,1].set_ylabel('Success Rate')
-                axes[0,1].tick_params(axis='x', rotation=45)
-            else:
-                axes[0,1].text(0.5, 0.5, "No data available", ha='center', va='center')
-                axes[0,1].set_axis_off()
-        else:
-            axes[0,1].set_axis_off()
-        
-        # Timeout analysis
-        timeout_data = self.df[self.df['execution_time'] >= 299]
-        timeout_counts = timeout_data['tool'].value_counts()
-        if not timeout_counts.empty:
-            timeout_counts.plot(kind='bar', ax=axes[1,0], color='red')
-            axes[1,0].set_title('Timeout Count by Tool')
-            axes[1,0].set_ylabel('Number of Timeouts')
-            axes[1,0].tick_params(axis='x', rotation=45)
-        else:
-            axes[1,0].text(0.5, 0.5, "No timeouts detected", ha='center', va='center')
-            axes[1,0].set_axis_off()
-        
-        # Performance by benchmark category
-        if not self.df.empty:
-            self.df['benchmark_category'] = self.df['benchmark'].apply(self.categorize_benchmark)
-            category_performance = self.df.groupby(['tool', 'benchmark_category'])['execution_time'].mean().unstack()
-            if not category_performance.empty:
-                category_performance.plot(kind='bar', ax=axes[1,1])
-                axes[1,1].set_title('Average Time by Tool and Benchmark Category')
-                axes[1,1].set_ylabel('Time (seconds)')
-                axes[1,1].tick_params(axis='x', rotation=45)
-                axes[1,1].legend(title='Category')
-            else:
-                axes[1,1].text(0.5, 0.5, "No data available", ha='center', va='center')
-                axes[1,1].set_axis_off()
-        else:
-            axes[1,1].set_axis_off()
-        
-        plt.tight_layout()
-        Path("results/processed").mkdir(exist_ok=True)
-        plt.savefig('results/processed/performance_comparison.png', dpi=300, bbox_inches='tight')
-        plt.close()
-    
-    def plot_effectiveness_comparison(self):
-        """Plot effectiveness comparison across tools"""
-        fig, axes = plt.subplots(2, 2, figsize=self.fig_size)
-        
-        # Bugs detected
-        if 'bugs_detected' in self.df.columns and not self.df.empty:
-            bug_data = self.df.groupby('tool')['bugs_detected'].mean()
-            if not bug_data.empty:
-                bug_data.plot(kind='bar', ax=axes[0,0], color='orange')
-                axes[0,0].set_title('Average Bugs Detected by Tool')
-                axes[0,0].set_ylabel('Bugs Detected')
-                axes[0,0].tick_params(axis='x', rotation=45)
-            else:
-                axes[0,0].set_axis_off()
-        else:
-            axes[0,0].set_axis_off()
-        
-        # Properties verified
-        if 'properties_verified' in self.df.columns and not self.df.empty:
-            prop_data = self.df.groupby('tool')['properties_verified'].mean()
-            if not prop_data.empty:
-                prop_data.plot(kind='bar', ax=axes[0,1], color='green')
-                axes[0,1].set_title('Average Properties Verified by Tool')
-                axes[0,1].set_ylabel('Properties Verified')
-                axes[0,1].tick_params(axis='x', rotation=45)
-            else:
-                axes[0,1].set_axis_off()
-        else:
-            axes[0,1].set_axis_off()
-        
-        # Alarms generated
-        if 'alarms_generated' in self.df.columns and not self.df.empty:
-            alarm_data = self.df.groupby('tool')['alarms_generated'].mean()
-            if not alarm_data.empty:
-                alarm_data.plot(kind='bar', ax=axes[1,0], color='red')
-                axes[1,0].set_title('Average Alarms Generated by Tool')
-                axes[1,0].set_ylabel('Alarms Generated')
-                axes[1,0].tick_params(axis='x', rotation=45)
-            else:
-                axes[1,0].set_axis_off()
-        else:
-            axes[1,0].set_axis_off()
-        
-        # Combined effectiveness score
-        effectiveness_metrics = []
-        for tool in self.df['tool'].unique():
-            tool_data = self.df[self.df['tool'] == tool]
-            score = 0
-            if 'bugs_detected' in tool_data.columns:
-                score += tool_data['bugs_detected'].mean()
-            if 'properties_verified' in tool_data.columns:
-                score += tool_data['properties_verified'].mean()
-            effectiveness_metrics.append({'tool': tool, 'effectiveness_score': score})
-        
-        effectiveness_df = pd.DataFrame(effectiveness_metrics)
-        if not effectiveness_df.empty:
-            effectiveness_df.plot(x='tool', y='effectiveness_score', kind='bar', ax=axes[1,1], color='purple')
-            axes[1,1].set_title('Combined Effectiveness Score by Tool')
-            axes[1,1].set_ylabel('Effectiveness Score')
-            axes[1,1].tick_params(axis='x', rotation=45)
-        else:
-            axes[1,1].set_axis_off()
-        
-        plt.tight_layout()
-        plt.savefig('results/processed/effectiveness_comparison.png', dpi=300, bbox_inches='tight')
-        plt.close()
-    
-    def plot_success_rates(self):
-        """Plot detailed success rate analysis"""
-        fig, ax = plt.subplots(figsize=self.fig_size)
-        
-        if 'success' in self.df.columns and not self.df.empty:
-            self.df['success_numeric'] = self.df['success'].apply(lambda x: 1 if x else 0)
-            success_pivot = self.df.pivot_table(
-                index='benchmark', 
-                columns='tool', 
-                values='success_numeric', 
-                aggfunc='mean'
-            )
-            if not success_pivot.empty:
-                sns.heatmap(success_pivot, annot=True, fmt=".2f", cmap='RdYlGn', center=0.5, ax=ax)
-                ax.set_title('Success Rate by Tool and Benchmark')
-                ax.set_ylabel('Benchmark')
-                ax.set_xlabel('Tool')
-            else:
-                ax.text(0.5, 0.5, "No success data", ha='center', va='center')
-                ax.set_axis_off()
-        else:
-            ax.text(0.5, 0.5, "No success column or data", ha='center', va='center')
-            ax.set_axis_off()
-        
-        plt.tight_layout()
-        plt.savefig('results/processed/success_rate_heatmap.png', dpi=300, bbox_inches='tight')
-        plt.close()
-    
-    def plot_tool_benchmark_heatmap(self):
-        """Plot tool-benchmark compatibility heatmap"""
-        fig, ax = plt.subplots(figsize=self.fig_size)
-        
-        if self.df.empty or 'tool' not in self.df.columns or 'benchmark' not in self.df.columns or 'success' not in self.df.columns:
-            ax.text(0.5, 0.5, "No compatibility data", ha='center', va='center')
-            ax.set_axis_off()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        manifest = self.load_manifest()
+        figures = self.figure_data()
+        jobs = []
+        for name, data in figures.items():
+            path = self.output_dir / f"{name}.{self.image_format}"
+            key = self.figure_key(name, data)
+            if self.use_cache and manifest.get(path.name) == key and path.exists():
+                continue
+            jobs.append((name, data, path, key))
+
+        if len(jobs) > 1 and self.workers > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs))) as pool:
+                futures = [pool.submit(render_figure, name, data, path, self.dpi) for name, data, path, _ in jobs]
+                for future in futures:
+                    future.result()
         else:
-            # Convert success boolean to numeric (0 or 1 float)
-            self.df['compatibility'] = self.df['success'].apply(lambda x: 1.0 if x else 0.0)
-            pivot_table = self.df.pivot_table(
-                index='benchmark',
-                columns='tool',
-                values='compatibility',
-                aggfunc='first'  # use first occurrence
-            )
-
-            if not pivot_table.empty:
-                # Use float format for annotation
-                sns.heatmap(pivot_table, annot=True, fmt=".0f", cmap='RdYlGn', center=0.5, ax=ax)
-                ax.set_title('Tool-Benchmark Compatibility Matrix')
-                ax.set_ylabel('Benchmark')
-                ax.set_xlabel('Tool')
-            else:
-                ax.text(0.5, 0.5, "No compatibility data", ha='center', va='center')
-                ax.set_axis_off()
-
-        plt.tight_layout()
-        plt.savefig('results/processed/tool_benchmark_compatibility.png', dpi=300, bbox_inches='tight')
-        plt.close()
-
-    
-    def plot_radar_chart_comparison(self):
-        """Plot radar chart for multi-dimensional comparison"""
-        metrics = ['success_rate', 'performance', 'bug_detection']
-        fig, ax = plt.subplots(figsize=(10, 10), subplot_kw=dict(projection='polar'))
-        angles = np.linspace(0, 2*np.pi, len(metrics), endpoint=False)
-        
-        for tool in self.df['tool'].unique():
-            tool_data = self.df[self.df['tool'] == tool]
-            if not tool_data.empty:
-                values = [
-                    tool_data['success'].mean() if 'success' in tool_data.columns else 0,
-                    1 / (tool_data['execution_time'].mean() + 1) if 'execution_time' in tool_data.columns else 0,
-                    tool_data['bugs_detected'].mean()/10 if 'bugs_detected' in tool_data.columns else 0
+            for name, data, path, _ in jobs:
+                render_figure(name, data, path, self.dpi)
+
+        for _, _, path, key in jobs:
+            manifest[path.name] = key
+        self.save_manifest(manifest)
+
+        print(f"✅ Visualizations generated in {self.output_dir}/ "
+              f"({len(jobs)} rendered, {len(figures) - len(jobs)} unchanged)")
+
+    def figure_key(self, name, data):
+        """Hash of everything a rendered figure depends on"""
+        payload = json.dumps([name, self.RENDER_VERSION, self.image_format, self.dpi, data],
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def load_manifest(self):
+        try:
+            with open(self.manifest_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_manifest(self, manifest):
+        tmp_file = self.manifest_file.with_suffix(".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_file, self.manifest_file)
+
+    def figure_data(self):
+        """Aggregates each figure is rendered from, as plain JSON-compatible values"""
+        df = self.df
+        if df.empty:
+            return {name: {} for name in self.figure_names()}
+
+        success = df['success'].eq(True) if 'success' in df else pd.Series(False, index=df.index)
+        by_tool = df.groupby('tool', observed=True)
+        means = by_tool[[c for c in ['bugs_detected', 'properties_verified', 'alarms_generated'] if c in df]].mean()
+        success_rates = success.groupby(df['tool'], observed=True).mean()
+        mean_times = by_tool['execution_time'].mean()
+        timeouts = df['status'].eq('TIMEOUT').groupby(df['tool'], observed=True).sum()
+        categories = df['benchmark'].map(self.categorize_benchmark)
+        category_times = df['execution_time'].groupby([df['tool'], categories], observed=True).mean().unstack()
+
+        pairs = pd.DataFrame({'tool': df['tool'], 'benchmark': df['benchmark'], 'category': categories,
+                              'success': success})
+
+        figures = {
+            "performance_comparison": {
+                "time_boxes": {str(tool): box_stats(times) for tool, times in by_tool['execution_time']},
+                "success_rates": series_data(success_rates),
+                "timeouts": series_data(timeouts[timeouts > 0].astype(int)),
+                "category_times": frame_data(category_times)
+            },
+            "effectiveness_comparison": {
+                "means": {column: series_data(means[column]) for column in means},
+                "scores": series_data(means[[c for c in ['bugs_detected', 'properties_verified'] if c in means]]
+                                      .sum(axis=1, skipna=False))
+            },
+            "success_rate_heatmap": self.success_heatmap_data(pairs),
+            "tool_benchmark_compatibility": self.compatibility_data(pairs),
+            "runtime_distribution": self.runtime_distribution_data(),
+            "radar_chart_comparison": {
+                str(tool): [
+                    float(success_rates[tool]),
+                    float(1 / (mean_times[tool] + 1)),
+                    float(means['bugs_detected'][tool] / 10) if 'bugs_detected' in means else 0
                 ]
-                values += values[:1]  # Complete the circle
-                tool_angles = np.concatenate((angles, [angles[0]]))
-                ax.plot(tool_angles, values, 'o-', linewidth=2, label=tool)
-                ax.fill(tool_angles, values, alpha=0.1)
-        
-        ax.set_xticks(angles)
-        ax.set_xticklabels(metrics)
-        ax.set_title('Multi-dimensional Tool Comparison')
-        ax.legend(loc='upper right')
-        
-        plt.tight_layout()
-        plt.savefig('results/processed/radar_chart_comparison.png', dpi=300, bbox_inches='tight')
-        plt.close()
-    
+                for tool in success_rates.index
+            }
+        }
+        if self.scaling:
+            figures["scaling_curves"] = self.scaling_data()
+        return figures
+
+    def figure_names(self):
+        """Figures this visualizer draws (scaling_curves only with a scaling suite)"""
+        return [name for name in FIGURES if name != "scaling_curves" or self.scaling]
+
+    def scaling_data(self):
+        """Mean execution time and WP goal count of each tool along every scaling family"""
+        benchmarks = self.scaling["benchmarks"]
+        names = self.df['benchmark'].astype(object)
+        suite = self.df[names.isin(benchmarks.keys())]
+        names = names[suite.index]
+        frame = pd.DataFrame({
+            'family': names.map(lambda name: benchmarks[name]['family']),
+            'tool': suite['tool'].astype(object),
+            'value': names.map(lambda name: benchmarks[name]['value']),
+            'time': suite['execution_time'],
+            'goals': suite['goals_proven'].fillna(0) + suite['goals_failed'].fillna(0)
+            if 'goals_proven' in suite and 'goals_failed' in suite else np.nan
+        })
+        curves = {}
+        for (family, tool), points in frame.groupby(['family', 'tool']):
+            means = points.groupby('value')[['time', 'goals']].mean()
+            curves.setdefault(str(family), {})[str(tool)] = {
+                "values": [_plain(value) for value in means.index],
+                "time": [_plain(value) for value in means['time']],
+                "goals": [_plain(value) for value in means['goals']]
+            }
+        return curves
+
+    def success_heatmap_data(self, pairs):
+        """Success rate per benchmark, or per benchmark category beyond max_heatmap_rows benchmarks"""
+        benchmarks = pairs['benchmark'].nunique()
+        level = 'benchmark' if benchmarks <= self.max_heatmap_rows else 'category'
+        pivot = pairs.pivot_table(index=level, columns='tool', values='success', aggfunc='mean', observed=True)
+        pivot = pivot.iloc[cluster_order(pivot)]
+        data = frame_data(pivot)
+        data.update(level=level, benchmarks=benchmarks, annotate=bool(pivot.size <= self.annotate_max_cells))
+        return data
+
+    def compatibility_data(self, pairs):
+        """First outcome of every (benchmark, tool) pair, rows clustered and banded to MAX_MATRIX_ROWS"""
+        matrix = pairs.pivot_table(index='benchmark', columns='tool', values='success',
+                                   aggfunc='first', observed=True).astype(float)
+        matrix = matrix.iloc[cluster_order(matrix)]
+        banded = band_rows(matrix, MAX_MATRIX_ROWS)
+        data = frame_data(banded)
+        data.update(benchmarks=len(matrix), banded=len(banded) < len(matrix),
+                    annotate=bool(banded.size <= self.annotate_max_cells))
+        return data
+
+    def runtime_distribution_data(self):
+        """Downsampled ECDF and log-binned histogram of the execution time of each tool"""
+        times = self.df['execution_time']
+        positive = times[times > 0]
+        if positive.empty:
+            return {}
+        low, high = positive.min(), positive.max()
+        if high <= low:
+            high = low * 1.01
+        edges = np.geomspace(low, high, HISTOGRAM_BINS + 1)
+
+        tools = {}
+        for tool, tool_times in positive.groupby(self.df['tool'], observed=True):
+            values = tool_times.to_numpy(dtype=float)
+            probabilities = np.linspace(0, 1, min(len(values), ECDF_POINTS))
+            tools[str(tool)] = {
+                "runs": len(values),
+                "ecdf_times": np.quantile(values, probabilities).tolist(),
+                "ecdf_probabilities": probabilities.tolist(),
+                "histogram": np.histogram(values, edges)[0].tolist()
+            }
+        return {"edges": edges.tolist(), "tools": tools}
+
     def categorize_benchmark(self, benchmark_name):
         """Categorize benchmark by type"""
         if 'buffer' in benchmark_name or 'null' in benchmark_name:
@@ -266,3 +267,270 @@ class ResultsVisualizer:
             return 'Advanced Properties'
         else:
             return 'Other'
+
+# ---------------------------------------------------------------------------
+# Aggregates as plain values (picklable, hashable through JSON)
+# ---------------------------------------------------------------------------
+
+def _plain(value):
+    return value.item() if hasattr(value, "item") else value
+
+def series_data(series):
+    return {str(key): _plain(value) for key, value in series.items()}
+
+def frame_data(frame):
+    return {
+        "rows": [str(row) for row in frame.index],
+        "columns": [str(column) for column in frame.columns],
+        "values": frame.to_numpy(dtype=float).tolist()
+    }
+
+def box_stats(values):
+    """Box plot statistics (matplotlib `bxp` format) of a sample, with at most MAX_FLIERS outliers"""
+    values = np.sort(values.dropna().to_numpy(dtype=float))
+    if len(values) == 0:
+        return None
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    fence = 1.5 * (q3 - q1)
+    inside = values[(values >= q1 - fence) & (values <= q3 + fence)]
+    fliers = values[(values < q1 - fence) | (values > q3 + fence)]
+    if len(fliers) > MAX_FLIERS:
+        fliers = fliers[np.linspace(0, len(fliers) - 1, MAX_FLIERS).astype(int)]
+    return {
+        "q1": q1, "med": median, "q3": q3,
+        "whislo": inside[0], "whishi": inside[-1],
+        "fliers": fliers.tolist()
+    }
+
+def cluster_order(frame):
+    """Row order putting similar rows next to each other.
+
+    Rows are reduced to their distinct value patterns (rounded, missing
+    values as -1), which stay few for success matrices however many
+    benchmarks there are. The patterns are ordered by average-linkage
+    hierarchical clustering, or kept sorted beyond MAX_CLUSTER_ROWS.
+    """
+    if len(frame) < 3:
+        return np.arange(len(frame))
+    values = np.round(frame.to_numpy(dtype=float), 2)
+    values = np.where(np.isnan(values), -1.0, values)
+    patterns, inverse = np.unique(values, axis=0, return_inverse=True)
+    if 2 < len(patterns) <= MAX_CLUSTER_ROWS:
+        pattern_order = leaves_list(linkage(patterns, method='average', optimal_ordering=len(patterns) <= 200))
+    else:
+        pattern_order = np.arange(len(patterns))
+    rank = np.empty(len(patterns), dtype=int)
+    rank[pattern_order] = np.arange(len(patterns))
+    return np.argsort(rank[inverse.ravel()], kind='stable')
+
+def band_rows(frame, max_rows):
+    """Average consecutive rows into at most max_rows bands, labelled by their first row"""
+    if len(frame) <= max_rows:
+        return frame
+    bands = np.arange(len(frame)) * max_rows // len(frame)
+    banded = frame.groupby(bands).mean()
+    sizes = np.bincount(bands)
+    firsts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    banded.index = [f"{frame.index[first]} (+{size - 1})" for first, size in zip(firsts, sizes)]
+    return banded
+
+def _frame(data):
+    return pd.DataFrame(data["values"], index=data["rows"], columns=data["columns"])
+
+# ---------------------------------------------------------------------------
+# Render jobs (run in worker processes)
+# ---------------------------------------------------------------------------
+
+def render_figure(name, data, path, dpi):
+    """Render one figure from its aggregates and save it to `path` (format from the suffix)"""
+    plt.style.use('seaborn-v0_8')
+    sns.set_palette("husl")
+    fig = FIGURES[name](data)
+    fig.tight_layout()
+    fig.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    return path
+
+def _no_data(ax, message="No data available"):
+    ax.text(0.5, 0.5, message, ha='center', va='center')
+    ax.set_axis_off()
+
+def _bar(ax, values, title, ylabel, color=None):
+    if not values:
+        ax.set_axis_off()
+        return
+    pd.Series(values).plot(kind='bar', ax=ax, color=color)
+    ax.set_title(title)
+    ax.set_ylabel(ylabel)
+    ax.tick_params(axis='x', rotation=45)
+
+def render_performance_comparison(data):
+    """Plot performance comparison across tools"""
+    fig, axes = plt.subplots(2, 2, figsize=FIG_SIZE)
+    if not data:
+        _no_data(axes[0,0])
+        for ax in axes.flat[1:]:
+            ax.set_axis_off()
+        return fig
+
+    # Execution time box plot
+    boxes = {tool: stats for tool, stats in data["time_boxes"].items() if stats}
+    if boxes:
+        artists = axes[0,0].bxp([dict(stats, label=tool) for tool, stats in boxes.items()], patch_artist=True)
+        for box, color in zip(artists['boxes'], sns.color_palette(n_colors=len(boxes))):
+            box.set_facecolor(color)
+        axes[0,0].set_title('Execution Time Distribution by Tool')
+        axes[0,0].set_ylabel('Time (seconds)')
+        axes[0,0].tick_params(axis='x', rotation=45)
+    else:
+        _no_data(axes[0,0])
+
+    # Success rate bar plot
+    _bar(axes[0,1], data["success_rates"], 'Success Rate by Tool', 'Success Rate', color='skyblue')
+
+    # Timeout analysis
+    if data["timeouts"]:
+        _bar(axes[1,0], data["timeouts"], 'Timeout Count by Tool', 'Number of Timeouts', color='red')
+    else:
+        _no_data(axes[1,0], "No timeouts detected")
+
+    # Performance by benchmark category
+    category_times = _frame(data["category_times"])
+    if not category_times.empty:
+        category_times.plot(kind='bar', ax=axes[1,1])
+        axes[1,1].set_title('Average Time by Tool and Benchmark Category')
+        axes[1,1].set_ylabel('Time (seconds)')
+        axes[1,1].tick_params(axis='x', rotation=45)
+        axes[1,1].legend(title='Category')
+    else:
+        _no_data(axes[1,1])
+    return fig
+
+def render_effectiveness_comparison(data):
+    """Plot effectiveness comparison across tools"""
+    fig, axes = plt.subplots(2, 2, figsize=FIG_SIZE)
+    means = data.get("means", {})
+    _bar(axes[0,0], means.get('bugs_detected'), 'Average Bugs Detected by Tool', 'Bugs Detected', color='orange')
+    _bar(axes[0,1], means.get('properties_verified'), 'Average Properties Verified by Tool',
+         'Properties Verified', color='green')
+    _bar(axes[1,0], means.get('alarms_generated'), 'Average Alarms Generated by Tool',
+         'Alarms Generated', color='red')
+    # Combined effectiveness score
+    _bar(axes[1,1], data.get("scores"), 'Combined Effectiveness Score by Tool', 'Effectiveness Score',
+         color='purple')
+    return fig
+
+def _heatmap(ax, frame, annotate, fmt):
+    # Without annotations seaborn thins out the row labels itself
+    sns.heatmap(frame, annot=annotate, fmt=fmt, cmap='RdYlGn', vmin=0, vmax=1, center=0.5,
+                yticklabels=True if annotate else 'auto', ax=ax)
+
+def render_success_rate_heatmap(data):
+    """Plot detailed success rate analysis"""
+    fig, ax = plt.subplots(figsize=FIG_SIZE)
+    success_pivot = _frame(data) if data else pd.DataFrame()
+    if not success_pivot.empty:
+        _heatmap(ax, success_pivot, data["annotate"], ".2f")
+        if data["level"] == 'category':
+            ax.set_title(f'Success Rate by Tool and Benchmark Category ({data["benchmarks"]} benchmarks)')
+            ax.set_ylabel('Benchmark Category')
+        else:
+            ax.set_title('Success Rate by Tool and Benchmark')
+            ax.set_ylabel('Benchmark')
+        ax.set_xlabel('Tool')
+    else:
+        _no_data(ax, "No success data")
+    return fig
+
+def render_tool_benchmark_compatibility(data):
+    """Plot tool-benchmark compatibility heatmap"""
+    fig, ax = plt.subplots(figsize=FIG_SIZE)
+    compatibility = _frame(data) if data else pd.DataFrame()
+    if not compatibility.empty:
+        _heatmap(ax, compatibility, data["annotate"], ".0f" if not data["banded"] else ".2f")
+        title = 'Tool-Benchmark Compatibility Matrix'
+        if data["banded"]:
+            title += f' ({data["benchmarks"]} benchmarks, clustered, averaged in bands)'
+        ax.set_title(title)
+        ax.set_ylabel('Benchmark')
+        ax.set_xlabel('Tool')
+    else:
+        _no_data(ax, "No compatibility data")
+    return fig
+
+def render_runtime_distribution(data):
+    """Plot the execution time ECDF and histogram of each tool"""
+    fig, axes = plt.subplots(1, 2, figsize=FIG_SIZE)
+    if not data:
+        _no_data(axes[0])
+        axes[1].set_axis_off()
+        return fig
+
+    for tool, tool_data in data["tools"].items():
+        label = f'{tool} ({tool_data["runs"]} runs)'
+        axes[0].step(tool_data["ecdf_times"], tool_data["ecdf_probabilities"], where='post', label=label)
+        axes[1].stairs(tool_data["histogram"], data["edges"], label=label)
+    axes[0].set_title('Execution Time ECDF by Tool')
+    axes[0].set_ylabel('Fraction of Runs')
+    axes[1].set_title('Execution Time Histogram by Tool')
+    axes[1].set_ylabel('Number of Runs')
+    for ax in axes:
+        ax.set_xscale('log')
+        ax.set_xlabel('Time (seconds)')
+        ax.legend()
+    return fig
+
+def render_scaling_curves(data):
+    """Plot execution time and WP goal count against the size parameter of each scaling family"""
+    families = sorted(data)
+    fig, axes = plt.subplots(2, max(1, len(families)), figsize=FIG_SIZE, squeeze=False)
+    if not families:
+        _no_data(axes[0][0], "No scaling benchmarks in these results")
+        axes[1][0].set_axis_off()
+        return fig
+
+    # One color per tool across every panel
+    tools = sorted({tool for curves in data.values() for tool in curves})
+    colors = dict(zip(tools, sns.color_palette(n_colors=len(tools))))
+    for column, family in enumerate(families):
+        time_ax, goals_ax = axes[0][column], axes[1][column]
+        for tool, curve in sorted(data[family].items()):
+            time_ax.plot(curve["values"], curve["time"], 'o-', label=tool, color=colors[tool])
+            if tool == "framac_wp":
+                goals_ax.plot(curve["values"], curve["goals"], 'o-', label=tool, color=colors[tool])
+        time_ax.set_title(f'Execution Time vs {family}')
+        time_ax.set_ylabel('Time (seconds)')
+        time_ax.legend()
+        goals_ax.set_title(f'WP Goals vs {family}')
+        goals_ax.set_xlabel(family)
+        goals_ax.set_ylabel('Goals')
+    return fig
+
+def render_radar_chart_comparison(data):
+    """Plot radar chart for multi-dimensional comparison"""
+    metrics = ['success_rate', 'performance', 'bug_detection']
+    fig, ax = plt.subplots(figsize=(10, 10), subplot_kw=dict(projection='polar'))
+    angles = np.linspace(0, 2*np.pi, len(metrics), endpoint=False)
+    tool_angles = np.concatenate((angles, [angles[0]]))
+
+    for tool, values in data.items():
+        values = values + values[:1]  # Complete the circle
+        ax.plot(tool_angles, values, 'o-', linewidth=2, label=tool)
+        ax.fill(tool_angles, values, alpha=0.1)
+
+    ax.set_xticks(angles)
+    ax.set_xticklabels(metrics)
+    ax.set_title('Multi-dimensional Tool Comparison')
+    if data:
+        ax.legend(loc='upper right')
+    return fig
+
+FIGURES = {
+    "performance_comparison": render_performance_comparison,
+    "effectiveness_comparison": render_effectiveness_comparison,
+    "success_rate_heatmap": render_success_rate_heatmap,
+    "tool_benchmark_compatibility": render_tool_benchmark_compatibility,
+    "radar_chart_comparison": render_radar_chart_comparison,
+    "runtime_distribution": render_runtime_distribution,
+    "scaling_curves": render_scaling_curves,
+}